@@ -0,0 +1,82 @@
+"""
+Benchmark of the memory allocated per vessel event.
+
+Creates many idle, travel and arrival events, as schedules do when they are (re)built, and reports the average number
+of allocated bytes per event as created and after the info of each event was accessed, e.g. by logging. The info of
+an event is only built on access.
+
+Run with ``python benchmarks/event_allocation_benchmark.py``.
+"""
+
+import tracemalloc
+from types import SimpleNamespace
+
+from prettytable import PrettyTable
+
+from mable.event_management import IdleEvent, TravelEvent, ArrivalEvent
+
+
+NUMBER_EVENTS = 20000
+
+
+def _make_idle_event(time, vessel, ports, trade):
+    return IdleEvent(time, vessel, ports[0])
+
+
+def _make_travel_event(time, vessel, ports, trade):
+    return TravelEvent(time, vessel, ports[0], ports[1])
+
+
+def _make_arrival_event(time, vessel, ports, trade):
+    return ArrivalEvent(time, vessel, trade, is_pickup=True)
+
+
+EVENT_FACTORIES = {
+    "IdleEvent": _make_idle_event,
+    "TravelEvent": _make_travel_event,
+    "ArrivalEvent": _make_arrival_event,
+}
+
+
+def measure_allocation(event_factory, number_events, access_info=False):
+    """
+    Measure the memory allocated by creating events.
+
+    :param event_factory: A function that creates one event from a time, a vessel, two ports and a trade.
+    :type event_factory: Callable[..., Event]
+    :param number_events: The number of events to create.
+    :type number_events: int
+    :param access_info: If True, the info of each event is accessed after its creation.
+    :type access_info: bool
+    :return: The average allocated bytes per event.
+    :rtype: float
+    """
+    vessel = SimpleNamespace(name="Vessel 1")
+    ports = ["Aberdeen", "Rotterdam"]
+    trade = SimpleNamespace(origin_port=ports[0], destination_port=ports[1], cargo_type="Oil", amount=100)
+    times = [float(i) for i in range(number_events)]
+    events = []
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for one_time in times:
+        one_event = event_factory(one_time, vessel, ports, trade)
+        if access_info:
+            _ = one_event.info
+        events.append(one_event)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / number_events
+
+
+def main():
+    table = PrettyTable(["Event", "Created [B/event]", "Info accessed [B/event]"])
+    for event_name, event_factory in EVENT_FACTORIES.items():
+        table.add_row([
+            event_name,
+            round(measure_allocation(event_factory, NUMBER_EVENTS), 1),
+            round(measure_allocation(event_factory, NUMBER_EVENTS, access_info=True), 1)])
+    print(table)
+
+
+if __name__ == '__main__':
+    main()
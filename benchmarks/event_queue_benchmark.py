@@ -0,0 +1,77 @@
+"""
+Benchmark of the event queue operations a simulation performs when vessels receive new schedules.
+
+Every schedule change removes the vessel's next event, purges all of the vessel's events and adds the first event
+of the new schedule. The benchmark repeats this for randomly chosen vessels for increasing fleet sizes and reports
+the average time per schedule change for :py:class:`EventQueue` and :py:class:`IndexedEventQueue`.
+
+Run with ``python benchmarks/event_queue_benchmark.py``.
+"""
+
+import random
+import time
+from types import SimpleNamespace
+
+from loguru import logger
+from prettytable import PrettyTable
+
+from mable.event_management import EventQueue, IndexedEventQueue, IdleEvent, Event
+
+
+FLEET_SIZES = [10, 100, 1000, 5000]
+NUMBER_SCHEDULE_CHANGES = 2000
+EVENTS_PER_VESSEL = 3
+
+
+def time_schedule_changes(queue_class, fleet_size, number_changes, seed=0):
+    """
+    Fills a queue with events for a fleet and times the schedule changes.
+
+    :param queue_class: The class of the event queue.
+    :type queue_class: type
+    :param fleet_size: The number of vessels.
+    :type fleet_size: int
+    :param number_changes: The number of schedule changes.
+    :type number_changes: int
+    :param seed: The seed for the choice of vessels and event times.
+    :type seed: int
+    :return: The average time per schedule change in microseconds.
+    :rtype: float
+    """
+    rng = random.Random(seed)
+    queue = queue_class()
+    queue.set_engine(SimpleNamespace(world=SimpleNamespace(current_time=0)))
+    vessels = [SimpleNamespace(name=f"Vessel {i}") for i in range(fleet_size)]
+    next_events = {}
+    for one_vessel in vessels:
+        for _ in range(EVENTS_PER_VESSEL):
+            one_event = IdleEvent(rng.uniform(1, 1000), one_vessel, "Port")
+            queue.put(one_event)
+            next_events[id(one_vessel)] = one_event
+    for i in range(fleet_size):
+        queue.put(Event(rng.uniform(1, 1000), f"Cargo {i}"))
+    start = time.perf_counter()
+    for _ in range(number_changes):
+        one_vessel = rng.choice(vessels)
+        queue.remove(next_events[id(one_vessel)])
+        queue.purge(one_vessel)
+        new_event = IdleEvent(rng.uniform(1, 1000), one_vessel, "Port")
+        queue.put(new_event)
+        next_events[id(one_vessel)] = new_event
+    duration = time.perf_counter() - start
+    return duration / number_changes * 1e6
+
+
+def main():
+    logger.remove()
+    table = PrettyTable(["Fleet size", "EventQueue [us/change]", "IndexedEventQueue [us/change]"])
+    for one_fleet_size in FLEET_SIZES:
+        table.add_row([
+            one_fleet_size,
+            round(time_schedule_changes(EventQueue, one_fleet_size, NUMBER_SCHEDULE_CHANGES), 2),
+            round(time_schedule_changes(IndexedEventQueue, one_fleet_size, NUMBER_SCHEDULE_CHANGES), 2)])
+    print(table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark of proposing schedules for large fleets with and without proposal worker processes.
+
+Builds a company with a large fleet in the unit square, lets it propose schedules for a batch of trades via
+:py:func:`SimpleCompany.propose_schedules_parallel` in one process and with 2 and 4 worker processes, and reports the
+average time per proposal, the speedup over one process and the processor time of the company's process, i.e. the
+part that is not parallelised. The workers are started once before the proposals, as a
+simulation does before its run. Worker counts above the number of processors are skipped.
+
+Run with ``python benchmarks/proposal_benchmark.py``.
+"""
+
+import os
+import random
+import time
+
+from prettytable import PrettyTable
+
+from mable.engine import SimulationEngine
+from mable.shipping_market import TimeWindowTrade
+from mable.simulation_environment import World
+from mable.simulation_generation import ClassFactory
+from mable.simulation_space.structure import UnitShippingNetwork
+from mable.simulation_space.universe import Port
+from mable.transport_operation import CargoCapacity, SimpleCompany, SimpleVessel
+
+
+FLEET_SIZES = [100, 400]
+NUMBER_TRADES = 20
+NUMBER_PORTS = 50
+NUMBER_WORKERS = [1, 2, 4]
+NUMBER_REPETITIONS = 3
+
+
+def make_company(fleet_size, seed=0):
+    """
+    Create a company with vessels in random ports of the unit square.
+
+    :param fleet_size: The number of vessels.
+    :type fleet_size: int
+    :param seed: The seed for the ports and the vessels' locations.
+    :type seed: int
+    :return: The company and the ports.
+    :rtype: Tuple[SimpleCompany, List[Port]]
+    """
+    generator = random.Random(seed)
+    ports = [Port(f"Port {i}", generator.random(), generator.random()) for i in range(NUMBER_PORTS)]
+    fleet = [SimpleVessel([CargoCapacity("Oil", capacity=1000, loading_rate=10)], generator.choice(ports),
+                          speed=0.01, name=f"Vessel {i}")
+             for i in range(fleet_size)]
+    company = SimpleCompany(fleet, "Benchmark")
+    world = World(UnitShippingNetwork(ports), None, None)
+    company.set_engine(SimulationEngine(world, [company], None, None, ClassFactory()))
+    return company, ports
+
+
+def make_trades(ports, number_trades, seed=0):
+    """
+    :param ports: The ports.
+    :type ports: List[Port]
+    :param number_trades: The number of trades.
+    :type number_trades: int
+    :param seed: The seed for the trades' ports.
+    :type seed: int
+    :return: Trades between random ports.
+    :rtype: List[TimeWindowTrade]
+    """
+    generator = random.Random(seed)
+    return [TimeWindowTrade(origin_port=one_origin, destination_port=one_destination, amount=100, cargo_type="Oil")
+            for one_origin, one_destination in (generator.sample(ports, 2) for _ in range(number_trades))]
+
+
+def time_proposals(company, trades, number_workers):
+    """
+    Time the proposals of a company.
+
+    :param company: The company.
+    :type company: SimpleCompany
+    :param trades: The trades to propose schedules for.
+    :type trades: List[TimeWindowTrade]
+    :param number_workers: The number of worker processes. With 1, the vessels are evaluated in this process.
+    :type number_workers: int
+    :return: The average time and processor time of this process per proposal in seconds and the number of
+        scheduled trades.
+    :rtype: Tuple[float, float, int]
+    """
+    if number_workers > 1:
+        company.start_proposal_workers(number_workers)
+    try:
+        start_time = time.perf_counter()
+        start_process_time = time.process_time()
+        for _ in range(NUMBER_REPETITIONS):
+            proposal = company.propose_schedules_parallel(trades, time_limit=600)
+        average_process_time = (time.process_time() - start_process_time) / NUMBER_REPETITIONS
+        average_time = (time.perf_counter() - start_time) / NUMBER_REPETITIONS
+    finally:
+        company.stop_proposal_workers()
+    return average_time, average_process_time, len(proposal.scheduled_trades)
+
+
+def main():
+    number_processors = os.cpu_count() or 1
+    table = PrettyTable(["Vessels", "Trades", "Workers", "Time [s/proposal]", "Speedup",
+                         "Company process CPU [s/proposal]", "Scheduled"])
+    for one_fleet_size in FLEET_SIZES:
+        company, ports = make_company(one_fleet_size)
+        trades = make_trades(ports, NUMBER_TRADES)
+        one_process_time = None
+        for one_number_workers in NUMBER_WORKERS:
+            if one_number_workers > number_processors:
+                continue
+            average_time, average_process_time, number_scheduled = time_proposals(
+                company, trades, one_number_workers)
+            if one_process_time is None:
+                one_process_time = average_time
+            table.add_row([one_fleet_size, len(trades), one_number_workers, round(average_time, 3),
+                           round(one_process_time / average_time, 2), round(average_process_time, 3),
+                           number_scheduled])
+    print(f"Processors: {number_processors}")
+    print(table)
+
+
+if __name__ == '__main__':
+    main()
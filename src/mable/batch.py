@@ -0,0 +1,306 @@
+"""
+Batch runs of many simulations over a grid of specifications.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import itertools
+import json
+import multiprocessing
+import pathlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict
+
+import attrs
+from loguru import logger
+
+from mable.examples import environment, fleets
+from mable.extensions.resources import ResourceManager
+from mable.extensions.world_ports import load_precomputed_routes
+
+COMPLETION_MARKER_FILE = "run.json"
+"""The file in a run's directory that marks the run as completed."""
+
+DEFAULT_GRID = {
+    "seeds": [0],
+    "trades_per_occurrence": [1],
+    "num_auctions": [2],
+    "trade_occurrence_frequency": [30],
+}
+
+
+@attrs.define(kw_only=True, frozen=True)
+class RunSpecification:
+    """
+    The specification of one run of a batch.
+
+    :param seed: The seed of the simulation's random.
+    :type seed: int
+    :param trades_per_occurrence: The number of trades per auction.
+    :type trades_per_occurrence: int
+    :param num_auctions: The number of auctions.
+    :type num_auctions: int
+    :param trade_occurrence_frequency: The number of days between two auctions.
+    :type trade_occurrence_frequency: int
+    :param company_set: The companies of the simulation. A dict with a 'name' and a list of 'companies'. Each company
+        is a dict with the 'class' as a full import path, the company's 'name', the 'fleet' as keyword arguments of
+        :py:func:`mable.examples.fleets.mixed_fleet` and optional additional 'kwargs' of the company's data class.
+    :type company_set: dict
+    """
+    seed: int
+    trades_per_occurrence: int
+    num_auctions: int
+    trade_occurrence_frequency: int
+    company_set: Dict[str, Any]
+
+    @property
+    def run_id(self):
+        """
+        An id that is unique for the parameters of the run and stays the same across batches.
+
+        :return: The id.
+        :rtype: str
+        """
+        parameters_hash = hashlib.sha1(
+            json.dumps(attrs.asdict(self), sort_keys=True).encode("utf-8")).hexdigest()[:10]
+        return (f"{self.company_set['name']}_s{self.seed}_t{self.trades_per_occurrence}"
+                f"_a{self.num_auctions}_f{self.trade_occurrence_frequency}_{parameters_hash}")
+
+
+def expand_grid(grid):
+    """
+    Expand a grid of specifications into the runs of all combinations of the grid's values.
+
+    The grid is a dict with lists of values under the keys 'seeds', 'trades_per_occurrence', 'num_auctions',
+    'trade_occurrence_frequency' and 'company_sets' (see :py:class:`RunSpecification`). Missing keys, except the
+    company sets, default to the values in :py:const:`DEFAULT_GRID`.
+
+    :param grid: The grid.
+    :type grid: dict
+    :return: The runs.
+    :rtype: List[RunSpecification]
+    :raises ValueError: If the grid has no company sets.
+    """
+    if not grid.get("company_sets"):
+        raise ValueError("The grid does not specify any company sets.")
+    grid_values = {key: grid.get(key, DEFAULT_GRID[key]) for key in DEFAULT_GRID}
+    run_specifications = [
+        RunSpecification(
+            seed=seed,
+            trades_per_occurrence=trades_per_occurrence,
+            num_auctions=num_auctions,
+            trade_occurrence_frequency=trade_occurrence_frequency,
+            company_set=company_set)
+        for company_set, seed, trades_per_occurrence, num_auctions, trade_occurrence_frequency
+        in itertools.product(
+            grid["company_sets"], grid_values["seeds"], grid_values["trades_per_occurrence"],
+            grid_values["num_auctions"], grid_values["trade_occurrence_frequency"])]
+    return run_specifications
+
+
+def _get_class(class_path):
+    """
+    :param class_path: The full import path of a class, e.g. 'mable.examples.companies.MyArchEnemy'.
+    :type class_path: str
+    :return: The class.
+    :rtype: type
+    """
+    module_name, class_name = class_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_simulation(run_specification, run_directory, environment_files_path=".", global_agent_timeout=60):
+    """
+    Generate and run the simulation of a run with the example environment
+    (see :py:func:`mable.examples.environment.generate_simulation`). The metrics are exported to the run directory.
+
+    :param run_specification: The run.
+    :type run_specification: RunSpecification
+    :param run_directory: The directory for the output files of the run.
+    :type run_directory: pathlib.Path
+    :param environment_files_path: The location of the environment files, i.e. the resources archive.
+    :type environment_files_path: str
+    :param global_agent_timeout: The timeout in seconds of every agent action.
+    :type global_agent_timeout: int
+    """
+    specifications_builder = environment.get_specification_builder(
+        environment_files_path=environment_files_path,
+        trade_occurrence_frequency=run_specification.trade_occurrence_frequency,
+        trades_per_occurrence=run_specification.trades_per_occurrence,
+        num_auctions=run_specification.num_auctions)
+    specifications_builder.add_random_specifications(seed=run_specification.seed)
+    for one_company in run_specification.company_set["companies"]:
+        company_class = _get_class(one_company["class"])
+        fleet = fleets.mixed_fleet(**one_company.get("fleet", {}))
+        specifications_builder.add_company(company_class.Data(
+            company_class, fleet, one_company["name"], **one_company.get("kwargs", {})))
+    simulation = environment.generate_simulation(
+        specifications_builder,
+        output_directory=str(run_directory),
+        global_agent_timeout=global_agent_timeout,
+        info={"run_id": run_specification.run_id, "run": attrs.asdict(run_specification)})
+    simulation.run()
+
+
+def _execute_run(run_function, run_specification, run_directory, run_kwargs):
+    """
+    Execute one run in a worker process. The log of the run is written to the run's directory.
+
+    :return: The run's id and the wall time of the run in seconds.
+    :rtype: tuple[str, float]
+    """
+    logger.remove()
+    log_handler_id = logger.add(run_directory / "simulation.log", level="INFO")
+    start_time = datetime.now()
+    try:
+        run_function(run_specification, run_directory, **run_kwargs)
+    finally:
+        logger.remove(log_handler_id)
+    return run_specification.run_id, (datetime.now() - start_time).total_seconds()
+
+
+class BatchRunner:
+    """
+    Runs a batch of simulations in parallel in a bounded number of worker processes.
+
+    Each run has its own directory in the output directory named after the run's id
+    (see :py:func:`RunSpecification.run_id`). Once a run finishes, a completion marker
+    (:py:const:`COMPLETION_MARKER_FILE`) with the run's specification is written to its directory. Runs with a
+    completion marker are skipped when a batch is resumed.
+    """
+
+    def __init__(self, run_specifications, output_directory, max_workers=None, run_function=run_simulation,
+                 mp_context=None, **run_kwargs):
+        """
+        :param run_specifications: The runs.
+        :type run_specifications: List[RunSpecification]
+        :param output_directory: The directory for the run directories.
+        :type output_directory: str | pathlib.Path
+        :param max_workers: The maximal number of worker processes. If None, the number of processors is used.
+        :type max_workers: int | None
+        :param run_function: A picklable function that executes one run. Receives the run's specification, the run's
+            directory and the additional keyword arguments. Default is :py:func:`run_simulation`.
+        :type run_function: Callable[..., None]
+        :param mp_context: The multiprocessing context for the worker processes. If None, the default context is used.
+        :param run_kwargs: Additional keyword arguments for the run function.
+        """
+        super().__init__()
+        self._run_specifications = run_specifications
+        self._output_directory = pathlib.Path(output_directory)
+        self._max_workers = max_workers
+        self._run_function = run_function
+        self._mp_context = mp_context
+        self._run_kwargs = run_kwargs
+
+    def get_run_directory(self, run_specification):
+        """
+        :param run_specification: The run.
+        :type run_specification: RunSpecification
+        :return: The directory of the run.
+        :rtype: pathlib.Path
+        """
+        return self._output_directory / run_specification.run_id
+
+    def is_completed(self, run_specification):
+        """
+        :param run_specification: The run.
+        :type run_specification: RunSpecification
+        :return: True if the run has a completion marker and False otherwise.
+        :rtype: bool
+        """
+        return (self.get_run_directory(run_specification) / COMPLETION_MARKER_FILE).is_file()
+
+    def run(self, resume=True):
+        """
+        Execute all runs.
+
+        :param resume: If True, completed runs are skipped. If False, all runs are executed.
+        :type resume: bool
+        :return: The status of each run by the run's id, i.e. 'completed', 'skipped' or 'failed'.
+        :rtype: Dict[str, str]
+        """
+        run_status = {}
+        open_runs = []
+        for one_run in self._run_specifications:
+            if resume and self.is_completed(one_run):
+                run_status[one_run.run_id] = "skipped"
+            else:
+                open_runs.append(one_run)
+        logger.info(f"Batch of {len(self._run_specifications)} runs: {len(open_runs)} to run,"
+                    f" {len(run_status)} already completed.")
+        with ProcessPoolExecutor(max_workers=self._max_workers, mp_context=self._mp_context) as executor:
+            futures = {}
+            for one_run in open_runs:
+                run_directory = self.get_run_directory(one_run)
+                run_directory.mkdir(parents=True, exist_ok=True)
+                (run_directory / COMPLETION_MARKER_FILE).unlink(missing_ok=True)
+                future = executor.submit(
+                    _execute_run, self._run_function, one_run, run_directory, self._run_kwargs)
+                futures[future] = one_run
+            for number_finished, one_future in enumerate(as_completed(futures), start=1):
+                one_run = futures[one_future]
+                try:
+                    _, run_time = one_future.result()
+                    self._mark_completed(one_run, run_time)
+                    run_status[one_run.run_id] = "completed"
+                    logger.info(f"[{number_finished}/{len(open_runs)}] Run {one_run.run_id} completed"
+                                f" in {round(run_time, 1)} s.")
+                except Exception as e:
+                    run_status[one_run.run_id] = "failed"
+                    logger.error(f"[{number_finished}/{len(open_runs)}] Run {one_run.run_id} failed: {e!r}")
+        return run_status
+
+    def _mark_completed(self, run_specification, run_time):
+        marker = {
+            "run_id": run_specification.run_id,
+            "run": attrs.asdict(run_specification),
+            "run_time": run_time,
+            "completed": datetime.today().strftime("%Y-%m-%d-%H-%M-%S")
+        }
+        with open(self.get_run_directory(run_specification) / COMPLETION_MARKER_FILE, "w") as marker_file:
+            json.dump(marker, marker_file, indent=4)
+
+
+def run_batch(grid, output_directory, max_workers=None, resume=True, environment_files_path=".",
+              global_agent_timeout=60):
+    """
+    Run the simulations of all combinations of a grid of specifications with the example environment.
+
+    The environment files are extracted and loaded once before the runs start (see
+    :py:class:`mable.extensions.resources.ResourceManager`). Where possible, the worker processes are forked so that
+    they do not load the resources again. Only the pages of a mapped route database and of numpy arrays stay shared
+    (see :py:func:`mable.extensions.resources.ResourceManager.preload`). Pickled routes are copied into each worker
+    as the worker uses them.
+
+    :param grid: The grid (see :py:func:`expand_grid`).
+    :type grid: dict
+    :param output_directory: The directory for the run directories.
+    :type output_directory: str | pathlib.Path
+    :param max_workers: The maximal number of worker processes. If None, the number of processors is used.
+    :type max_workers: int | None
+    :param resume: If True, runs that are already completed in the output directory are skipped.
+    :type resume: bool
+    :param environment_files_path: The location of the environment files, i.e. the resources archive.
+    :type environment_files_path: str
+    :param global_agent_timeout: The timeout in seconds of every agent action.
+    :type global_agent_timeout: int
+    :return: The status of each run by the run's id.
+    :rtype: Dict[str, str]
+    """
+    resource_files = environment.extract_resources(environment_files_path)
+    ResourceManager.preload(
+        precomputed_routes_file=resource_files["precomputed_routes"],
+        precomputed_routes_load_function=load_precomputed_routes,
+        table_files=[resource_files["time_transition_distribution"],
+                     resource_files["port_cargo_weight_distribution"],
+                     resource_files["port_trade_frequency_distribution"]])
+    mp_context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
+    runner = BatchRunner(
+        expand_grid(grid), output_directory, max_workers=max_workers, mp_context=mp_context,
+        environment_files_path=environment_files_path, global_agent_timeout=global_agent_timeout)
+    return runner.run(resume=resume)
@@ -10,6 +10,9 @@ import argcomplete
 from loguru import logger
 from prettytable import PrettyTable
 
+from mable.batch import run_batch
+from mable.extensions.route_database import build_route_database, convert_route_database
+
 
 class ArgumentParserExtensions:
     """
@@ -94,6 +97,74 @@ def task_metrics_overview(parsed_args):
         print(table)
 
 
+def task_batch(parsed_args):
+    """
+    Run a batch of simulations for all combinations of a grid of specifications.
+
+    :param parsed_args:
+        The parameter from the arg parser.
+        - grid: str: the name of the grid file.
+        - output: str: the output directory.
+        - workers: int | None: the maximal number of worker processes.
+        - restart: bool: run all runs again instead of resuming.
+        - resources: str: the location of the resources archive.
+        - timeout: int: the timeout of agent actions.
+    :type parsed_args: dict
+    """
+    with open(parsed_args["grid"], "r") as f:
+        grid = json.load(f)
+    run_status = run_batch(
+        grid,
+        parsed_args["output"],
+        max_workers=parsed_args["workers"],
+        resume=not parsed_args["restart"],
+        environment_files_path=parsed_args["resources"],
+        global_agent_timeout=parsed_args["timeout"])
+    table = PrettyTable()
+    table.field_names = ["Run", "Status"]
+    table.align["Run"] = "l"
+    for one_run_id, one_status in run_status.items():
+        table.add_row([one_run_id, one_status])
+    print(table)
+
+
+def task_routes_build(parsed_args):
+    """
+    Compute the routes between all ports and write them to a route database.
+
+    :param parsed_args:
+        The parameter from the arg parser.
+        - ports: str: the name of the ports file.
+        - graph: str: the name of the routing graph file.
+        - output: str: the name of the route database file.
+        - update: str | None: the name of a route database or routes file whose routes are kept.
+        - workers: int | None: the maximal number of worker processes.
+        - mapped: bool: whether to write a mapped route database.
+    :type parsed_args: dict
+    """
+    build_route_database(
+        parsed_args["ports"],
+        parsed_args["graph"],
+        parsed_args["output"],
+        existing_file=parsed_args["update"],
+        max_workers=parsed_args["workers"],
+        mapped=parsed_args["mapped"])
+
+
+def task_routes_convert(parsed_args):
+    """
+    Convert a route database or routes file to a mapped route database.
+
+    :param parsed_args:
+        The parameter from the arg parser.
+        - routes: str: the name of the route database or routes file.
+        - ports: str: the name of the ports file.
+        - output: str: the name of the mapped route database file.
+    :type parsed_args: dict
+    """
+    convert_route_database(parsed_args["routes"], parsed_args["ports"], parsed_args["output"])
+
+
 def select_task(parsed_args):
     """
     Calls the respective function for the task as specified by the cmd args.
@@ -104,6 +175,12 @@ def select_task(parsed_args):
     task = parsed_args["task"]
     if task == "overview":
         task_metrics_overview(parsed_args)
+    elif task == "batch":
+        task_batch(parsed_args)
+    elif task == "routes" and parsed_args["routes_task"] == "build":
+        task_routes_build(parsed_args)
+    elif task == "routes" and parsed_args["routes_task"] == "convert":
+        task_routes_convert(parsed_args)
     else:
         logger.error(f"Unknown task {task}")
 
@@ -137,6 +214,110 @@ def main():
         type=lambda x: ArgumentParserExtensions.is_valid_file(x, overview_parser),
         help="Filename for which to produce the overview."
     )
+    # Batch
+    batch_parser = task_parsers.add_parser(
+        'batch',
+        parents=[],
+        help='Run simulations for all combinations of a grid of specifications in parallel.'
+    )
+    batch_parser.add_argument(
+        'grid',
+        type=lambda x: ArgumentParserExtensions.is_valid_file(x, batch_parser),
+        help="Json file of the grid of specifications (seeds, trades_per_occurrence, num_auctions,"
+             " trade_occurrence_frequency, company_sets)."
+    )
+    batch_parser.add_argument(
+        '-o', '--output',
+        default=".",
+        help="Directory for the output of the runs. Default is the working directory."
+    )
+    batch_parser.add_argument(
+        '-w', '--workers',
+        type=lambda x: ArgumentParserExtensions.is_positive_integer(x, batch_parser),
+        default=None,
+        help="Maximal number of parallel runs. Default is the number of processors."
+    )
+    batch_parser.add_argument(
+        '--restart',
+        action="store_true",
+        help="Run all runs again instead of skipping completed runs."
+    )
+    batch_parser.add_argument(
+        '-r', '--resources',
+        default=".",
+        help="Directory of the resources archive. Default is the working directory."
+    )
+    batch_parser.add_argument(
+        '-t', '--timeout',
+        type=lambda x: ArgumentParserExtensions.is_positive_integer(x, batch_parser),
+        default=60,
+        help="Timeout in seconds of every agent action. Default is 60 seconds."
+    )
+    # Routes
+    routes_parser = task_parsers.add_parser(
+        'routes',
+        parents=[],
+        help='Manage the database of precomputed routes between ports.'
+    )
+    routes_task_parsers = routes_parser.add_subparsers(dest='routes_task', required=True)
+    routes_build_parser = routes_task_parsers.add_parser(
+        'build',
+        parents=[],
+        help='Compute the routes between all ports for all canal scenarios in parallel.'
+    )
+    routes_build_parser.add_argument(
+        'ports',
+        type=lambda x: ArgumentParserExtensions.is_valid_file(x, routes_build_parser),
+        help="Csv file of the ports."
+    )
+    routes_build_parser.add_argument(
+        'graph',
+        type=lambda x: ArgumentParserExtensions.is_valid_file(x, routes_build_parser),
+        help="Routing graph file (.txt or .pkl)."
+    )
+    routes_build_parser.add_argument(
+        '-o', '--output',
+        default="precomputed_routes.pickle",
+        help="File for the route database. Default is 'precomputed_routes.pickle'."
+    )
+    routes_build_parser.add_argument(
+        '-u', '--update',
+        type=lambda x: ArgumentParserExtensions.is_valid_file(x, routes_build_parser),
+        default=None,
+        help="Route database or routes file to extend. Only the routes between ports that are not in the file are"
+             " computed."
+    )
+    routes_build_parser.add_argument(
+        '-w', '--workers',
+        type=lambda x: ArgumentParserExtensions.is_positive_integer(x, routes_build_parser),
+        default=None,
+        help="Maximal number of worker processes. Default is the number of processors."
+    )
+    routes_build_parser.add_argument(
+        '-m', '--mapped',
+        action='store_true',
+        help="Write a memory-mapped route database instead of a pickled one."
+    )
+    routes_convert_parser = routes_task_parsers.add_parser(
+        'convert',
+        parents=[],
+        help='Convert a route database or routes file to a memory-mapped route database.'
+    )
+    routes_convert_parser.add_argument(
+        'routes',
+        type=lambda x: ArgumentParserExtensions.is_valid_file(x, routes_convert_parser),
+        help="Route database or routes file."
+    )
+    routes_convert_parser.add_argument(
+        'ports',
+        type=lambda x: ArgumentParserExtensions.is_valid_file(x, routes_convert_parser),
+        help="Csv file of the ports the routes are between."
+    )
+    routes_convert_parser.add_argument(
+        '-o', '--output',
+        default="precomputed_routes.rdb",
+        help="File for the mapped route database. Default is 'precomputed_routes.rdb'."
+    )
     argcomplete.autocomplete(parser)
     args = parser.parse_args()
     args = vars(args)
@@ -57,6 +57,8 @@ class AuctionCargoEvent(CargoEvent):
     An event of appearance of cargoes in an auction setting.
     """
 
+    __slots__ = ("_allocation_result",)
+
     def __init__(self, time):
         super().__init__(time)
         self._allocation_result: AuctionLedger | None = None
@@ -80,6 +80,24 @@ class CompanyHeadquarters:
         """
         return self._engine.world.network.get_distance(location_one, location_two)
 
+    def get_network_distances(self, origins, destinations):
+        """
+        Get the distances between each of the origins and each of the destinations, e.g. between the locations of
+        a fleet's vessels and the origin ports of trades.
+
+        The locations can be locations (:py:class:`Location`), ports (:py:class:`Port`) or the names thereof.
+        See :py:func:`get_network_distance`.
+
+        :param origins: The first locations.
+        :type origins: List[Port | Location | str]
+        :param destinations: The second locations.
+        :type destinations: List[Port | Location | str]
+        :return: The distances with one row per origin and one column per destination. math.inf if no route between
+            two locations exists.
+        :rtype: np.ndarray
+        """
+        return self._engine.world.network.get_distances(origins, destinations)
+
     def get_journey_location(self, journey, vessel, time=None):
         """
         Get the current location of a vessel on a journey.
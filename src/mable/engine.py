@@ -5,12 +5,17 @@ Module of the main engine that runs the simulation (loop).
 from __future__ import annotations
 
 from abc import abstractmethod
+from datetime import datetime
+import pathlib
 from typing import TYPE_CHECKING, Dict
 
 from loguru import logger
 
-from mable.event_management import EventExecutionData
+from mable.event_management import EventExecutionData, CargoEvent
 from mable.competition.information import CompanyHeadquarters, MarketAuthority
+from mable.ownership import OwnershipRegistry
+from mable.profiling import EngineProfiler
+from mable.snapshot import EngineSnapshot
 
 if TYPE_CHECKING:
     from mable.event_management import EventObserver, EventQueue
@@ -39,6 +44,26 @@ def pre_run_place_vessels(simulation_engine):
                 one_vessel.location = random_port
 
 
+def pre_run_start_proposal_workers(simulation_engine):
+    """
+    Start the proposal worker processes of the companies that propose schedules in parallel
+    (see :py:func:`mable.transport_operation.SimpleCompany.start_proposal_workers`). Runs before the companies
+    operate in threads since the workers are forked.
+    """
+    for one_company in simulation_engine.shipping_companies:
+        if getattr(one_company, "PARALLEL_PROPOSAL_WORKERS", 0):
+            one_company.start_proposal_workers()
+
+
+def post_run_stop_proposal_workers(simulation_engine):
+    """
+    Stop the proposal worker processes started by :py:func:`pre_run_start_proposal_workers`.
+    """
+    for one_company in simulation_engine.shipping_companies:
+        if getattr(one_company, "PARALLEL_PROPOSAL_WORKERS", 0):
+            one_company.stop_proposal_workers()
+
+
 class EnginePrePostRunner:
     """
     A framework to run functions before and after engine execution.
@@ -54,12 +79,12 @@ class SimulationEngine:
     Main class to run a simulation.
     """
 
-    PRE_RUN_CMDS = [pre_run_place_vessels, pre_run_inform_vessel_locations]
-    POST_RUN_CMDS = []
+    PRE_RUN_CMDS = [pre_run_place_vessels, pre_run_inform_vessel_locations, pre_run_start_proposal_workers]
+    POST_RUN_CMDS = [post_run_stop_proposal_workers]
 
     def __init__(self, world, shipping_companies, cargo_generation, cargo_market, class_factory,
                  pre_run_cmds=None, post_run_cmds=None, output_directory=None, global_agent_timeout=60,
-                 info=None):
+                 info=None, profile=False, export_profile=False):
         """
         Constructor.
 
@@ -89,12 +114,21 @@ class SimulationEngine:
         :type global_agent_timeout: int
         :param info: Any information on the type or setting of the simulation.
         :type info: str | dict
+        :param profile: If True, the phases of the simulation run are measured by an :py:class:`EngineProfiler`
+            (see :py:func:`SimulationEngine.profiler`).
+        :type profile: bool
+        :param export_profile: If True and profiling is active, the measurements are exported to the output directory
+            once the post run commands are finished (see :py:func:`export_profile`). The export therefore includes
+            the post run phase.
+        :type export_profile: bool
         """
         super().__init__()
         self._info = info
         self._event_observer = []
+        self._event_observer_dispatch = {}
         self._world = world
         self._shipping_companies = shipping_companies
+        self._ownership = OwnershipRegistry(shipping_companies)
         self._shipping = cargo_generation
         self._market = cargo_market
         self._class_factory = class_factory
@@ -111,6 +145,12 @@ class SimulationEngine:
         self._global_agent_timeout = global_agent_timeout
         self._market_authority = MarketAuthority()
         self._new_schedules = {}
+        self._started = False
+        self._finished = False
+        self._profiler = None
+        if profile:
+            self._profiler = EngineProfiler()
+        self._export_profile_after_run = export_profile
 
     @property
     def headquarters(self):
@@ -128,20 +168,75 @@ class SimulationEngine:
     def info(self):
         return self._info
 
-    def _pre_run(self):
-        self._set_up_trades()
-        for f in self._pre_run_cmds:
-            if isinstance(f, EnginePrePostRunner):
-                f.run(self)
+    @property
+    def profiler(self):
+        """
+        :return: The profiler measuring the simulation run or None if profiling is not active.
+        :rtype: EngineProfiler | None
+        """
+        return self._profiler
+
+    def export_profile(self):
+        """
+        Export the profiler measurements to a json and a collapsed stack file in the output directory.
+
+        :return: The paths of the json and the collapsed stack file.
+        :rtype: tuple[pathlib.Path, pathlib.Path]
+        :raises ValueError: If profiling is not active.
+        """
+        if self._profiler is None:
+            raise ValueError("Profiling is not active.")
+        timestamp = datetime.today().strftime("%Y-%m-%d-%H-%M-%S")
+        output_directory = pathlib.Path(self._output_directory)
+        json_file_path = output_directory / f"profile_{timestamp}.json"
+        self._profiler.export_json(json_file_path)
+        collapsed_stacks_file_path = output_directory / f"profile_{timestamp}.folded"
+        self._profiler.export_collapsed_stacks(collapsed_stacks_file_path)
+        logger.info(f"Profile exported to {json_file_path} and {collapsed_stacks_file_path}")
+        return json_file_path, collapsed_stacks_file_path
+
+    def _run_pre_post_cmds(self, cmds):
+        """
+        Run pre or post run commands. Each command is a profiling phase if profiling is active.
+
+        :param cmds: The commands.
+        :type cmds: list
+        """
+        for f in cmds:
+            if self._profiler is None:
+                self._run_pre_post_cmd(f)
             else:
-                f(self)
+                phase_name = type(f).__name__
+                if not isinstance(f, EnginePrePostRunner):
+                    phase_name = getattr(f, "__name__", phase_name)
+                with self._profiler.phase(phase_name):
+                    self._run_pre_post_cmd(f)
+
+    def _run_pre_post_cmd(self, f):
+        if isinstance(f, EnginePrePostRunner):
+            f.run(self)
+        else:
+            f(self)
+
+    def _pre_run(self):
+        self._started = True
+        if self._profiler is None:
+            self._set_up_trades()
+            self._run_pre_post_cmds(self._pre_run_cmds)
+        else:
+            with self._profiler.phase("pre_run"):
+                with self._profiler.phase("_set_up_trades"):
+                    self._set_up_trades()
+                self._run_pre_post_cmds(self._pre_run_cmds)
 
     def _post_run(self):
-        for f in self._post_run_cmds:
-            if isinstance(f, EnginePrePostRunner):
-                f.run(self)
-            else:
-                f(self)
+        if self._profiler is None:
+            self._run_pre_post_cmds(self._post_run_cmds)
+        else:
+            with self._profiler.phase("post_run"):
+                self._run_pre_post_cmds(self._post_run_cmds)
+            if self._export_profile_after_run:
+                self.export_profile()
 
     def _set_up_trades(self):
         for one_time in self._shipping.get_trading_times():
@@ -154,25 +249,137 @@ class SimulationEngine:
         :return: The next event and the data from its execution.
         :rtype: tuple[Event|None, EventExecutionData|None]
         """
-        next_event, data = None, None
-        if self._world.do_events_exists():
-            next_event = self._world.get_next_event()
+        if self._profiler is not None:
+            with self._profiler.phase("_process_next_event"):
+                return self._process_next_event_profiled()
+        data = None
+        next_event = self._world.pop_next_event()
+        if next_event is not None:
             data = EventExecutionData()
             event_action_result = next_event.event_action(self)
             data.action_data = event_action_result
         return next_event, data
 
+    def _process_next_event_profiled(self):
+        """
+        Same as :py:func:`_process_next_event` but measuring the event's action as a profiling phase.
+        :return: The next event and the data from its execution.
+        :rtype: tuple[Event|None, EventExecutionData|None]
+        """
+        data = None
+        next_event = self._world.pop_next_event()
+        if next_event is not None:
+            data = EventExecutionData()
+            with self._profiler.phase(f"{type(next_event).__name__}.event_action"):
+                event_action_result = next_event.event_action(self)
+            data.action_data = event_action_result
+        return next_event, data
+
     def run(self):
         """
         Run a simulation until no events are left to deal with.
 
-        Start with adding all cargo events into the event queue.
+        Start with adding all cargo events into the event queue. If the simulation has already been started, e.g.
+        because the state of a snapshot was restored (see :py:func:`restore`) or some events were processed via
+        :py:func:`step`, the run continues with the next pending event.
+        """
+        for _ in self.events():
+            pass
+
+    @property
+    def is_finished(self):
+        """
+        :return: True if all events have been processed and the post run commands have been run, False otherwise.
+        :rtype: bool
         """
-        self._pre_run()
-        while self._world.do_events_exists():
-            next_event, data = self._process_next_event()
+        return self._finished
+
+    def step(self):
+        """
+        Process the next event and notify the observers about it. The pre run commands are run before the first
+        event. Once no events are left, the post run commands are run.
+
+        :return: The processed event and the data from its execution or (None, None) if no events are left.
+        :rtype: tuple[Event|None, EventExecutionData|None]
+        """
+        if not self._started:
+            self._pre_run()
+        next_event, data = self._process_next_event()
+        if next_event is not None:
             self.notify_event_observer(next_event, data)
-        self._post_run()
+        elif not self._finished:
+            self._finished = True
+            self._post_run()
+        return next_event, data
+
+    def events(self):
+        """
+        A generator that processes the events one by one (see :py:func:`step`) until no events are left.
+
+        :return: The generator that yields each processed event and the data from its execution.
+        :rtype: Iterator[tuple[Event, EventExecutionData]]
+        """
+        next_event, data = self.step()
+        while next_event is not None:
+            yield next_event, data
+            next_event, data = self.step()
+
+    def run_until(self, time):
+        """
+        Process all events that occur up to and including the specified time. The current time of the world
+        is the time of the last processed event afterwards. If no events are left, the post run commands are run.
+
+        :param time: The time.
+        :type time: float
+        :return: The number of processed events.
+        :rtype: int
+        """
+        if not self._started:
+            self._pre_run()
+        number_processed_events = 0
+        next_event = self._world.event_queue.peek()
+        while next_event is not None and next_event.time <= time:
+            self.step()
+            number_processed_events += 1
+            next_event = self._world.event_queue.peek()
+        if next_event is None:
+            self.step()
+        return number_processed_events
+
+    def run_until_next_auction(self):
+        """
+        Process all events up to and including the next cargo event, i.e. the next allocation of trades.
+
+        :return: The cargo event and the data from its execution or (None, None) if no cargo event is left.
+        :rtype: tuple[CargoEvent|None, EventExecutionData|None]
+        """
+        next_event, data = self.step()
+        while next_event is not None and not isinstance(next_event, CargoEvent):
+            next_event, data = self.step()
+        return next_event, data
+
+    def snapshot(self):
+        """
+        Take a snapshot of the dynamic state of the simulation. Should only be called between the processing of two
+        events, e.g. by an observer.
+
+        :return: The snapshot.
+        :rtype: EngineSnapshot
+        """
+        return EngineSnapshot.take(self)
+
+    def restore(self, snapshot):
+        """
+        Restore the state of a snapshot. The engine has to be generated from the same specifications as the engine
+        the snapshot was taken from. A subsequent :py:func:`run` continues the simulation from the snapshot's time.
+
+        :param snapshot: The snapshot.
+        :type snapshot: EngineSnapshot
+        :raises ValueError: If the snapshot does not fit the simulation.
+        """
+        snapshot.restore(self)
+        self._started = True
+        self._finished = False
 
     def add_new_schedules(self, company, schedules, time):
         """
@@ -256,23 +463,35 @@ class SimulationEngine:
         """
         return self._shipping_companies
 
+    @property
+    def ownership(self):
+        """
+        :return: The index of the company each vessel belongs to.
+        :rtype: OwnershipRegistry
+        """
+        return self._ownership
+
     def find_company_for_vessel(self, vessel):
         """
         Find the company the vessel belongs to.
 
+        The company is looked up in the :py:class:`mable.ownership.OwnershipRegistry`. A vessel that was added to a
+        company's fleet without :py:func:`mable.transport_operation.ShippingCompany.add_vessel` is not in the
+        registry. In this case, the companies' fleets are searched and the vessel is registered with its company.
+
         :param vessel: The vessel.
         :type vessel: Vessel
         :return: The company
+        :raises ValueError: If the vessel does not belong to any company.
         """
-        company = None
-        i = 0
-        while i < len(self.shipping_companies) and company is None:
-            one_company = self.shipping_companies[i]
-            if vessel in one_company.fleet:
-                company = one_company
-            i += 1
+        company = self._ownership.find_company_for_vessel(vessel)
         if company is None:
-            raise ValueError(f"No company found for vessel {vessel}")
+            company = next((one_company for one_company in self._shipping_companies
+                            if any(one_vessel is vessel for one_vessel in one_company.fleet)),
+                           None)
+            if company is None:
+                raise ValueError(f"No company found for vessel {vessel}")
+            self._ownership.register_company(company)
         return company
 
     @property
@@ -318,6 +537,7 @@ class SimulationEngine:
             The observer to add.
         """
         self._event_observer.append(observer)
+        self._event_observer_dispatch = {}
 
     def unregister_event_observer(self, observer: EventObserver):
         """
@@ -326,16 +546,44 @@ class SimulationEngine:
             The observer to remove.
         """
         self._event_observer.remove(observer)
+        self._event_observer_dispatch = {}
+
+    def _get_event_observers_for_type(self, event_type):
+        """
+        Return the observers that observe events of the specified type
+        (see :py:const:`mable.event_management.EventObserver.OBSERVED_EVENT_TYPES`).
+        The observers per event type are determined once and reused until the observers change.
+
+        :param event_type: The type of event.
+        :type event_type: type
+        :return: The observers.
+        :rtype: list[EventObserver]
+        """
+        observers = self._event_observer_dispatch.get(event_type)
+        if observers is None:
+            observers = [
+                one_observer for one_observer in self._event_observer
+                if one_observer.OBSERVED_EVENT_TYPES is None
+                or issubclass(event_type, tuple(one_observer.OBSERVED_EVENT_TYPES))]
+            self._event_observer_dispatch[event_type] = observers
+        return observers
 
     def notify_event_observer(self, event, data):
         """
-        Notify observer about an event that has occurred.
+        Notify observer about an event that has occurred. Only observers that observe the type of the event are
+        notified.
         :param event: Event
             Some event.
         :param data: EventExecutionData
             Additional data in conjunction with the event. E.g. data that was produced or changes that were made.
         """
-        logger.debug(f"Notify {len(self._event_observer)} event observers about event: {event}")
-        for one_observer in self._event_observer:
-            logger.debug(f"Notify event observer {type(one_observer).__name__}: {event}")
-            one_observer.notify(self, event, data)
+        observers = self._get_event_observers_for_type(type(event))
+        logger.debug("Notify {} event observers about event: {}", len(observers), event)
+        if self._profiler is None:
+            for one_observer in observers:
+                one_observer.notify(self, event, data)
+        else:
+            with self._profiler.phase("notify_event_observer"):
+                for one_observer in observers:
+                    with self._profiler.phase(f"{type(one_observer).__name__}.notify"):
+                        one_observer.notify(self, event, data)
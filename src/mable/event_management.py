@@ -4,8 +4,10 @@ Event management module.
 
 from abc import abstractmethod
 from dataclasses import dataclass, field
+import heapq
+import itertools
 import math
-from queue import PriorityQueue
+from queue import PriorityQueue, Empty
 from typing import Any, TYPE_CHECKING, List
 
 from loguru import logger
@@ -23,18 +25,25 @@ if TYPE_CHECKING:
 class Event:
     """
     One event.
+
+    Events are slotted since a simulation creates many of them, e.g. every schedule creates its events and every
+    vessel keeps the events it performed in its journey log. Subclasses have to declare their attributes in
+    __slots__ as well.
     """
 
+    __slots__ = ("_time", "_info")
+
     def __init__(self, time, info=None):
         """
         :param time: The occurrence time of the event.
         :type time: float
-        :param info: Some info on the event for logging etc.
+        :param info: Some info on the event for logging etc. If None, the info is built on first access
+            (see :py:func:`Event._build_info`).
         :type info: str
         """
         super().__init__()
         self._time = time
-        self.info = info
+        self._info = info
 
     @property
     def time(self):
@@ -46,6 +55,32 @@ class Event:
         """
         return self._time
 
+    @property
+    def info(self):
+        """
+        Some info on the event for logging etc.
+
+        :return: The info.
+        :rtype: str
+        """
+        if self._info is None:
+            self._info = self._build_info()
+        return self._info
+
+    @info.setter
+    def info(self, info):
+        self._info = info
+
+    def _build_info(self):
+        """
+        Build the info of events that did not receive an info. Only called when the info is needed.
+        Returns None on default.
+
+        :return: The info.
+        :rtype: str | None
+        """
+        return None
+
     def added_to_queue(self, engine):
         """
         Called when the event is added to the queue. Does nothing on default.
@@ -88,6 +123,8 @@ class FirstCargoAnnouncementEvent(Event):
     Announces future cargoes at the start of the simulation before a cargo auction at time 0.
     """
 
+    __slots__ = ("_cargo_available_time_second_cargo",)
+
     def __init__(self, time, cargo_available_time_second_cargo):
         super().__init__(time)
         self._cargo_available_time_second_cargo = cargo_available_time_second_cargo
@@ -114,6 +151,8 @@ class CargoAnnouncementEvent(Event):
     Announces future cargoes
     """
 
+    __slots__ = ("_cargo_available_time",)
+
     def __init__(self, time, cargo_available_time):
         super().__init__(time)
         self._cargo_available_time = cargo_available_time
@@ -136,6 +175,8 @@ class CargoEvent(Event):
     An event of appearance of cargoes.
     """
 
+    __slots__ = ()
+
     def __init__(self, time):
         super().__init__(time)
 
@@ -159,6 +200,8 @@ class DurationEvent(Event):
     An event that has a duration.
     """
 
+    __slots__ = ("_time_started",)
+
     def __init__(self, time):
         """
         An unstarted event has a start time of -1.
@@ -218,6 +261,8 @@ class VesselEvent(DurationEvent):
     An event that involves a vessel.
     """
 
+    __slots__ = ("_vessel",)
+
     def __init__(self, time, vessel):
         """
         Constructor.
@@ -288,6 +333,8 @@ class VesselLocationInformationEvent(VesselEvent):
     An event that informs about the location of a vessel.
     """
 
+    __slots__ = ("_location",)
+
     def __init__(self, time, vessel, location):
         """
         Constructor.
@@ -300,7 +347,10 @@ class VesselLocationInformationEvent(VesselEvent):
         """
         super().__init__(time, vessel)
         self._location = location
-        self.info = f"{self._vessel._engine.find_company_for_vessel(self._vessel).name}'s {self._vessel.name} in {self._location.name}"
+
+    def _build_info(self):
+        company = self._vessel._engine.find_company_for_vessel(self._vessel)
+        return f"{company.name}'s {self._vessel.name} in {self._location.name}"
 
     @property
     def location(self):
@@ -325,6 +375,8 @@ class VesselLocationInformationEvent(VesselEvent):
 
 class TravelEvent(VesselEvent):
 
+    __slots__ = ("_origin", "_destination", "_is_laden")
+
     def __init__(self, time, vessel, origin, destination):
         """
         Constructor for a vessel that performs a journey.
@@ -341,8 +393,10 @@ class TravelEvent(VesselEvent):
         self._origin = origin
         self._destination = destination
         self._is_laden = False
-        self.info = (f"{destination} travel (Vessel [name: {vessel.name}]: "
-                     f"{origin}->{destination})")
+
+    def _build_info(self):
+        return (f"{self._destination} travel (Vessel [name: {self._vessel.name}]: "
+                f"{self._origin}->{self._destination})")
 
     @property
     def location(self):
@@ -399,6 +453,8 @@ class IdleEvent(VesselEvent):
     An event where the vessel is doing nothing.
     """
 
+    __slots__ = ("_location",)
+
     def __init__(self, time, vessel, location):
         """
         Constructor.
@@ -411,7 +467,9 @@ class IdleEvent(VesselEvent):
         """
         super().__init__(time, vessel)
         self._location = location
-        self.info = f"{location} idling (Vessel [name: {vessel.name}])"
+
+    def _build_info(self):
+        return f"{self._location} idling (Vessel [name: {self._vessel.name}])"
 
     @property
     def location(self):
@@ -448,6 +506,8 @@ class VesselCargoEvent(VesselEvent):
     An event that involves a vessel and a trade.
     """
 
+    __slots__ = ("_trade", "_is_pickup")
+
     def __init__(self, time, vessel, trade, is_pickup):
         """
         Constructor.
@@ -464,13 +524,17 @@ class VesselCargoEvent(VesselEvent):
         super().__init__(time, vessel)
         self._trade = trade
         self._is_pickup = is_pickup
-        if is_pickup:
-            self.info = (f"{trade.origin_port} pick up (Vessel [name: {vessel.name}], Trade [{trade.cargo_type}, "
-                         f"{trade.amount}]: {trade.origin_port}->{trade.destination_port})")
+
+    def _build_info(self):
+        trade = self._trade
+        if self._is_pickup:
+            info = (f"{trade.origin_port} pick up (Vessel [name: {self._vessel.name}], Trade [{trade.cargo_type}, "
+                    f"{trade.amount}]: {trade.origin_port}->{trade.destination_port})")
         else:
-            self.info = (f"{trade.destination_port} drop off (Vessel [name: {vessel.name}],"
-                         f" Trade [{trade.cargo_type}, {trade.amount}]: "
-                         f"{trade.origin_port}->{trade.destination_port})")
+            info = (f"{trade.destination_port} drop off (Vessel [name: {self._vessel.name}],"
+                    f" Trade [{trade.cargo_type}, {trade.amount}]: "
+                    f"{trade.origin_port}->{trade.destination_port})")
+        return info
 
     @property
     def is_pickup(self):
@@ -546,6 +610,8 @@ class ArrivalEvent(VesselCargoEvent):
     An event where a vessel arrives for loading or unloading.
     """
 
+    __slots__ = ()
+
     def event_action(self, engine):
         super().event_action(engine)
         if self.is_pickup:
@@ -591,6 +657,8 @@ class CargoTransferEvent(VesselCargoEvent):
     A loading or unloading event.
     """
 
+    __slots__ = ()
+
     def event_action(self, engine):
         super().event_action(engine)
         if self.is_pickup:
@@ -622,10 +690,31 @@ class EventItem:
 class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
     """
     Priority Queue for events.
+
+    On default the queue is thread safe. Since the simulation engine drives the queue from a single thread, the queue
+    can also be used without any locking by passing thread_safe=False. In that mode :py:func:`put`, :py:func:`get`,
+    :py:func:`empty` and :py:func:`qsize` operate directly on the heap and never block. Joining the queue via
+    :py:func:`PriorityQueue.task_done` and :py:func:`PriorityQueue.join` is not supported in that mode.
     """
 
-    def __init__(self):
+    def __init__(self, thread_safe=True):
+        """
+        Constructor.
+
+        :param thread_safe: If True, all operations are synchronised. If False, no locking is used and the queue
+            must only be used from a single thread.
+        :type thread_safe: bool
+        """
         super().__init__()
+        self._thread_safe = thread_safe
+
+    @property
+    def thread_safe(self):
+        """
+        :return: True if the queue's operations are synchronised and False if the queue operates without locking.
+        :rtype: bool
+        """
+        return self._thread_safe
 
     def put(self, event: Event, block=True, timeout=None):
         """
@@ -645,22 +734,85 @@ class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
         #     raise ValueError(f"Event {event} in the past. Current time: {self._engine.world.current_time}")
         event.added_to_queue(self._engine)
         event_item = EventItem(event.time, event)
-        logger.debug(f"Added event to queue: {event_item}.")
-        super().put(event_item, block, timeout)
+        logger.debug("Added event to queue: {}.", event_item)
+        if self._thread_safe:
+            super().put(event_item, block, timeout)
+        else:
+            self._put(event_item)
 
     def get(self, block=True, timeout=None):
         """
         Removes and returns the next event from the queue.
 
-        :param block: See :py:func:`PriorityQueue.get`
-        :param timeout: See :py:func:`PriorityQueue.get`
+        :param block: See :py:func:`PriorityQueue.get`. Ignored if the queue is not thread safe.
+        :param timeout: See :py:func:`PriorityQueue.get`. Ignored if the queue is not thread safe.
         :return: The event.
         :rtype: Event
+        :raises queue.Empty: If the queue is not thread safe and empty.
         """
-        event_item = super().get(block, timeout)
+        if self._thread_safe:
+            event_item = super().get(block, timeout)
+        else:
+            if not self._qsize():
+                raise Empty
+            event_item = self._get()
         event = event_item.event
         return event
 
+    def pop(self):
+        """
+        Removes and returns the next event from the queue without blocking or waiting.
+
+        :return: The event or None if the queue is empty.
+        :rtype: Event | None
+        """
+        event = None
+        if self._thread_safe:
+            with self.mutex:
+                if self._qsize():
+                    event = self._get().event
+        elif self._qsize():
+            event = self._get().event
+        return event
+
+    def peek(self):
+        """
+        Returns the next event without removing it from the queue.
+
+        :return: The event or None if the queue is empty.
+        :rtype: Event | None
+        """
+        if self._thread_safe:
+            with self.mutex:
+                event = self._peek()
+        else:
+            event = self._peek()
+        return event
+
+    def _peek(self):
+        event = None
+        if self._qsize():
+            event = self.queue[0].event
+        return event
+
+    def empty(self):
+        """
+        :return: True if the queue is empty, False otherwise. See :py:func:`PriorityQueue.empty`.
+        :rtype: bool
+        """
+        if self._thread_safe:
+            return super().empty()
+        return not self._qsize()
+
+    def qsize(self):
+        """
+        :return: The number of events in the queue. See :py:func:`PriorityQueue.qsize`.
+        :rtype: int
+        """
+        if self._thread_safe:
+            return super().qsize()
+        return self._qsize()
+
     def remove(self, event_s):
         """
         Removes one or more events from the queue.
@@ -741,12 +893,262 @@ class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
         """
         return iter(self.queue)
 
+    def get_snapshot_state(self):
+        """
+        The pending events for a snapshot of the simulation (see :py:class:`mable.snapshot.EngineSnapshot`).
+
+        :return: The state of the queue.
+        :rtype: list
+        """
+        with self.mutex:
+            return list(self.queue)
+
+    def restore_snapshot_state(self, state):
+        """
+        Replace all pending events with the events of a snapshot's queue state. The events are not informed about
+        being added to the queue.
+
+        :param state: The state of a queue as returned by :py:func:`get_snapshot_state`.
+        :type state: list
+        """
+        with self.mutex:
+            self.queue = list(state)
+
+
+class IndexedEventQueue(EventQueue):
+    """
+    Priority Queue for events which keeps an index of the queued events.
+
+    The events are kept in a binary heap of entries ordered by time and insertion order, i.e. events with the same
+    time leave the queue in the order in which they were added. Removed events are only marked as removed and are
+    discarded once they reach the top of the heap. Indices by time and by vessel make :py:func:`remove`,
+    :py:func:`purge`, :py:func:`__contains__` and :py:func:`__getitem__` independent of the overall number of queued
+    events.
+
+    To use this queue in a simulation set :py:const:`ClassFactory.INDEXED_EVENT_QUEUE` to True or pass indexed=True to
+    :py:func:`ClassFactory.generate_event_queue`.
+    """
+
+    _REMOVED = None
+    """The event of an entry that has been removed from the queue."""
+
+    def _init(self, maxsize):
+        """
+        Set up the heap and the indices. Called by the constructor of :py:class:`PriorityQueue`.
+
+        :param maxsize: See :py:class:`PriorityQueue`
+        """
+        self.queue = []
+        self._entries_by_time = {}
+        self._entries_by_vessel = {}
+        self._insertion_counter = itertools.count()
+        self._number_removed_entries = 0
+
+    def _qsize(self):
+        return len(self.queue) - self._number_removed_entries
+
+    def _put(self, event_item):
+        """
+        Adds the event of an event item to the heap and the indices.
+
+        :param event_item: The event item.
+        :type event_item: EventItem
+        """
+        event = event_item.event
+        entry = [event_item.time, next(self._insertion_counter), event]
+        heapq.heappush(self.queue, entry)
+        self._entries_by_time.setdefault(entry[0], {})[entry[1]] = entry
+        if isinstance(event, VesselEvent):
+            self._entries_by_vessel.setdefault(id(event.vessel), {})[entry[1]] = entry
+
+    def _get(self):
+        """
+        Removes and returns the next event item which has not been removed from the heap.
+
+        :return: The event item.
+        :rtype: EventItem
+        """
+        entry = heapq.heappop(self.queue)
+        while entry[2] is self._REMOVED:
+            self._number_removed_entries -= 1
+            entry = heapq.heappop(self.queue)
+        self._drop_from_indices(entry)
+        return EventItem(entry[0], entry[2])
+
+    def _peek(self):
+        """
+        Returns the next event which has not been removed. Removed entries at the top of the heap are discarded.
+
+        :return: The event or None if the queue is empty.
+        :rtype: Event | None
+        """
+        while self.queue and self.queue[0][2] is self._REMOVED:
+            heapq.heappop(self.queue)
+            self._number_removed_entries -= 1
+        event = None
+        if self.queue:
+            event = self.queue[0][2]
+        return event
+
+    def _drop_from_indices(self, entry):
+        """
+        Removes an entry from the time and vessel indices.
+
+        :param entry: The heap entry.
+        :type entry: list
+        """
+        time_entries = self._entries_by_time[entry[0]]
+        del time_entries[entry[1]]
+        if not time_entries:
+            del self._entries_by_time[entry[0]]
+        if isinstance(entry[2], VesselEvent):
+            vessel_key = id(entry[2].vessel)
+            vessel_entries = self._entries_by_vessel[vessel_key]
+            del vessel_entries[entry[1]]
+            if not vessel_entries:
+                del self._entries_by_vessel[vessel_key]
+
+    def _find_entry(self, event):
+        """
+        Find the entry of the event in the queue which is equal to the passed event.
+
+        The identical event is preferred over any event that is only equal to the passed event.
+
+        :param event: The passed event.
+        :type event: Event
+        :return: The entry or None if no such event is in the queue.
+        :rtype: list | None
+        """
+        time_entries = self._entries_by_time.get(event.time)
+        found_entry = None
+        if time_entries is not None:
+            found_entry = next((entry for entry in time_entries.values() if entry[2] is event), None)
+            if found_entry is None:
+                found_entry = next((entry for entry in time_entries.values() if entry[2] == event), None)
+        return found_entry
+
+    def _remove_entry(self, entry):
+        """
+        Marks an entry as removed and drops it from the indices. The heap is compacted once the majority of
+        entries are removed ones.
+
+        :param entry: The heap entry.
+        :type entry: list
+        """
+        self._drop_from_indices(entry)
+        entry[2] = self._REMOVED
+        self._number_removed_entries += 1
+        if self._number_removed_entries > len(self.queue) // 2:
+            self.queue = [one_entry for one_entry in self.queue if one_entry[2] is not self._REMOVED]
+            heapq.heapify(self.queue)
+            self._number_removed_entries = 0
+
+    def remove(self, event_s):
+        """
+        Removes one or more events from the queue.
+
+        :param event_s: The event or a list of events.
+        :type event_s: Event | List[Event]
+        """
+        if not isinstance(event_s, list):
+            event_s = [event_s]
+        with self.mutex:
+            for one_event in event_s:
+                entry = self._find_entry(one_event)
+                if entry is not None:
+                    self._remove_entry(entry)
+                    logger.debug("Removed event from queue: {}.", one_event)
+                else:
+                    logger.warning("Tried to remove event which is not in the queue: {}.", one_event)
+
+    def purge(self, vessel):
+        """
+        Removes all events associated with a vessel from the queue.
+
+        :param vessel: The vessel.
+        :type vessel: Vessel
+        """
+        with self.mutex:
+            vessel_entries = self._entries_by_vessel.get(id(vessel))
+            if vessel_entries is not None:
+                for entry in list(vessel_entries.values()):
+                    self._remove_entry(entry)
+
+    def __contains__(self, event):
+        """
+        Returns if an event that is equal to the passed event is in the queue.
+
+        :param event:  The passed event.
+        :type event:  Event
+        :return: True if such an event is in the queue and False otherwise.
+        :rtype: bool
+        """
+        with self.mutex:
+            return self._find_entry(event) is not None
+
+    def __getitem__(self, event):
+        """
+        Returns an event instance from the queue that is equal to the passed event.
+
+        :param event: The passed event.
+        :type event: Event
+        :return: The event instance from the queue.
+        :rtype: Event
+        :raises ValueError: If no such event is in the queue.
+        """
+        with self.mutex:
+            entry = self._find_entry(event)
+        if entry is None:
+            raise ValueError(event)
+        return entry[2]
+
+    def __iter__(self):
+        """
+        :return: An iterator over the current events in heap order.
+        """
+        return iter([EventItem(entry[0], entry[2]) for entry in self.queue if entry[2] is not self._REMOVED])
+
+    def get_snapshot_state(self):
+        """
+        The pending events and their insertion order for a snapshot of the simulation.
+
+        :return: The state of the queue.
+        :rtype: list
+        """
+        with self.mutex:
+            return [(entry[0], entry[1], entry[2]) for entry in self.queue if entry[2] is not self._REMOVED]
+
+    def restore_snapshot_state(self, state):
+        """
+        Replace all pending events with the events of a snapshot's queue state. The events are not informed about
+        being added to the queue.
+
+        :param state: The state of a queue as returned by :py:func:`get_snapshot_state`.
+        :type state: list
+        """
+        with self.mutex:
+            self._init(0)
+            for time, insertion_number, event in state:
+                entry = [time, insertion_number, event]
+                self.queue.append(entry)
+                self._entries_by_time.setdefault(time, {})[insertion_number] = entry
+                if isinstance(event, VesselEvent):
+                    self._entries_by_vessel.setdefault(id(event.vessel), {})[insertion_number] = entry
+            heapq.heapify(self.queue)
+            self._insertion_counter = itertools.count(max((entry[1] for entry in self.queue), default=-1) + 1)
+
 
 class EventObserver:
     """
     An observer of event occurrences.
+
+    The engine only notifies an observer about events that are instances of one of the classes in
+    :py:const:`EventObserver.OBSERVED_EVENT_TYPES`.
     """
 
+    OBSERVED_EVENT_TYPES = None
+    """The event classes (including subclasses) the observer is notified about. None for all events."""
+
     @abstractmethod
     def notify(self, engine, event, data):
         """
@@ -761,6 +1163,25 @@ class EventObserver:
         """
         pass
 
+    def get_snapshot_state(self):
+        """
+        The state of the observer for a snapshot of the simulation (see :py:class:`mable.snapshot.EngineSnapshot`).
+        Observers that accumulate information over a run should return that information. Returns None on default.
+
+        :return: The state.
+        :rtype: Any
+        """
+        return None
+
+    def restore_snapshot_state(self, state):
+        """
+        Restore the state of the observer from a snapshot. Does nothing on default.
+
+        :param state: The state as returned by :py:func:`get_snapshot_state`.
+        :type state: Any
+        """
+        pass
+
 
 @dataclass
 class EventExecutionData:
@@ -74,6 +74,34 @@ def _get_specification_builder():
     return specifications_builder
 
 
+def extract_resources(environment_files_path="."):
+    """
+    Extract the environment files from the resources archive to the working directory. Files that already exist are
+    not extracted again.
+
+    :param environment_files_path: The location of the environment files, i.e. the resources archive.
+    :type environment_files_path: str
+    :return: The names of the environment files by resource.
+    :rtype: Dict[str, str]
+    :raises FileNotFoundError: If the resource file does not exist.
+    """
+    resource_files = {
+        "precomputed_routes": "precomputed_routes.pickle",
+        "routing_graph_world_mask": "routing_graph_world_mask.pkl",
+        "time_transition_distribution": "time_transition_distribution.csv",
+        "port_cargo_weight_distribution": "port_cargo_weight_distribution.csv",
+        "port_trade_frequency_distribution": "port_trade_frequency_distribution.csv",
+        "ports": "ports.csv"
+    }
+    missing_resource_files = [one_file for one_file in resource_files.values() if not os.path.isfile(one_file)]
+    if missing_resource_files:
+        resources_archive_path = os.path.join(environment_files_path, "mable_resources.zip")
+        with ZipFile(resources_archive_path) as resources_archive:
+            for one_resource_file in missing_resource_files:
+                resources_archive.extract(one_resource_file)
+    return resource_files
+
+
 def _generate_environment(specifications_builder, trade_occurrence_frequency,
                           trades_per_occurrence, simulation_length, environment_files_path=".",
                           fixed_trades=None, use_only_precomputed_routes=False):
@@ -89,19 +117,7 @@ def _generate_environment(specifications_builder, trade_occurrence_frequency,
     :raises FileNotFoundError: If the resource file does not exist.
     """
     try:
-        resource_files = {
-            "precomputed_routes": "precomputed_routes.pickle",
-            "routing_graph_world_mask": "routing_graph_world_mask.pkl",
-            "time_transition_distribution": "time_transition_distribution.csv",
-            "port_cargo_weight_distribution": "port_cargo_weight_distribution.csv",
-            "port_trade_frequency_distribution": "port_trade_frequency_distribution.csv",
-            "ports": "ports.csv"
-        }
-        resources_archive_path = os.path.join(environment_files_path, "mable_resources.zip")
-        resources_archive = ZipFile(resources_archive_path)
-        for one_resource_file_key in resource_files:
-            if not os.path.isfile(resource_files[one_resource_file_key]):
-                resources_archive.extract(resource_files[one_resource_file_key])
+        resource_files = extract_resources(environment_files_path)
         real_ports = world_ports.get_ports(resource_files["ports"])
         specifications_builder.add_shipping_network(
             ports=real_ports,
@@ -130,7 +146,7 @@ def _generate_environment(specifications_builder, trade_occurrence_frequency,
 
 
 def generate_simulation(specifications_builder, show_detailed_auction_outcome=False, output_directory=".",
-                        global_agent_timeout=60, info=None):
+                        global_agent_timeout=60, info=None, profile=False):
     """
     Generate a simulation from a specifications.
 
@@ -146,6 +162,9 @@ def generate_simulation(specifications_builder, show_detailed_auction_outcome=Fa
     :return: The simulation instance.
     :param info: Any information on the simulation.
     :type info: str | dict
+    :param profile: Measure the phases of the simulation run and export the measurements to the output directory.
+        Default is False.
+    :type profile: bool
     :rtype: SimulationEngine
     :raises ValueError: If the output directory does not exist.
     """
@@ -156,9 +175,10 @@ def generate_simulation(specifications_builder, show_detailed_auction_outcome=Fa
     pre_run = ([LogRunner(logger, "---Pre Run Start---")]
                + SimulationEngine.PRE_RUN_CMDS
                + [LogRunner(logger, "--Run Start (Pre Run Finished)---")])
-    post_run = [LogRunner(logger, "--Run Finished---"), _export_stats]
+    post_run = [LogRunner(logger, "--Run Finished---"), _export_stats] + SimulationEngine.POST_RUN_CMDS
     sim = sim_factory.generate_engine(pre_run_cmds=pre_run, post_run_cmds=post_run, output_directory=output_directory,
-                                      global_agent_timeout=global_agent_timeout, info=info)
+                                      global_agent_timeout=global_agent_timeout, info=info, profile=profile,
+                                      export_profile=profile)
     _activate_stats_collection(sim, show_detailed_auction_outcome)
     _activate_contract_fulfillment_check(sim)
     return sim
@@ -228,6 +248,8 @@ class _DummyIdling(IdleEvent):
     An artificial idling event.
     """
 
+    __slots__ = ()
+
     def __init__(self, time, vessel, time_started):
         super().__init__(time, vessel, Location(0, 0))
         self._time_started = time_started
@@ -2,7 +2,6 @@
 Extension to generate and transport cargoes based on cargo frequency and amount distributions
 and associated changes to shipping.
 """
-import pickle
 from typing import Tuple
 
 import numpy as np
@@ -10,7 +9,8 @@ import pandas as pd
 import loguru
 
 from mable.shipping_market import TimeWindowTrade
-from mable.extensions.world_ports import LatLongFactory
+from mable.extensions.resources import ResourceManager
+from mable.extensions.world_ports import LatLongFactory, load_precomputed_routes
 from mable.event_management import ArrivalEvent
 from mable.simulation_generation import SimulationBuilder
 from mable.shipping_market import Shipping
@@ -42,6 +42,8 @@ class TimeWindowArrivalEvent(ArrivalEvent):
     An event where a vessel arrives for loading or unloading.
     """
 
+    __slots__ = ()
+
     def __eq__(self, other):
         return (
                 super().__eq__(other)
@@ -118,8 +120,8 @@ class DistributionShipping(Shipping):
                      f" cargo events.")
         precomputed_routes = None
         if not precomputed_routes_file is None:
-            with open(precomputed_routes_file, "rb") as f:
-                precomputed_routes = pickle.load(f)
+            precomputed_routes = ResourceManager.get_precomputed_routes(
+                precomputed_routes_file, load_precomputed_routes)
         for i in range(0, simulation_length + 1, trade_occurrence_frequency):
             pickup_period_days = (i/24, (i + trade_occurrence_frequency - 1)/24)
             cargoes_generated = self.sample_cargoes_from_port_distributions(
@@ -148,9 +150,9 @@ class DistributionShipping(Shipping):
             The path to the csv with information on the average visit frequency at the ports.
         """
 
-        self._time_transition_dist = pd.read_csv(port_transition_duration_distributions_path)
-        self._cargo_weight_dist = pd.read_csv(port_cargo_weight_distribution_path)
-        self._frequency_dist = pd.read_csv(port_trade_frequency_distribution_path)
+        self._time_transition_dist = ResourceManager.get_table(port_transition_duration_distributions_path)
+        self._cargo_weight_dist = ResourceManager.get_table(port_cargo_weight_distribution_path)
+        self._frequency_dist = ResourceManager.get_table(port_trade_frequency_distribution_path)
 
     @staticmethod
     def sample_cargo_weight(world, cargo_weight_dict, cargo_weight_distribution,
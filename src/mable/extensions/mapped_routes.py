@@ -0,0 +1,304 @@
+"""
+Columnar route database that is opened via mmap and creates route objects only when they are accessed.
+"""
+
+from collections.abc import Mapping
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+from loguru import logger
+
+
+MAPPED_ROUTE_DATABASE_MAGIC = b"MABLERDB"
+"""The first bytes of a mapped route database file."""
+
+MAPPED_ROUTE_DATABASE_VERSION = 1
+"""The version of the format that is written by :py:func:`write_mapped_route_database`."""
+
+_ALIGNMENT = 8
+_HEADER_LENGTH_FORMAT = "<Q"
+
+
+def is_mapped_route_database(file_path):
+    """
+    :param file_path: The path of a file.
+    :type file_path: str | os.PathLike
+    :return: True if the file is a mapped route database.
+    :rtype: bool
+    """
+    with open(file_path, "rb") as routes_file:
+        return routes_file.read(len(MAPPED_ROUTE_DATABASE_MAGIC)) == MAPPED_ROUTE_DATABASE_MAGIC
+
+
+def split_routes_key(key, port_ids):
+    """
+    Split the concatenated names of a start and an end port, e.g. 'AB', into the ids of both ports.
+
+    :param key: The concatenated names.
+    :type key: str
+    :param port_ids: The ids of the ports by name.
+    :type port_ids: Dict[str, int]
+    :return: All splits of the key into the ids of two known ports.
+    :rtype: Iterator[Tuple[int, int]]
+    """
+    for split_index in range(1, len(key)):
+        port_id_one = port_ids.get(key[:split_index])
+        if port_id_one is not None:
+            port_id_two = port_ids.get(key[split_index:])
+            if port_id_two is not None:
+                yield port_id_one, port_id_two
+
+
+def _pad(length):
+    return -length % _ALIGNMENT
+
+
+def write_mapped_route_database(routes, port_names, file_path, scenarios=None):
+    """
+    Write routes as a mapped route database (see :py:class:`MappedRouteDatabase`). The file is replaced once the
+    database is completely written.
+
+    :param routes: The routes by the concatenated names of their start and end ports.
+    :type routes: Mapping[str, List[Route]]
+    :param port_names: The names of all ports the routes are between.
+    :type port_names: List[str]
+    :param file_path: The path of the file.
+    :type file_path: str | os.PathLike
+    :param scenarios: The canal scenarios of the routes. Canals of routes that are not one of the scenarios are
+        added to the scenarios.
+    :type scenarios: List[Tuple[str]] | None
+    """
+    port_names = list(port_names)
+    port_ids = {port_name: port_id for port_id, port_name in enumerate(port_names)}
+    scenarios = [tuple(one_scenario) for one_scenario in scenarios or []]
+    scenario_indices = {one_scenario: scenario_index for scenario_index, one_scenario in enumerate(scenarios)}
+    route_names = [""]
+    route_name_indices = {"": 0}
+    pair_index = np.full((len(port_names), len(port_names)), -1, dtype="<i4")
+    pair_ports = []
+    pair_route_offsets = [0]
+    route_lengths = []
+    route_scenarios = []
+    route_names_of_routes = []
+    route_point_offsets = [0]
+    points = []
+    for key, key_routes in routes.items():
+        port_id_pair = next(split_routes_key(key, port_ids), None)
+        if port_id_pair is None:
+            logger.warning(f"Routes entry '{key}' is not between two of the ports and is left out.")
+            continue
+        pair_index[port_id_pair] = len(pair_ports)
+        pair_ports.append(port_id_pair)
+        for one_route in key_routes:
+            route_lengths.append(one_route.length)
+            if one_route.canals is None:
+                route_scenarios.append(-1)
+            else:
+                canals = tuple(one_route.canals)
+                if canals not in scenario_indices:
+                    scenario_indices[canals] = len(scenarios)
+                    scenarios.append(canals)
+                route_scenarios.append(scenario_indices[canals])
+            if one_route.name not in route_name_indices:
+                route_name_indices[one_route.name] = len(route_names)
+                route_names.append(one_route.name)
+            route_names_of_routes.append(route_name_indices[one_route.name])
+            points.extend((point[0], point[1]) for point in one_route.route)
+            route_point_offsets.append(len(points))
+        pair_route_offsets.append(len(route_lengths))
+    arrays = {
+        "pair_index": pair_index,
+        "pair_ports": np.array(pair_ports, dtype="<i4").reshape(-1, 2),
+        "pair_route_offsets": np.array(pair_route_offsets, dtype="<i8"),
+        "route_lengths": np.array(route_lengths, dtype="<f8"),
+        "route_scenarios": np.array(route_scenarios, dtype="<i2"),
+        "route_names": np.array(route_names_of_routes, dtype="<i4"),
+        "route_point_offsets": np.array(route_point_offsets, dtype="<i8"),
+        "points": np.array(points, dtype="<f4").reshape(-1, 2),
+    }
+    header = {
+        "version": MAPPED_ROUTE_DATABASE_VERSION,
+        "port_names": port_names,
+        "scenarios": [list(one_scenario) for one_scenario in scenarios],
+        "route_names": route_names,
+        "arrays": {}
+    }
+    # The offsets are relative to the start of the arrays, i.e. the first aligned position after the header.
+    offset = 0
+    for array_name, array in arrays.items():
+        header["arrays"][array_name] = {"offset": offset, "dtype": array.dtype.str, "shape": array.shape}
+        offset += array.nbytes + _pad(array.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8")
+    temporary_file_path = f"{file_path}.tmp"
+    with open(temporary_file_path, "wb") as routes_file:
+        routes_file.write(MAPPED_ROUTE_DATABASE_MAGIC)
+        routes_file.write(struct.pack(_HEADER_LENGTH_FORMAT, len(header_bytes)))
+        routes_file.write(header_bytes)
+        routes_file.write(bytes(_pad(routes_file.tell())))
+        for array in arrays.values():
+            routes_file.write(array.tobytes())
+            routes_file.write(bytes(_pad(array.nbytes)))
+    os.replace(temporary_file_path, file_path)
+
+
+class MappedRouteDatabase(Mapping):
+    """
+    The precomputed routes by the concatenated names of their start and end ports, e.g. routes['AB'], stored in
+    columns that are memory-mapped from a file (see :py:func:`write_mapped_route_database`).
+
+    The file holds the index of the stored pairs of ports by port id, the range of routes of each pair, the length,
+    canal scenario and name of each route and the points of all routes as packed float32 longitude and latitude
+    pairs. Opening the database only reads the header. The route objects of a pair of ports are created on the
+    first access and kept, so that the same objects are returned on every access. Pages of the file are only read
+    for the routes that are accessed and are shared by all processes that map the file.
+
+    The database is read-only since it is shared by all networks of a process (see :py:class:`ResourceManager`).
+    The coordinates of materialised routes are the stored float32 values. The canals of the routes are tuples.
+    """
+
+    def __init__(self, file_path, route_factory):
+        """
+        :param file_path: The path of the file.
+        :type file_path: str | os.PathLike
+        :param route_factory: Creates a route from its name, points, length and canals, e.g.
+            :py:class:`mable.extensions.world_ports.Route`.
+        :type route_factory: Callable[[str, List[Tuple[float, float]], float, Tuple[str] | None], Route]
+        :raises ValueError: If the file is not a mapped route database or the version of the file is not supported.
+        """
+        super().__init__()
+        self._file_path = file_path
+        self._route_factory = route_factory
+        with open(file_path, "rb") as routes_file:
+            self._buffer = mmap.mmap(routes_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic_length = len(MAPPED_ROUTE_DATABASE_MAGIC)
+        if self._buffer[:magic_length] != MAPPED_ROUTE_DATABASE_MAGIC:
+            raise ValueError(f"'{file_path}' is not a mapped route database.")
+        header_start = magic_length + struct.calcsize(_HEADER_LENGTH_FORMAT)
+        header_length, = struct.unpack_from(_HEADER_LENGTH_FORMAT, self._buffer, magic_length)
+        header = json.loads(self._buffer[header_start:header_start + header_length].decode("utf-8"))
+        data_start = header_start + header_length + _pad(header_start + header_length)
+        self._version = header["version"]
+        if self._version > MAPPED_ROUTE_DATABASE_VERSION:
+            raise ValueError(f"Mapped route database version {self._version} is not supported"
+                             f" (up to version {MAPPED_ROUTE_DATABASE_VERSION}).")
+        self._port_names = header["port_names"]
+        self._port_ids = {port_name: port_id for port_id, port_name in enumerate(self._port_names)}
+        self._scenarios = [tuple(one_scenario) for one_scenario in header["scenarios"]]
+        self._route_names = header["route_names"]
+        arrays = {}
+        for array_name, array_information in header["arrays"].items():
+            shape = tuple(array_information["shape"])
+            arrays[array_name] = np.frombuffer(
+                self._buffer, dtype=np.dtype(array_information["dtype"]), count=int(np.prod(shape, dtype=int)),
+                offset=data_start + array_information["offset"]).reshape(shape)
+        self._pair_index = arrays["pair_index"]
+        self._pair_ports = arrays["pair_ports"]
+        self._pair_route_offsets = arrays["pair_route_offsets"]
+        self._route_lengths = arrays["route_lengths"]
+        self._route_scenarios = arrays["route_scenarios"]
+        self._route_name_indices = arrays["route_names"]
+        self._route_point_offsets = arrays["route_point_offsets"]
+        self._points = arrays["points"]
+        self._routes = {}
+
+    @property
+    def file_path(self):
+        """
+        :return: The path of the file.
+        :rtype: str | os.PathLike
+        """
+        return self._file_path
+
+    @property
+    def version(self):
+        """
+        :return: The version of the file's format.
+        :rtype: int
+        """
+        return self._version
+
+    @property
+    def port_names(self):
+        """
+        :return: The names of the ports in the order of their ids.
+        :rtype: List[str]
+        """
+        return self._port_names
+
+    @property
+    def scenarios(self):
+        """
+        :return: The canal scenarios of the routes.
+        :rtype: List[Tuple[str]]
+        """
+        return self._scenarios
+
+    def _get_pair_index(self, key):
+        """
+        :param key: The concatenated names of the start and the end port.
+        :type key: str
+        :return: The index of the stored pair of ports or -1 if the routes are not stored.
+        :rtype: int
+        """
+        for port_id_one, port_id_two in split_routes_key(key, self._port_ids):
+            pair_index = int(self._pair_index[port_id_one, port_id_two])
+            if pair_index >= 0:
+                return pair_index
+        return -1
+
+    def _create_route(self, route_index):
+        start, end = self._route_point_offsets[route_index:route_index + 2].tolist()
+        points = [tuple(point) for point in self._points[start:end].tolist()]
+        scenario_index = int(self._route_scenarios[route_index])
+        canals = self._scenarios[scenario_index] if scenario_index >= 0 else None
+        name = self._route_names[int(self._route_name_indices[route_index])]
+        return self._route_factory(name, points, float(self._route_lengths[route_index]), canals)
+
+    def _get_routes(self, pair_index):
+        routes = self._routes.get(pair_index)
+        if routes is None:
+            start, end = self._pair_route_offsets[pair_index:pair_index + 2].tolist()
+            routes = [self._create_route(route_index) for route_index in range(start, end)]
+            self._routes[pair_index] = routes
+        return routes
+
+    def __getitem__(self, key):
+        pair_index = self._get_pair_index(key)
+        if pair_index < 0:
+            raise KeyError(key)
+        return self._get_routes(pair_index)
+
+    def __contains__(self, key):
+        return self._get_pair_index(key) >= 0
+
+    def __iter__(self):
+        for port_id_one, port_id_two in self._pair_ports.tolist():
+            yield f"{self._port_names[port_id_one]}{self._port_names[port_id_two]}"
+
+    def __len__(self):
+        return len(self._pair_ports)
+
+    def get_shortest_lengths(self, port_names):
+        """
+        Look up the length of the first, i.e. shortest, route between each pair of ports without creating the routes.
+        The routes from the first to the second port are preferred over the routes in the opposite direction.
+
+        :param port_names: The names of the ports.
+        :type port_names: List[str]
+        :return: The lengths with one row and one column per port. NaN for pairs of ports without routes.
+        :rtype: np.ndarray
+        """
+        port_ids = np.array([self._port_ids.get(one_port_name, -1) for one_port_name in port_names], dtype=int)
+        is_stored_port = port_ids >= 0
+        pair_indices = self._pair_index[np.ix_(np.maximum(port_ids, 0), np.maximum(port_ids, 0))].astype(int)
+        pair_indices[~is_stored_port, :] = -1
+        pair_indices[:, ~is_stored_port] = -1
+        pair_indices = np.where(pair_indices >= 0, pair_indices, pair_indices.T)
+        route_starts = self._pair_route_offsets[:-1]
+        has_routes = self._pair_route_offsets[1:] > route_starts
+        first_lengths = np.full(len(route_starts) + 1, np.nan)
+        first_lengths[:-1][has_routes] = self._route_lengths[route_starts[has_routes]]
+        return first_lengths[pair_indices]
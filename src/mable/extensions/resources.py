@@ -0,0 +1,151 @@
+"""
+Process wide sharing of the read-only environment resources, i.e. precomputed routes, routing graphs, distance
+matrices and distribution tables.
+"""
+
+import gc
+import os
+import pickle
+
+import pandas as pd
+from loguru import logger
+
+
+class ResourceManager:
+    """
+    Loads each environment resource file once per process and hands the same object to every simulation.
+
+    The resources are kept by the absolute path of their file. If they are loaded before worker processes are
+    forked (see :py:func:`preload`), the workers inherit the resources instead of loading them again. The objects
+    returned by the manager must not be changed. Objects that a simulation changes, like the routing graph, have to
+    be copied by the simulation.
+    """
+
+    _precomputed_routes = {}
+    _route_graphs = {}
+    _distance_matrices = {}
+    _tables = {}
+
+    @staticmethod
+    def _get_key(file_path):
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def _load_pickle(file_path):
+        with open(file_path, "rb") as pickle_file:
+            return pickle.load(pickle_file)
+
+    @classmethod
+    def get_precomputed_routes(cls, file_path, load_function=None):
+        """
+        :param file_path: The path to the precomputed routes.
+        :type file_path: str
+        :param load_function: The function to load the routes from the file if they are not loaded yet, e.g.
+            :py:func:`mable.extensions.world_ports.load_precomputed_routes` which also opens mapped route databases.
+            Defaults to unpickling the file.
+        :type load_function: Callable[[str], Mapping] | None
+        :return: The precomputed routes by the concatenated names of their start and end ports.
+        :rtype: Mapping
+        """
+        key = cls._get_key(file_path)
+        routes = cls._precomputed_routes.get(key)
+        if routes is None:
+            logger.debug("Loading precomputed routes from {}.", key)
+            if load_function is None:
+                load_function = cls._load_pickle
+            routes = load_function(key)
+            cls._precomputed_routes[key] = routes
+        return routes
+
+    @classmethod
+    def get_route_graph(cls, file_path, load_function):
+        """
+        :param file_path: The path to the routing graph.
+        :type file_path: str
+        :param load_function: The function to load the graph from the file if it is not loaded yet.
+        :type load_function: Callable[[str], networkx.Graph]
+        :return: The routing graph.
+        :rtype: networkx.Graph
+        """
+        key = cls._get_key(file_path)
+        graph = cls._route_graphs.get(key)
+        if graph is None:
+            logger.debug("Loading routing graph from {}.", key)
+            graph = load_function(key)
+            cls._route_graphs[key] = graph
+        return graph
+
+    @classmethod
+    def get_distance_matrix(cls, file_path, port_names, compile_function):
+        """
+        :param file_path: The path to the pickled routes the distances are compiled from.
+        :type file_path: str
+        :param port_names: The names of the ports in the order of the matrix' rows and columns.
+        :type port_names: List[str]
+        :param compile_function: The function to compile the matrix if it is not compiled yet.
+        :type compile_function: Callable[[], np.ndarray]
+        :return: The distance matrix.
+        :rtype: np.ndarray
+        """
+        key = (cls._get_key(file_path), tuple(port_names))
+        distance_matrix = cls._distance_matrices.get(key)
+        if distance_matrix is None:
+            logger.debug("Compiling distance matrix of {} ports from {}.", len(port_names), key[0])
+            distance_matrix = compile_function()
+            distance_matrix.flags.writeable = False
+            cls._distance_matrices[key] = distance_matrix
+        return distance_matrix
+
+    @classmethod
+    def get_table(cls, file_path):
+        """
+        :param file_path: The path to a csv file.
+        :type file_path: str
+        :return: The table of the csv file.
+        :rtype: pd.DataFrame
+        """
+        key = cls._get_key(file_path)
+        table = cls._tables.get(key)
+        if table is None:
+            table = pd.read_csv(key)
+            cls._tables[key] = table
+        return table
+
+    @classmethod
+    def preload(cls, precomputed_routes_file=None, table_files=None, precomputed_routes_load_function=None):
+        """
+        Load resources ahead of forking worker processes and exclude all objects that exist at this point from
+        garbage collection (see :py:func:`gc.freeze`).
+
+        Forked workers then do not load the resources again, and their garbage collectors do not write to the
+        resources' objects. This does not keep the memory pages of Python objects shared: every access to an object
+        changes its reference count and the worker gets a copy of the page. Pickled routes and the string columns
+        of tables are therefore copied step by step as a worker uses them. Only a mapped route database (see
+        :py:mod:`mable.extensions.mapped_routes`) and numpy arrays created before the fork stay in pages that the
+        workers share.
+
+        :param precomputed_routes_file: The path to the precomputed routes.
+        :type precomputed_routes_file: str | None
+        :param table_files: The paths to csv files.
+        :type table_files: list[str] | None
+        :param precomputed_routes_load_function: The function to load the routes (see
+            :py:func:`get_precomputed_routes`).
+        :type precomputed_routes_load_function: Callable[[str], Mapping] | None
+        """
+        if precomputed_routes_file is not None:
+            cls.get_precomputed_routes(precomputed_routes_file, precomputed_routes_load_function)
+        for one_table_file in table_files or []:
+            cls.get_table(one_table_file)
+        gc.collect()
+        gc.freeze()
+
+    @classmethod
+    def clear(cls):
+        """
+        Drop all loaded resources and return objects excluded by :py:func:`preload` to the garbage collection.
+        """
+        gc.unfreeze()
+        cls._precomputed_routes.clear()
+        cls._route_graphs.clear()
+        cls._distance_matrices.clear()
+        cls._tables.clear()
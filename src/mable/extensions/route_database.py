@@ -0,0 +1,362 @@
+"""
+Offline computation of the precomputed routes between all pairs of ports.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+import numpy as np
+from loguru import logger
+
+from mable.extensions.mapped_routes import is_mapped_route_database, write_mapped_route_database
+from mable.extensions.world_ports import LatLongShippingNetwork, Route, get_ports, load_precomputed_routes
+
+if TYPE_CHECKING:
+    from mable.extensions.world_ports import LatLongPort
+
+
+ROUTE_DATABASE_VERSION = 1
+"""The version of the route database format that is written by :py:func:`write_route_database`."""
+
+
+class RouteDatabase(dict):
+    """
+    The precomputed routes by the concatenated names of their start and end ports, e.g. routes['AB'], together with
+    the version of the format, the names of the ports and the canal scenarios the routes were computed for.
+
+    The routes between two ports are only stored in one direction. Since the database is a dict, it can be used
+    wherever the routes of a pickled routes dict are used (see :py:class:`LatLongShippingNetwork`).
+    """
+
+    def __init__(self, routes=None, port_names=None, scenarios=None):
+        """
+        :param routes: The routes by the concatenated names of their start and end ports.
+        :type routes: Dict[str, List[Route]] | None
+        :param port_names: The names of the ports.
+        :type port_names: List[str] | None
+        :param scenarios: The canal scenarios.
+        :type scenarios: List[Tuple[str]] | None
+        """
+        super().__init__(routes or {})
+        self.version = ROUTE_DATABASE_VERSION
+        self.port_names = list(port_names or [])
+        self.scenarios = list(scenarios or [])
+
+    def __setstate__(self, state):
+        if state.get("version", 0) > ROUTE_DATABASE_VERSION:
+            raise ValueError(f"Route database version {state['version']} is not supported"
+                             f" (up to version {ROUTE_DATABASE_VERSION}).")
+        self.__dict__.update(state)
+
+    def has_routes(self, port_name_one, port_name_two):
+        """
+        :param port_name_one: The name of the first port.
+        :type port_name_one: str
+        :param port_name_two: The name of the second port.
+        :type port_name_two: str
+        :return: True if the routes between the ports are stored in either direction.
+        :rtype: bool
+        """
+        return f"{port_name_one}{port_name_two}" in self or f"{port_name_two}{port_name_one}" in self
+
+
+def write_route_database(route_database, file_path):
+    """
+    Write a route database. The file is replaced once the database is completely written.
+
+    :param route_database: The database.
+    :type route_database: RouteDatabase
+    :param file_path: The path of the file.
+    :type file_path: str | os.PathLike
+    """
+    temporary_file_path = f"{file_path}.tmp"
+    with open(temporary_file_path, "wb") as route_database_file:
+        pickle.dump(route_database, route_database_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file_path, file_path)
+
+
+def read_route_database(file_path):
+    """
+    Read a route database, a mapped route database (see :py:class:`mable.extensions.mapped_routes.MappedRouteDatabase`)
+    or a pickled routes dict.
+
+    :param file_path: The path of the file.
+    :type file_path: str | os.PathLike
+    :return: The database. All routes of a mapped route database are loaded. A routes dict is returned as a database
+        without port names and scenarios.
+    :rtype: RouteDatabase
+    """
+    if is_mapped_route_database(file_path):
+        mapped_routes = load_precomputed_routes(file_path)
+        routes = RouteDatabase(mapped_routes, mapped_routes.port_names, mapped_routes.scenarios)
+    else:
+        with open(file_path, "rb") as route_database_file:
+            routes = pickle.load(route_database_file)
+        if not isinstance(routes, RouteDatabase):
+            routes = RouteDatabase(routes)
+    return routes
+
+
+def build_csr_adjacency(nodes, edges):
+    """
+    Build the adjacency of an undirected graph in compressed sparse row (CSR) form.
+
+    :param nodes: The number of nodes.
+    :type nodes: int
+    :param edges: The edges as tuples of the indices of both nodes and the weight.
+    :type edges: List[Tuple[int, int, float]]
+    :return: The start of each node's neighbours in the indices and weights (one more entry than nodes), the indices
+        of the neighbours and the weights of the edges to the neighbours.
+    :rtype: Tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    edges = np.array(edges, dtype=float).reshape(-1, 3)
+    sources = np.concatenate([edges[:, 0], edges[:, 1]]).astype(np.int64)
+    targets = np.concatenate([edges[:, 1], edges[:, 0]]).astype(np.int64)
+    weights = np.concatenate([edges[:, 2], edges[:, 2]])
+    order = np.argsort(sources, kind="stable")
+    index_pointers = np.zeros(nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=nodes), out=index_pointers[1:])
+    return index_pointers, targets[order], weights[order]
+
+
+def get_shortest_path_tree(index_pointers, indices, weights, source):
+    """
+    Dijkstra's algorithm from one source over a graph in CSR form (see :py:func:`build_csr_adjacency`).
+
+    :param index_pointers: The start of each node's neighbours.
+    :type index_pointers: List[int]
+    :param indices: The indices of the neighbours.
+    :type indices: List[int]
+    :param weights: The weights of the edges to the neighbours.
+    :type weights: List[float]
+    :param source: The index of the source node.
+    :type source: int
+    :return: The distance of each node from the source (math.inf if not reachable) and the predecessor of each node
+        on its shortest path (-1 for the source and nodes that are not reachable).
+    :rtype: Tuple[List[float], List[int]]
+    """
+    number_nodes = len(index_pointers) - 1
+    distances = [math.inf] * number_nodes
+    predecessors = [-1] * number_nodes
+    distances[source] = 0
+    heap = [(0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue
+        for edge in range(index_pointers[node], index_pointers[node + 1]):
+            neighbour = indices[edge]
+            neighbour_distance = distance + weights[edge]
+            if neighbour_distance < distances[neighbour]:
+                distances[neighbour] = neighbour_distance
+                predecessors[neighbour] = node
+                heapq.heappush(heap, (neighbour_distance, neighbour))
+    return distances, predecessors
+
+
+_route_worker_state = {}
+"""The builder of a worker process (see :py:func:`_initialise_route_worker`)."""
+
+
+def _initialise_route_worker(builder):
+    _route_worker_state["builder"] = builder
+
+
+def _compute_routes_in_worker(source_index, target_indices):
+    return _route_worker_state["builder"].compute_routes_from_port(source_index, target_indices)
+
+
+class RouteDatabaseBuilder:
+    """
+    Computes the routes between ports for all canal scenarios of a :py:class:`LatLongShippingNetwork`.
+
+    Instead of one shortest path search per pair of ports and scenario on the world graph, the builder computes one
+    shortest path tree per port and scenario on a compressed sparse row (CSR) adjacency of the graph. The adjacency
+    of each scenario is built once, so that the world graph is not changed, and the trees of the ports are computed
+    in parallel worker processes. The routes are smoothed and measured like
+    :py:func:`LatLongShippingNetwork.get_shortest_route_between_points` does.
+    """
+
+    def __init__(self, ports, graph_file):
+        """
+        :param ports: The ports.
+        :type ports: List[LatLongPort]
+        :param graph_file: The path to the routing graph (see :py:func:`LatLongShippingNetwork.load_route_graph`).
+        :type graph_file: str
+        """
+        super().__init__()
+        self._ports = ports
+        self._network = LatLongShippingNetwork(ports=ports, graph_file=graph_file)
+        self._nodes = list(self._network.world_graph.nodes)
+        self._scenarios = self._network.scenarios
+        node_indices = {node: node_index for node_index, node in enumerate(self._nodes)}
+        self._port_nodes = [node_indices[self._network.find_closest_node(one_port.longitude, one_port.latitude)]
+                            for one_port in ports]
+        self._adjacencies = self._build_scenario_adjacencies(node_indices)
+
+    @property
+    def scenarios(self):
+        """
+        :return: The canal scenarios.
+        :rtype: List[Tuple[str]]
+        """
+        return self._scenarios
+
+    def _build_scenario_adjacencies(self, node_indices):
+        """
+        :return: The adjacency of the world graph for each scenario. Each scenario contains the graph's edges
+            except the canals and the edges of the scenario's canals
+            (see :py:func:`LatLongShippingNetwork.add_canal_to_graph`).
+        :rtype: List[Tuple[List[int], List[int], List[float]]]
+        """
+        canal_edges = {}
+        for canal_name, (start_node, end_node) in self._network.canals_nodes.items():
+            weight = float(LatLongShippingNetwork.get_long_lat_dist(
+                start_node[1], start_node[0], end_node[1], end_node[0]))
+            canal_edges[canal_name] = (node_indices[start_node], node_indices[end_node], weight)
+        canal_node_pairs = {frozenset(edge[:2]) for edge in canal_edges.values()}
+        edges = [(node_indices[node_one], node_indices[node_two], weight)
+                 for node_one, node_two, weight in self._network.world_graph.edges(data="weight")
+                 if frozenset((node_indices[node_one], node_indices[node_two])) not in canal_node_pairs]
+        adjacencies = []
+        for one_scenario in self._scenarios:
+            scenario_edges = edges + [canal_edges[canal_name] for canal_name in one_scenario]
+            index_pointers, indices, weights = build_csr_adjacency(len(self._nodes), scenario_edges)
+            adjacencies.append((index_pointers.tolist(), indices.tolist(), weights.tolist()))
+        return adjacencies
+
+    def compute_routes_from_port(self, source_index, target_indices):
+        """
+        Compute the routes from one port to other ports.
+
+        :param source_index: The index of the start port.
+        :type source_index: int
+        :param target_indices: The indices of the end ports.
+        :type target_indices: List[int]
+        :return: The routes sorted by length by the concatenated names of the start and the end port. Pairs of ports
+            without a path in any scenario are left out.
+        :rtype: Dict[str, List[Route]]
+        """
+        source_port = self._ports[source_index]
+        source_node = self._port_nodes[source_index]
+        routes_per_target = {one_target_index: set() for one_target_index in target_indices}
+        for one_scenario, (index_pointers, indices, weights) in zip(self._scenarios, self._adjacencies):
+            distances, predecessors = get_shortest_path_tree(index_pointers, indices, weights, source_node)
+            for one_target_index in target_indices:
+                target_node = self._port_nodes[one_target_index]
+                if math.isinf(distances[target_node]):
+                    continue
+                path = [target_node]
+                while path[-1] != source_node:
+                    path.append(predecessors[path[-1]])
+                target_port = self._ports[one_target_index]
+                route = [(source_port.longitude, source_port.latitude)]
+                route += [self._nodes[one_node] for one_node in reversed(path)]
+                route += [(target_port.longitude, target_port.latitude)]
+                route = [tuple(pt) for pt in self._network.smooth_route(route)]
+                routes_per_target[one_target_index].add(
+                    Route("", route, self._network.compute_route_length(route), one_scenario))
+        routes = {}
+        for one_target_index, target_routes in routes_per_target.items():
+            target_port = self._ports[one_target_index]
+            if target_routes:
+                routes[f"{source_port.name}{target_port.name}"] = sorted(target_routes, key=lambda r: r.length)
+            else:
+                logger.warning(f"No routes between '{source_port.name}' and '{target_port.name}' found.")
+        return routes
+
+    def build(self, existing_routes=None, max_workers=None, mp_context=None):
+        """
+        Compute the routes between all pairs of ports that are not in the existing routes.
+
+        :param existing_routes: Routes to keep. The routes between pairs of ports that are stored in either direction
+            are not computed again.
+        :type existing_routes: Dict[str, List[Route]] | None
+        :param max_workers: The maximal number of worker processes. If None, the number of processors is used.
+        :type max_workers: int | None
+        :param mp_context: The multiprocessing context for the worker processes. If None, the workers are forked
+            where possible so that they share the world graph and the adjacencies with this process.
+        :return: The database of the existing and the computed routes.
+        :rtype: RouteDatabase
+        """
+        route_database = RouteDatabase(existing_routes, [one_port.name for one_port in self._ports], self._scenarios)
+        tasks = []
+        for source_index, source_port in enumerate(self._ports):
+            target_indices = [target_index for target_index in range(source_index + 1, len(self._ports))
+                              if not route_database.has_routes(source_port.name, self._ports[target_index].name)]
+            if target_indices:
+                tasks.append((source_index, target_indices))
+        logger.info(f"Computing routes from {len(tasks)} of {len(self._ports)} ports"
+                    f" in {len(self._scenarios)} canal scenarios.")
+        if mp_context is None and "fork" in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                                 initializer=_initialise_route_worker, initargs=(self,)) as executor:
+            futures = {executor.submit(_compute_routes_in_worker, source_index, target_indices): source_index
+                       for source_index, target_indices in tasks}
+            for number_finished, one_future in enumerate(as_completed(futures), start=1):
+                route_database.update(one_future.result())
+                logger.info(f"[{number_finished}/{len(tasks)}] Routes from"
+                            f" '{self._ports[futures[one_future]].name}' computed.")
+        return route_database
+
+
+def build_route_database(ports_file, graph_file, output_file, existing_file=None, max_workers=None, mapped=False):
+    """
+    Compute the routes between all ports of a ports file and write them to a route database.
+
+    :param ports_file: The path to the ports csv (see :py:func:`mable.extensions.world_ports.get_ports`).
+    :type ports_file: str
+    :param graph_file: The path to the routing graph.
+    :type graph_file: str
+    :param output_file: The path of the route database to write.
+    :type output_file: str
+    :param existing_file: A route database or pickled routes whose routes are kept and not computed again.
+    :type existing_file: str | None
+    :param max_workers: The maximal number of worker processes. If None, the number of processors is used.
+    :type max_workers: int | None
+    :param mapped: If True, the database is written as mapped route database
+        (see :py:class:`mable.extensions.mapped_routes.MappedRouteDatabase`).
+    :type mapped: bool
+    :return: The database.
+    :rtype: RouteDatabase
+    """
+    existing_routes = None
+    if existing_file is not None:
+        existing_routes = read_route_database(existing_file)
+    builder = RouteDatabaseBuilder(get_ports(ports_file), graph_file)
+    route_database = builder.build(existing_routes, max_workers=max_workers)
+    if mapped:
+        write_mapped_route_database(route_database, route_database.port_names, output_file, route_database.scenarios)
+    else:
+        write_route_database(route_database, output_file)
+    logger.info(f"Route database with routes between {len(route_database)} pairs of ports written to"
+                f" '{output_file}'.")
+    return route_database
+
+
+def convert_route_database(routes_file, ports_file, output_file):
+    """
+    Convert a route database or pickled routes dict to a mapped route database
+    (see :py:class:`mable.extensions.mapped_routes.MappedRouteDatabase`).
+
+    :param routes_file: The path to the routes.
+    :type routes_file: str
+    :param ports_file: The path to the ports csv of the ports the routes are between
+        (see :py:func:`mable.extensions.world_ports.get_ports`).
+    :type ports_file: str
+    :param output_file: The path of the mapped route database to write.
+    :type output_file: str
+    """
+    route_database = read_route_database(routes_file)
+    port_names = [one_port.name for one_port in get_ports(ports_file)]
+    write_mapped_route_database(route_database, port_names, output_file, route_database.scenarios)
+    logger.info(f"Mapped route database with routes between {len(route_database)} pairs of ports written to"
+                f" '{output_file}'.")
@@ -0,0 +1,193 @@
+"""
+Nearest neighbour search for locations on the earth's surface.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+
+EARTH_RADIUS = 6371000  # earth radius in m, see LatLongShippingNetwork.get_long_lat_dist
+
+
+def to_unit_vectors(longitudes, latitudes):
+    """
+    :param longitudes: The longitudes of the points in decimal degrees.
+    :type longitudes: np.ndarray
+    :param latitudes: The latitudes of the points in decimal degrees.
+    :type latitudes: np.ndarray
+    :return: The points as vectors on the unit sphere, one row per point.
+    :rtype: np.ndarray
+    """
+    longitudes = np.radians(np.asarray(longitudes, dtype=float))
+    latitudes = np.radians(np.asarray(latitudes, dtype=float))
+    cos_latitudes = np.cos(latitudes)
+    return np.stack([cos_latitudes * np.cos(longitudes), cos_latitudes * np.sin(longitudes), np.sin(latitudes)],
+                    axis=-1)
+
+
+class UnitVectorKDTree:
+    """
+    A k-d tree over points on the earth's surface.
+
+    The points are indexed as 3D vectors on the unit sphere. The straight-line (chord) distance between two of these
+    vectors grows with the great-circle distance between the points, i.e. the nearest points by chord distance are
+    the nearest points on the sphere. Distances are returned as great-circle distances in m.
+    """
+
+    def __init__(self, longitudes, latitudes, leaf_size=16):
+        """
+        :param longitudes: The longitudes of the points in decimal degrees.
+        :type longitudes: List[float] | np.ndarray
+        :param latitudes: The latitudes of the points in decimal degrees.
+        :type latitudes: List[float] | np.ndarray
+        :param leaf_size: The maximal number of points in a leaf of the tree.
+        :type leaf_size: int
+        """
+        super().__init__()
+        points = to_unit_vectors(longitudes, latitudes).reshape(-1, 3)
+        self._leaf_size = max(leaf_size, 1)
+        self._split_dimensions = []
+        self._split_values = []
+        self._children = []
+        self._leaf_ranges = []
+        order = np.arange(len(points))
+        if len(points) > 0:
+            self._build(points, order)
+        self._order = order
+        self._points = points[order]
+
+    def __len__(self):
+        return len(self._points)
+
+    def _add_node(self):
+        self._split_dimensions.append(-1)
+        self._split_values.append(0.0)
+        self._children.append((-1, -1))
+        self._leaf_ranges.append((0, 0))
+        return len(self._children) - 1
+
+    def _build(self, points, order):
+        """
+        Build the tree by splitting the points at the median of the dimension with the largest spread. The points of
+        each node are a consecutive range of the order.
+        """
+        nodes_to_build = [(self._add_node(), 0, len(order))]
+        while nodes_to_build:
+            node, start, end = nodes_to_build.pop()
+            node_points = points[order[start:end]]
+            spread = node_points.max(axis=0) - node_points.min(axis=0)
+            if end - start <= self._leaf_size or not spread.any():
+                self._leaf_ranges[node] = (start, end)
+                continue
+            dimension = int(np.argmax(spread))
+            middle = (end - start) // 2
+            partition = np.argpartition(node_points[:, dimension], middle)
+            order[start:end] = order[start:end][partition]
+            self._split_dimensions[node] = dimension
+            self._split_values[node] = float(points[order[start + middle], dimension])
+            left = self._add_node()
+            right = self._add_node()
+            self._children[node] = (left, right)
+            nodes_to_build.append((left, start, start + middle))
+            nodes_to_build.append((right, start + middle, end))
+
+    @staticmethod
+    def _to_great_circle_distances(chord_distances):
+        return 2 * EARTH_RADIUS * np.arcsin(np.minimum(np.asarray(chord_distances) / 2, 1))
+
+    def _search(self, point, max_squared_distance, k=None):
+        """
+        Collect the points within a chord distance of a point.
+
+        :param point: The point as unit vector.
+        :type point: np.ndarray
+        :param max_squared_distance: The maximal squared chord distance.
+        :type max_squared_distance: float
+        :param k: If specified, only the k nearest points are kept.
+        :type k: int | None
+        :return: The squared chord distance and the position in the tree of each point.
+        :rtype: List[Tuple[float, int]]
+        """
+        found = []
+        if not self._children:
+            return found
+        point_coordinates = point.tolist()
+        split_dimensions = self._split_dimensions
+        split_values = self._split_values
+        nodes_to_visit = [(0, 0.0)]
+        while nodes_to_visit:
+            node, squared_plane_distance = nodes_to_visit.pop()
+            if k is not None and len(found) == k:
+                max_squared_distance = -found[0][0]
+            if squared_plane_distance > max_squared_distance:
+                continue
+            dimension = split_dimensions[node]
+            if dimension < 0:
+                start, end = self._leaf_ranges[node]
+                squared_distances = ((self._points[start:end] - point) ** 2).sum(axis=1)
+                for position in np.nonzero(squared_distances <= max_squared_distance)[0]:
+                    squared_distance = float(squared_distances[position])
+                    if k is None:
+                        found.append((squared_distance, start + int(position)))
+                    elif len(found) < k:
+                        heapq.heappush(found, (-squared_distance, start + int(position)))
+                    elif squared_distance < -found[0][0]:
+                        heapq.heapreplace(found, (-squared_distance, start + int(position)))
+                        max_squared_distance = -found[0][0]
+                continue
+            difference = point_coordinates[dimension] - split_values[node]
+            left, right = self._children[node]
+            near, far = (left, right) if difference < 0 else (right, left)
+            nodes_to_visit.append((far, difference ** 2))
+            nodes_to_visit.append((near, squared_plane_distance))
+        if k is not None:
+            found = [(-negative_squared_distance, position) for negative_squared_distance, position in found]
+        return found
+
+    def _get_result(self, found):
+        found.sort()
+        squared_distances = np.array([squared_distance for squared_distance, _ in found], dtype=float)
+        indices = self._order[np.array([position for _, position in found], dtype=int)]
+        return self._to_great_circle_distances(np.sqrt(squared_distances)), indices
+
+    def query(self, longitude, latitude, k=1):
+        """
+        Find the k nearest points.
+
+        :param longitude: The longitude of the point of interest in decimal degrees.
+        :type longitude: float
+        :param latitude: The latitude of the point of interest in decimal degrees.
+        :type latitude: float
+        :param k: The number of points.
+        :type k: int
+        :return: The great-circle distances in m and the indices of the nearest points, in ascending order of the
+            distance. Fewer than k points if the tree has fewer points.
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        point = to_unit_vectors(longitude, latitude)
+        found = self._search(point, math.inf, k=k) if k > 0 else []
+        return self._get_result(found)
+
+    def query_radius(self, longitude, latitude, radius):
+        """
+        Find all points within a great-circle distance.
+
+        :param longitude: The longitude of the point of interest in decimal degrees.
+        :type longitude: float
+        :param latitude: The latitude of the point of interest in decimal degrees.
+        :type latitude: float
+        :param radius: The great-circle distance in m.
+        :type radius: float
+        :return: The great-circle distances in m and the indices of the points within the radius, in ascending order of
+            the distance.
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        point = to_unit_vectors(longitude, latitude)
+        if radius >= math.pi * EARTH_RADIUS:
+            max_squared_distance = math.inf
+        else:
+            max_squared_distance = (2 * math.sin(radius / (2 * EARTH_RADIUS))) ** 2
+        found = self._search(point, max_squared_distance) if radius >= 0 else []
+        return self._get_result(found)
@@ -2,6 +2,7 @@
 Ports and routing based on a world graph and real world port location.
 """
 
+from collections.abc import Sequence
 import csv
 import itertools
 import math
@@ -17,6 +18,9 @@ from simplification.cutil import simplify_coords
 from mable.simulation_space.universe import Port, Location, OnJourney
 from mable.simulation_space.structure import NetworkWithPortDict
 from mable import simulation_generation
+from mable.extensions.mapped_routes import MappedRouteDatabase, is_mapped_route_database
+from mable.extensions.resources import ResourceManager
+from mable.extensions.spatial_index import UnitVectorKDTree
 from mable.transport_operation import SimpleVessel
 from mable.util import JsonAble
 
@@ -192,6 +196,24 @@ def get_ports(path):
         return ports
 
 
+def load_precomputed_routes(file_path):
+    """
+    Load precomputed routes from a mapped route database (see :py:class:`MappedRouteDatabase`) or a pickled routes
+    dict.
+
+    :param file_path: The path to the routes.
+    :type file_path: str
+    :return: The routes by the concatenated names of their start and end ports.
+    :rtype: MappedRouteDatabase | dict
+    """
+    if is_mapped_route_database(file_path):
+        routes = MappedRouteDatabase(file_path, Route)
+    else:
+        with open(file_path, "rb") as routes_file:
+            routes = pickle.load(routes_file)
+    return routes
+
+
 class LatLongShippingNetwork(NetworkWithPortDict):
     """
     A shipping network with latitude on longitude locations.
@@ -202,8 +224,8 @@ class LatLongShippingNetwork(NetworkWithPortDict):
         self._precomputed_routes_file = precomputed_routes_file
         self._precomputed_routes = None
         if self._precomputed_routes_file is not None:
-            with open(self._precomputed_routes_file, 'rb') as file:
-                self._precomputed_routes = pickle.load(file)
+            self._precomputed_routes = ResourceManager.get_precomputed_routes(
+                self._precomputed_routes_file, load_precomputed_routes)
         self._graph_file = graph_file
         # canals
         self.canals = {
@@ -214,8 +236,18 @@ class LatLongShippingNetwork(NetworkWithPortDict):
         }
         # lazy load the world graph, no need to do this unless a route is not in the DB (which shouldn't happen)
         self._world_graph = None
+        self._world_graph_nodes = None
+        self._world_graph_index = None
         self._canals_nodes = None
         self._scenarios = None
+        self._reversed_routes = {}
+        self._computed_routes = {}
+        self._port_ids = {port_name: port_id for port_id, port_name in enumerate(self._ports)}
+        if self._precomputed_routes_file is not None:
+            self._distance_matrix = ResourceManager.get_distance_matrix(
+                self._precomputed_routes_file, list(self._port_ids), self._compile_distance_matrix)
+        else:
+            self._distance_matrix = self._compile_distance_matrix()
 
     @property
     def world_graph(self):
@@ -223,6 +255,21 @@ class LatLongShippingNetwork(NetworkWithPortDict):
             self._world_graph = self.generate_route_graph_from_file()
         return self._world_graph
 
+    @property
+    def world_graph_index(self):
+        """
+        The spatial index of the world graph's nodes (see :py:class:`UnitVectorKDTree`). The indices of the index's
+        points are the positions of the nodes in the graph's node order.
+
+        :return: The index.
+        :rtype: UnitVectorKDTree
+        """
+        if self._world_graph_index is None:
+            self._world_graph_nodes = list(self.world_graph.nodes)
+            nodes = np.array(self._world_graph_nodes, dtype=float).reshape(-1, 2)
+            self._world_graph_index = UnitVectorKDTree(nodes[:, 0], nodes[:, 1])
+        return self._world_graph_index
+
     @property
     def canals_nodes(self):
         """
@@ -245,12 +292,57 @@ class LatLongShippingNetwork(NetworkWithPortDict):
             self._scenarios = self.create_world_canal_scenarios()
         return self._scenarios
 
+    def _compile_distance_matrix(self):
+        """
+        Collect the length of the shortest precomputed route between each pair of ports. The matrix is only compiled
+        once per process for the same routes file and ports (see :py:class:`ResourceManager`).
+
+        :return: The distances indexed by the ids of the ports (see :py:func:`_get_port_id`). NaN for pairs of ports
+            without precomputed routes.
+        :rtype: np.ndarray
+        """
+        port_names = list(self._port_ids)
+        if isinstance(self._precomputed_routes, MappedRouteDatabase):
+            distance_matrix = self._precomputed_routes.get_shortest_lengths(port_names)
+            np.fill_diagonal(distance_matrix, 0)
+            return distance_matrix
+        distance_matrix = np.full((len(port_names), len(port_names)), np.nan)
+        np.fill_diagonal(distance_matrix, 0)
+        if self._precomputed_routes is not None:
+            for port_id_one, port_name_one in enumerate(port_names):
+                for port_id_two, port_name_two in enumerate(port_names):
+                    if port_id_one != port_id_two:
+                        routes = self._precomputed_routes.get(f"{port_name_one}{port_name_two}")
+                        if routes is None:
+                            routes = self._precomputed_routes.get(f"{port_name_two}{port_name_one}")
+                        if routes:
+                            distance_matrix[port_id_one, port_id_two] = routes[0].length
+        return distance_matrix
+
+    def _get_port_id(self, location):
+        """
+        :param location: A location or the name of a port.
+        :type location: Location | str
+        :return: The index of the port in the distance matrix or None if the location is not one of the network's
+            ports.
+        :rtype: int | None
+        """
+        if isinstance(location, Location):
+            port = self._ports.get(location.name)
+            if port is not location and port != location:
+                return None
+            location = location.name
+        return self._port_ids.get(location)
+
     def get_distance(self, location_one, location_two):
         """
         Get the distance between two locations.
 
         If there is no route between the two locations infinity (math.inf) if returned.
 
+        The distances between ports with precomputed routes are looked up in a matrix that is compiled when the
+        network is created (see :py:func:`_compile_distance_matrix`).
+
         :param location_one: The first location.
         :type location_one: Port | str
         :param location_two: The second location.
@@ -260,6 +352,12 @@ class LatLongShippingNetwork(NetworkWithPortDict):
         """
         if isinstance(location_one, OnJourney) or isinstance(location_two, OnJourney):
             raise TypeError("OnJourney is not a valid fixed location. Two fixed locations required.")
+        port_id_one = self._get_port_id(location_one)
+        port_id_two = self._get_port_id(location_two)
+        if port_id_one is not None and port_id_two is not None:
+            distance = self._distance_matrix[port_id_one, port_id_two]
+            if not math.isnan(distance):
+                return float(distance)
         if not isinstance(location_one, Location):
             location_one = self.get_port(location_one)
         if not isinstance(location_two, Location):
@@ -273,7 +371,47 @@ class LatLongShippingNetwork(NetworkWithPortDict):
                 distance = route.length
         return distance
 
+    def get_distances(self, origins, destinations):
+        """
+        Get the distances between each of the origins and each of the destinations.
+
+        The distances between ports with precomputed routes are looked up in the distance matrix at once. All other
+        distances are determined via :py:func:`get_distance`.
+
+        :param origins: The first locations.
+        :type origins: List[Port | Location | str]
+        :param destinations: The second locations.
+        :type destinations: List[Port | Location | str]
+        :return: The distances with one row per origin and one column per destination.
+        :rtype: np.ndarray
+        """
+        origin_ids = np.array([self._get_port_id(one_origin) for one_origin in origins], dtype=float)
+        destination_ids = np.array([self._get_port_id(one_destination) for one_destination in destinations],
+                                   dtype=float)
+        is_origin_port = ~np.isnan(origin_ids)
+        is_destination_port = ~np.isnan(destination_ids)
+        distances = self._distance_matrix[np.ix_(np.where(is_origin_port, origin_ids, 0).astype(int),
+                                                 np.where(is_destination_port, destination_ids, 0).astype(int))]
+        distances[~is_origin_port, :] = np.nan
+        distances[:, ~is_destination_port] = np.nan
+        for origin_index, destination_index in zip(*np.nonzero(np.isnan(distances))):
+            distances[origin_index, destination_index] = self.get_distance(origins[origin_index],
+                                                                           destinations[destination_index])
+        return distances
+
     def _get_precomputed_routes(self, location_one, location_two):
+        """
+        Look up the precomputed routes from the first to the second location. If the routes are only stored in the
+        other direction, views of the stored routes in reverse direction are returned (see :py:class:`ReversedRoute`).
+        The stored routes are not changed and the views are created once per network.
+
+        :param location_one: The start location.
+        :type location_one: Location
+        :param location_two: The end location.
+        :type location_two: Location
+        :return: The routes or None if no routes are stored for the locations.
+        :rtype: List[Route] | None
+        """
         routes = None
         index_one = f"{location_one.name}{location_two.name}"
         index_two = f"{location_two.name}{location_one.name}"
@@ -282,10 +420,10 @@ class LatLongShippingNetwork(NetworkWithPortDict):
                 if index_one in self._precomputed_routes:
                     routes = self._precomputed_routes[index_one]
                 else:
-                    routes = self._precomputed_routes[index_two]
-                    for route in routes:
-                        route.route = list(reversed(route.route))
-                        route.canals = list(reversed(route.canals))
+                    routes = self._reversed_routes.get(index_two)
+                    if routes is None:
+                        routes = [route.reversed() for route in self._precomputed_routes[index_two]]
+                        self._reversed_routes[index_two] = routes
             else:
                 logger.warning(f"Routes entry for routes between '{location_one.name}'"
                                f" and '{location_two.name}' not found.")
@@ -332,14 +470,10 @@ class LatLongShippingNetwork(NetworkWithPortDict):
         elif time_travelled >= travel_time:
             location = journey.destination
         else:
-            route_origin_to_destination = list(reversed(route.route))
+            route_origin_to_destination = route.reversed()
             percentage_travel = time_travelled/travel_time
             distance_travelled = percentage_travel * route.length
-            segment_distances_dist = [
-                self.compute_route_length([route_origin_to_destination[i], route_origin_to_destination[i + 1]])
-                for i in range(len(route_origin_to_destination) - 1)]
-            route_distance: list[float] = [sum(segment_distances_dist[:i]) for i in range(len(segment_distances_dist))]
-            route_distance.append(route.length)
+            route_distance = route_origin_to_destination.cumulative_lengths
             idx_in_route = next(i for i in range(len(route_distance)) if route_distance[i] > distance_travelled) - 1
             # TODO the calculation of an intermediate point on a segment does not seem to work
             # distance_on_segment = distance_travelled - route_distance[idx_in_route]
@@ -350,7 +484,7 @@ class LatLongShippingNetwork(NetworkWithPortDict):
             #     route_segment[0][0] + percentage_on_segment * (route_segment[1][0] - route_segment[0][0]),
             #     ""
             # )
-            last_segment_start = route_origin_to_destination[idx_in_route]
+            last_segment_start = route_origin_to_destination.route[idx_in_route]
             location = LatLongLocation(
                 last_segment_start[1],
                 last_segment_start[0],
@@ -360,25 +494,46 @@ class LatLongShippingNetwork(NetworkWithPortDict):
 
     def generate_route_graph_from_file(self):
         """
-        Generates the router graph file depending on the type of file the router has been initialised with
+        Generates the router graph file depending on the type of file the router has been initialised with.
+        The file is only loaded once per process (see :py:class:`ResourceManager`) and each network works on its own
+        copy of the graph.
+
+        Returns
+        -------
+
+        graph: networkx graph
+            the graph generated from the file
+        """
+        return ResourceManager.get_route_graph(self._graph_file, self.load_route_graph).copy()
+
+    @staticmethod
+    def load_route_graph(graph_file):
+        """
+        Loads a router graph from a file depending on the type of file.
+
+        Parameters
+        ----------
+
+        graph_file: str
+            the path to the graph file (.txt or .pkl)
+
         Returns
         -------
 
         graph: networkx graph
             the graph generated from the file
         """
-        name, file_extension = os.path.splitext(self._graph_file)
+        name, file_extension = os.path.splitext(graph_file)
         graph = None
         if file_extension == ".txt":
             # create world routing graph from a precomputed file
-            matrix = np.loadtxt(self._graph_file)
+            matrix = np.loadtxt(graph_file)
             graph = networkx.Graph()
             for n1_long, n1_lat, n2_long, n2_lat, w in matrix:
                 graph.add_edge((n1_long, n1_lat), (n2_long, n2_lat), weight=w)
         elif file_extension == ".pkl":
-            with open(self._graph_file, "rb") as f:
-                loaded_graph = pickle.load(f)
-                graph = loaded_graph.copy()
+            with open(graph_file, "rb") as f:
+                graph = pickle.load(f)
 
         if graph is None:
             raise Exception("Graph format invalid, no graph could be generated")
@@ -402,18 +557,23 @@ class LatLongShippingNetwork(NetworkWithPortDict):
         min_node: GraphX Node
             the node closest to those coordinates in the router's world_graph
         """
-        #
-        if (long_, lat_) in list(self.world_graph.nodes):
+        if (long_, lat_) in self.world_graph:
             return long_, lat_
 
         min_dist = float('inf')
         min_node = -1
 
-        for node in list(self.world_graph.nodes):
-            gg = LatLongShippingNetwork.get_long_lat_dist(lat_, long_, node[1], node[0])
-            if gg <= min_dist:
-                min_dist = gg
-                min_node = node
+        # the nodes are found via the spatial index and nodes at (almost) the same distance are compared via the
+        # haversine distance, where the last one in the graph's node order wins
+        distances, _ = self.world_graph_index.query(long_, lat_)
+        if len(distances) > 0:
+            _, candidates = self.world_graph_index.query_radius(long_, lat_, distances[0] + 1)
+            for node_index in sorted(candidates):
+                node = self._world_graph_nodes[node_index]
+                gg = LatLongShippingNetwork.get_long_lat_dist(lat_, long_, node[1], node[0])
+                if gg <= min_dist:
+                    min_dist = gg
+                    min_node = node
 
         return min_node
 
@@ -743,9 +903,30 @@ class LatLongShippingNetwork(NetworkWithPortDict):
             shortest_routes = self.compute_all_routes_between_points(start_location, end_location,
                                                                      vessel_type=vessel_type)
             index = f"{start_location.name}{end_location.name}"
-            self._precomputed_routes[index] = shortest_routes
+            self._computed_routes[index] = shortest_routes
         return shortest_routes
 
+    def _get_computed_routes(self, location_one, location_two):
+        """
+        Look up the routes this network computed because they were not precomputed. The precomputed routes are
+        shared by all networks of the process (see :py:class:`ResourceManager`) and are not changed.
+
+        :param location_one: The start location.
+        :type location_one: Location
+        :param location_two: The end location.
+        :type location_two: Location
+        :return: The routes or None if the network did not compute routes between the locations.
+        :rtype: List[Route] | None
+        """
+        index_one = f"{location_one.name}{location_two.name}"
+        routes = self._computed_routes.get(index_one)
+        if routes is None:
+            index_two = f"{location_two.name}{location_one.name}"
+            if index_two in self._computed_routes:
+                routes = [route.reversed() for route in self._computed_routes[index_two]]
+                self._computed_routes[index_one] = routes
+        return routes
+
     def get_all_stored_routes_between_points(self, start_location, end_location):
         """
         Returns the shortest routes stored.
@@ -762,8 +943,8 @@ class LatLongShippingNetwork(NetworkWithPortDict):
         [Route] or None
             List of all found routes or None if no routes between locations has been stored before.
         """
-        shortest_routes = None
-        if self._precomputed_routes is not None:
+        shortest_routes = self._get_computed_routes(start_location, end_location)
+        if shortest_routes is None and self._precomputed_routes is not None:
             shortest_routes = self._get_precomputed_routes(start_location, end_location)
         return shortest_routes
 
@@ -796,6 +977,9 @@ class Route:
     Vessel route class.
     """
 
+    _cumulative_lengths = None
+    _reversed_route = None
+
     def __init__(self, name, route, length, canal_nodes=None):
         """
         Constructor.
@@ -855,6 +1039,110 @@ class Route:
     def as_tuple(self):
         return tuple([(pos[0], pos[1]) for pos in self.route])
 
+    @property
+    def cumulative_lengths(self):
+        """
+        The distance from the start of the route to each point of the route. The lengths of the segments between the
+        points are determined via :py:func:`LatLongShippingNetwork.compute_route_length`. The last entry is the
+        length of the route. The lengths are computed on the first access.
+
+        :return: The distances.
+        :rtype: List[float]
+        """
+        cumulative_lengths = self._cumulative_lengths
+        if cumulative_lengths is None:
+            points = self.route
+            cumulative_lengths = [0] * max(len(points), 1)
+            for i in range(1, len(points) - 1):
+                cumulative_lengths[i] = cumulative_lengths[i - 1] + LatLongShippingNetwork.compute_route_length(
+                    [points[i - 1], points[i]])
+            cumulative_lengths[-1] = self.length
+            self._cumulative_lengths = cumulative_lengths
+        return cumulative_lengths
+
+    def reversed(self):
+        """
+        :return: A view of the route in the opposite direction. The same view is returned on every call.
+        :rtype: ReversedRoute
+        """
+        reversed_route = self._reversed_route
+        if reversed_route is None:
+            reversed_route = ReversedRoute(self)
+            self._reversed_route = reversed_route
+        return reversed_route
+
+
+class _ReversedPoints(Sequence):
+    """
+    Read-only view of a list of points in reverse order.
+    """
+
+    __slots__ = ("_points",)
+
+    def __init__(self, points):
+        self._points = points
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self._points)))]
+        if item < 0:
+            item += len(self._points)
+        if not 0 <= item < len(self._points):
+            raise IndexError("Route point index out of range.")
+        return self._points[len(self._points) - 1 - item]
+
+    def __iter__(self):
+        return reversed(self._points)
+
+    def __reversed__(self):
+        return iter(self._points)
+
+    def __eq__(self, other):
+        return (isinstance(other, Sequence)
+                and len(self) == len(other)
+                and all(one_point == other_point for one_point, other_point in zip(self, other)))
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class ReversedRoute(Route):
+    """
+    View of a route in the opposite direction that does not copy or change the points of the route.
+    """
+
+    def __init__(self, route):
+        """
+        :param route: The route in the original direction.
+        :type route: Route
+        """
+        # Route.__init__ is not called since the points are a view of the original route.
+        self._route = route
+        self._points = _ReversedPoints(route.route)
+        self.name = route.name
+        self.length = route.length
+        self.canals = route.canals
+        if route.canals is not None:
+            self.canals = list(reversed(route.canals))
+
+    @property
+    def route(self):
+        """
+        :return: The points of the original route in reverse order.
+        :rtype: Sequence[Tuple[float, float]]
+        """
+        return self._points
+
+    def reversed(self):
+        """
+        :return: The route in the original direction.
+        :rtype: Route
+        """
+        return self._route
+
 
 class NoPathsException(Exception):
     pass
@@ -104,20 +104,31 @@ class MetricsCollector(JsonAble, SimulationEngineAware):
     def _get_next_company_id(self, company):
         """
         Assign the next id to the specified company. The association is remembered.
+        If the engine is set, the id is the company's id in the engine's
+        :py:class:`mable.ownership.OwnershipRegistry`.
         :param company:
             The company
         :return: int
             The id of the company.
         """
-        self._last_company_id += 1
-        self._company_ids[company] = self._last_company_id
-        self._last_vessel_ids[self._last_company_id] = -1
-        self._company_metrics[self._last_company_id] = {}
-        return self._last_company_id
+        if self._engine is not None:
+            try:
+                company_id = self._engine.ownership.get_company_id(company)
+            except KeyError:
+                company_id = self._engine.ownership.register_company(company)
+        else:
+            self._last_company_id += 1
+            company_id = self._last_company_id
+            self._last_vessel_ids[company_id] = -1
+        self._company_ids[company] = company_id
+        self._company_metrics[company_id] = {}
+        return company_id
 
     def _get_next_vessel_id(self, company, vessel):
         """
         Assign the next id to the specified vessel for the specified company. The association is remembered.
+        If the engine is set, the key consists of the company's and the vessel's ids in the engine's
+        :py:class:`mable.ownership.OwnershipRegistry`. Otherwise, vessels are numbered per company.
         :param company:
             The company
         :param vessel:
@@ -129,8 +140,15 @@ class MetricsCollector(JsonAble, SimulationEngineAware):
             company_id = self._company_ids[company]
         except KeyError:
             company_id = self._get_next_company_id(company)
-        self._last_vessel_ids[company_id] += 1
-        current_vessel_id = VesselKey(company_id, self._last_vessel_ids[company_id])
+        if self._engine is not None:
+            try:
+                vessel_number = self._engine.ownership.get_vessel_id(vessel)
+            except KeyError:
+                vessel_number = self._engine.ownership.register_vessel(vessel, company)
+        else:
+            self._last_vessel_ids[company_id] += 1
+            vessel_number = self._last_vessel_ids[company_id]
+        current_vessel_id = VesselKey(company_id, vessel_number)
         self._vessel_ids[vessel] = current_vessel_id
         self._vessel_metrics[current_vessel_id] = {}
         return current_vessel_id
@@ -162,7 +180,7 @@ class MetricsCollector(JsonAble, SimulationEngineAware):
         Get the key of the specified vessel. If create_id_if_not_exists exists (default) a new key is created
         if no id for the specified vessel is known. This extends to the company if the company is not yet known.
         If new keys are generated and the company is not specified, i.e. parameter is set to None, an attempt
-        is made to determine the company based on all shipping company's fleets.
+        is made to determine the company via :py:func:`mable.engine.SimulationEngine.find_company_for_vessel`.
         :param vessel:
             The vessel.
         :param company:
@@ -182,11 +200,9 @@ class MetricsCollector(JsonAble, SimulationEngineAware):
         except KeyError as key_error:
             if create_both_ids_if_not_exists:
                 if company is None:
-                    shipping_companies = self._engine.shipping_companies
-                    try:
-                        company = next((c for c in shipping_companies if vessel in c.fleet))
-                    except StopIteration:
+                    if self._engine is None:
                         raise ValueError("neither company specified nor company knows for vessel.")
+                    company = self._engine.find_company_for_vessel(vessel)
                 vessel_id = self._get_next_vessel_id(company, vessel)
                 self._company_names[self._company_ids.get(company)] = company.name
             else:
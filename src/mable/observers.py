@@ -1,6 +1,8 @@
 """
 Simulation observation related classes and functions.
 """
+import os
+
 from loguru import logger
 
 from mable.competition.generation import AuctionCargoEvent
@@ -13,6 +15,9 @@ from mable.metrics import GlobalMetricsCollector
 
 
 class EventFuelPrintObserver(EventObserver):
+    """
+    An observer that logs all events and the fuel consumption of vessel events.
+    """
 
     def __init__(self, logger):
         self._logger = logger
@@ -33,10 +38,12 @@ class TradeDeliveryObserver(EventObserver):
     An observer that logs completed trades.
     """
 
+    OBSERVED_EVENT_TYPES = (CargoTransferEvent,)
+
     def notify(self, engine, event, data):
-        if isinstance(event, CargoTransferEvent) and event.is_drop_off:
+        if event.is_drop_off:
             company_for_vessel = engine.find_company_for_vessel(event.vessel)
-            logger.debug(f"Notified delivery observer about {type(company_for_vessel).__name__}'s event: {event}")
+            logger.debug("Notified delivery observer about {}'s event: {}", type(company_for_vessel).__name__, event)
             engine.market_authority.trade_fulfilled(event.trade, company_for_vessel)
 
 
@@ -45,9 +52,10 @@ class AuctionOutcomeObserver(EventObserver):
     An observer that logs allocated trades.
     """
 
+    OBSERVED_EVENT_TYPES = (AuctionCargoEvent,)
+
     def notify(self, engine, event, data):
-        if isinstance(event, AuctionCargoEvent):
-            engine.market_authority.add_allocation_results(event.allocation_result)
+        engine.market_authority.add_allocation_results(event.allocation_result)
 
 
 class AuctionOutcomePrintObserver(EventObserver):
@@ -56,32 +64,35 @@ class AuctionOutcomePrintObserver(EventObserver):
     :py:func:`mable.competition.generation.AuctionCargoEvent`.
     """
 
+    OBSERVED_EVENT_TYPES = (AuctionCargoEvent,)
+
     def __init__(self, logger):
         self._logger = logger
 
     def notify(self, engine, event, data):
-        if isinstance(event, AuctionCargoEvent):
-            trade_allocation_result = {}
-            for one_company in event.allocation_result.ledger.keys():
-                for one_contract in event.allocation_result.ledger[one_company]:
-                    trade_allocation_result[one_contract.trade] = (one_company.name, one_contract.payment)
-            unallocated_trades = {trade: None for trade in event.allocation_result.unallocated_trades}
-            trade_allocation_result.update(unallocated_trades)
-            for one_trade in trade_allocation_result:
-                trade_string = (f"'{one_trade.origin_port.name}"
-                                f" -> {one_trade.destination_port.name}"
-                                f" ({round(one_trade.amount, 2)})'")
-                if trade_allocation_result[one_trade] is not None:
-                    self._logger.info(f"TRADE ALLOCATION {trade_string}:"
-                                      f" To {trade_allocation_result[one_trade][0]}"
-                                      f" for {trade_allocation_result[one_trade][1]}.")
-                else:
-                    self._logger.info(f"TRADE ALLOCATION {trade_string}:"
-                                      f" Not allocated.")
+        trade_allocation_result = {}
+        for one_company in event.allocation_result.ledger.keys():
+            for one_contract in event.allocation_result.ledger[one_company]:
+                trade_allocation_result[one_contract.trade] = (one_company.name, one_contract.payment)
+        unallocated_trades = {trade: None for trade in event.allocation_result.unallocated_trades}
+        trade_allocation_result.update(unallocated_trades)
+        for one_trade in trade_allocation_result:
+            trade_string = (f"'{one_trade.origin_port.name}"
+                            f" -> {one_trade.destination_port.name}"
+                            f" ({round(one_trade.amount, 2)})'")
+            if trade_allocation_result[one_trade] is not None:
+                self._logger.info(f"TRADE ALLOCATION {trade_string}:"
+                                  f" To {trade_allocation_result[one_trade][0]}"
+                                  f" for {trade_allocation_result[one_trade][1]}.")
+            else:
+                self._logger.info(f"TRADE ALLOCATION {trade_string}:"
+                                  f" Not allocated.")
 
 
 class MetricsObserver(EventObserver):
 
+    OBSERVED_EVENT_TYPES = (VesselEvent,)
+
     def __init__(self):
         super().__init__()
         self._metrics = GlobalMetricsCollector()
@@ -90,6 +101,12 @@ class MetricsObserver(EventObserver):
     def metrics(self):
         return self._metrics
 
+    def get_snapshot_state(self):
+        return self._metrics
+
+    def restore_snapshot_state(self, state):
+        self._metrics = state
+
     @staticmethod
     def _get_event_vessel_status(event):
         if isinstance(event, IdleEvent):
@@ -144,6 +161,8 @@ class MetricsObserver(EventObserver):
 
 class AuctionMetricsObserver(MetricsObserver):
 
+    OBSERVED_EVENT_TYPES = (VesselEvent, AuctionCargoEvent)
+
     def notify(self, engine, event, data):
         super().notify(engine, event, data)
         if isinstance(event, AuctionCargoEvent):
@@ -151,6 +170,52 @@ class AuctionMetricsObserver(MetricsObserver):
             self._metrics.add_global_company_list_metric("auction_outcomes", auction_results)
 
 
+class CheckpointObserver(EventObserver):
+    """
+    An observer that takes snapshots of the simulation (see :py:class:`mable.snapshot.EngineSnapshot`) in regular
+    intervals of simulation time. Since observers are notified in the order of registration, the observer should be
+    registered last to ensure that all other observers have processed an event before the snapshot is taken.
+    """
+
+    def __init__(self, interval, directory=None):
+        """
+        :param interval: The simulation time between two snapshots.
+        :type interval: float
+        :param directory: A directory to which each snapshot is written as 'checkpoint_<time>.mable'.
+            If None, the snapshots are only kept in memory.
+        :type directory: str | pathlib.Path | None
+        """
+        super().__init__()
+        self._interval = interval
+        self._directory = directory
+        self._next_checkpoint_time = interval
+        self._last_snapshot = None
+
+    @property
+    def last_snapshot(self):
+        """
+        :return: The last snapshot taken or None if no snapshot has been taken yet.
+        :rtype: mable.snapshot.EngineSnapshot | None
+        """
+        return self._last_snapshot
+
+    def notify(self, engine, event, data):
+        if event.time >= self._next_checkpoint_time and engine.event_queue.qsize() > 0:
+            self._last_snapshot = engine.snapshot()
+            while self._next_checkpoint_time <= event.time:
+                self._next_checkpoint_time += self._interval
+            if self._directory is not None:
+                snapshot_path = os.path.join(self._directory, f"checkpoint_{round(event.time, 3)}.mable")
+                self._last_snapshot.save(snapshot_path)
+                logger.info("Saved checkpoint {}.", snapshot_path)
+
+    def get_snapshot_state(self):
+        return self._next_checkpoint_time
+
+    def restore_snapshot_state(self, state):
+        self._next_checkpoint_time = state
+
+
 class LogRunner(EnginePrePostRunner):
 
     def __init__(self, run_logger, message):
@@ -0,0 +1,156 @@
+"""
+Ownership of vessels by shipping companies.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mable.transport_operation import ShippingCompany, Vessel
+
+
+class OwnershipRegistry:
+    """
+    Index of the company each vessel belongs to.
+
+    Companies and vessels receive integer ids in the order they are registered. Ids are never reused, also not when
+    a vessel leaves a fleet. Lookups are by object identity and do not compare vessels or companies.
+    """
+
+    def __init__(self, shipping_companies=None):
+        """
+        :param shipping_companies: The companies to register.
+        :type shipping_companies: List[ShippingCompany] | None
+        """
+        super().__init__()
+        self._companies = []
+        self._company_ids = {}
+        self._vessels = []
+        self._vessel_ids = {}
+        self._vessel_company_ids = {}
+        for one_company in shipping_companies or []:
+            self.register_company(one_company)
+
+    def register_company(self, company):
+        """
+        Register a company and the vessels of its current fleet. If the company is already registered, the vessels
+        are updated to the company's current fleet, i.e. new vessels are registered and vessels that left the fleet
+        are unregistered.
+
+        :param company: The company.
+        :type company: ShippingCompany
+        :return: The id of the company.
+        :rtype: int
+        """
+        company_id = self._company_ids.get(id(company))
+        if company_id is None:
+            company_id = len(self._companies)
+            self._companies.append(company)
+            self._company_ids[id(company)] = company_id
+        fleet_keys = {id(one_vessel) for one_vessel in company.fleet}
+        vessels_left = [vessel_id for vessel_key, vessel_id in self._vessel_ids.items()
+                        if self._vessel_company_ids[vessel_id] == company_id and vessel_key not in fleet_keys]
+        for one_vessel_id in vessels_left:
+            self.unregister_vessel(self._vessels[one_vessel_id])
+        for one_vessel in company.fleet:
+            self.register_vessel(one_vessel, company)
+        return company_id
+
+    def register_vessel(self, vessel, company):
+        """
+        Register a vessel as belonging to a registered company. A vessel that belongs to another company is moved to
+        the specified company and keeps its id.
+
+        :param vessel: The vessel.
+        :type vessel: Vessel
+        :param company: The company.
+        :type company: ShippingCompany
+        :return: The id of the vessel.
+        :rtype: int
+        :raises KeyError: If the company is not registered.
+        """
+        company_id = self._company_ids[id(company)]
+        vessel_id = self._vessel_ids.get(id(vessel))
+        if vessel_id is None:
+            vessel_id = len(self._vessels)
+            self._vessels.append(vessel)
+            self._vessel_ids[id(vessel)] = vessel_id
+        self._vessel_company_ids[vessel_id] = company_id
+        return vessel_id
+
+    def unregister_vessel(self, vessel):
+        """
+        Remove a vessel from the registry. Does nothing if the vessel is not registered.
+
+        :param vessel: The vessel.
+        :type vessel: Vessel
+        """
+        vessel_id = self._vessel_ids.pop(id(vessel), None)
+        if vessel_id is not None:
+            del self._vessel_company_ids[vessel_id]
+            self._vessels[vessel_id] = None
+
+    def __contains__(self, vessel):
+        return id(vessel) in self._vessel_ids
+
+    def get_company_id(self, company):
+        """
+        :param company: The company.
+        :type company: ShippingCompany
+        :return: The id of the company.
+        :rtype: int
+        :raises KeyError: If the company is not registered.
+        """
+        return self._company_ids[id(company)]
+
+    def get_vessel_id(self, vessel):
+        """
+        :param vessel: The vessel.
+        :type vessel: Vessel
+        :return: The id of the vessel.
+        :rtype: int
+        :raises KeyError: If the vessel is not registered.
+        """
+        return self._vessel_ids[id(vessel)]
+
+    def get_company_id_for_vessel(self, vessel):
+        """
+        :param vessel: The vessel.
+        :type vessel: Vessel
+        :return: The id of the company the vessel belongs to.
+        :rtype: int
+        :raises KeyError: If the vessel is not registered.
+        """
+        return self._vessel_company_ids[self._vessel_ids[id(vessel)]]
+
+    def get_company(self, company_id):
+        """
+        :param company_id: The id of a company.
+        :type company_id: int
+        :return: The company.
+        :rtype: ShippingCompany
+        """
+        return self._companies[company_id]
+
+    def get_vessel(self, vessel_id):
+        """
+        :param vessel_id: The id of a vessel.
+        :type vessel_id: int
+        :return: The vessel or None if the vessel was unregistered.
+        :rtype: Vessel | None
+        """
+        return self._vessels[vessel_id]
+
+    def find_company_for_vessel(self, vessel):
+        """
+        :param vessel: The vessel.
+        :type vessel: Vessel
+        :return: The company the vessel belongs to or None if the vessel is not registered.
+        :rtype: ShippingCompany | None
+        """
+        vessel_id = self._vessel_ids.get(id(vessel))
+        company = None
+        if vessel_id is not None:
+            company = self._companies[self._vessel_company_ids[vessel_id]]
+        return company
@@ -0,0 +1,165 @@
+"""
+Instrumentation of simulation runs.
+"""
+
+import json
+import sys
+import time
+
+from mable.util import JsonAble
+
+
+class PhaseStatistics:
+    """
+    The accumulated measurements of one phase.
+    """
+
+    __slots__ = ("calls", "total_time", "self_time", "allocated_blocks")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0
+        self.self_time = 0
+        self.allocated_blocks = 0
+
+
+class _Phase:
+    """
+    Context manager to measure one phase with a profiler.
+    """
+
+    __slots__ = ("_profiler", "_name")
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._profiler.start(self._name)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler.stop()
+        return False
+
+
+class EngineProfiler(JsonAble):
+    """
+    Records wall time, number of calls and allocation deltas of the phases of a simulation run.
+
+    Phases can be nested and each phase is identified by its stack, i.e. the names of all enclosing phases and its
+    own name. The time of a phase is split into the total time and the self time, i.e. the time not spent in
+    nested phases. Allocations are measured as the change of the number of memory blocks allocated by the
+    interpreter (see :py:func:`sys.getallocatedblocks`) between the start and the end of a phase.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._stack = []
+        self._open_phases = []
+        self._phases = {}
+
+    def phase(self, name):
+        """
+        A context manager that measures the enclosed code as a phase.
+
+        :param name: The name of the phase.
+        :type name: str
+        :return: The context manager.
+        """
+        return _Phase(self, name)
+
+    def start(self, name):
+        """
+        Start a phase nested in the currently running phase. Every start has to be matched by a call to
+        :py:func:`stop`.
+
+        :param name: The name of the phase.
+        :type name: str
+        """
+        self._stack.append(name)
+        self._open_phases.append([time.perf_counter(), sys.getallocatedblocks(), 0])
+
+    def stop(self):
+        """
+        Stop the currently running phase.
+        """
+        end_time = time.perf_counter()
+        end_blocks = sys.getallocatedblocks()
+        start_time, start_blocks, child_time = self._open_phases.pop()
+        phase_key = tuple(self._stack)
+        self._stack.pop()
+        duration = end_time - start_time
+        statistics = self._phases.get(phase_key)
+        if statistics is None:
+            statistics = PhaseStatistics()
+            self._phases[phase_key] = statistics
+        statistics.calls += 1
+        statistics.total_time += duration
+        statistics.self_time += duration - child_time
+        statistics.allocated_blocks += end_blocks - start_blocks
+        if self._open_phases:
+            self._open_phases[-1][2] += duration
+
+    @property
+    def phases(self):
+        """
+        :return: The statistics of all finished phases by the phase's stack.
+        :rtype: dict[tuple[str, ...], PhaseStatistics]
+        """
+        return self._phases
+
+    def to_json(self):
+        """
+        The statistics of all phases in descending order of total time. Times are in seconds.
+
+        :return: A json encodable dict.
+        :rtype: dict
+        """
+        phases = sorted(self._phases.items(), key=lambda item: item[1].total_time, reverse=True)
+        phases_json = [
+            {
+                "stack": list(one_stack),
+                "calls": one_statistics.calls,
+                "total_time": one_statistics.total_time,
+                "self_time": one_statistics.self_time,
+                "allocated_blocks": one_statistics.allocated_blocks
+            }
+            for one_stack, one_statistics in phases]
+        return {"phases": phases_json}
+
+    def to_collapsed_stacks(self):
+        """
+        The self times of all phases in the collapsed stack format used by flame graph tools, i.e. one line per
+        phase with the semicolon separated stack followed by the self time in microseconds.
+
+        :return: The lines.
+        :rtype: list[str]
+        """
+        lines = []
+        for one_stack, one_statistics in self._phases.items():
+            self_time_microseconds = round(one_statistics.self_time * 1e6)
+            if self_time_microseconds > 0:
+                lines.append(f"{';'.join(one_stack)} {self_time_microseconds}")
+        return lines
+
+    def export_json(self, file_path):
+        """
+        Write the statistics of all phases to a json file.
+
+        :param file_path: The path of the file.
+        :type file_path: str | pathlib.Path
+        """
+        with open(file_path, "w") as profile_file:
+            json.dump(self.to_json(), profile_file, indent=4)
+
+    def export_collapsed_stacks(self, file_path):
+        """
+        Write the self times of all phases to a collapsed stack file, e.g. as input for flamegraph.pl.
+
+        :param file_path: The path of the file.
+        :type file_path: str | pathlib.Path
+        """
+        with open(file_path, "w") as profile_file:
+            profile_file.write("\n".join(self.to_collapsed_stacks()))
+            profile_file.write("\n")
@@ -97,6 +97,18 @@ class World(SimulationEngineAware):
         self._current_time = next_event.time
         return next_event
 
+    def pop_next_event(self):
+        """
+        Removes and return the next event of the queue without waiting for an event to become available. Also sets
+        the current time to the time of the event occurrence.
+
+        :return: The event or None if there are no events left.
+        """
+        next_event = self._event_queue.pop()
+        if next_event is not None:
+            self._current_time = next_event.time
+        return next_event
+
     @property
     def current_time(self):
         """
@@ -12,7 +12,7 @@ from mable.simulation_space.structure import UnitShippingNetwork
 from mable.transport_operation import SimpleCompany, SimpleVessel, CargoCapacity
 from mable.shipping_market import StaticShipping, SimpleMarket, Trade
 from mable.event_management import ArrivalEvent, CargoTransferEvent, IdleEvent, TravelEvent, EventQueue, \
-    VesselLocationInformationEvent, CargoEvent
+    IndexedEventQueue, VesselLocationInformationEvent, CargoEvent
 
 
 class SimulationBuilder:
@@ -268,6 +268,12 @@ class ClassFactory:
         return <Unit>(*args, **kwargs)
     """
 
+    INDEXED_EVENT_QUEUE = False
+    """
+    If True, :py:func:`generate_event_queue` generates a :py:class:`mable.event_management.IndexedEventQueue`, which
+    removes and purges events without scanning the queue, e.g. for simulations with large fleets.
+    """
+
     @staticmethod
     def generate_engine(*args, **kwargs):
         """
@@ -403,18 +409,31 @@ class ClassFactory:
         return SimpleCompany(*args, **kwargs)
 
     # noinspection PyArgumentList
-    @staticmethod
-    def generate_event_queue(*args, **kwargs):
+    @classmethod
+    def generate_event_queue(cls, *args, indexed=None, **kwargs):
         """
-        Generates an event queue. Default: py:class:`maritime_simulator.engine.SimulationEngine`.
+        Generates an event queue. Default: py:class:`mable.event_management.EventQueue` without locking since the
+        simulation engine only uses the queue from one thread.
+
+        Generates a :py:class:`mable.event_management.IndexedEventQueue` if indexed is True or, if indexed is not
+        specified, :py:const:`INDEXED_EVENT_QUEUE` is True.
         :param args:
             Positional args.
+        :param indexed: If True, an indexed event queue is generated. Defaults to :py:const:`INDEXED_EVENT_QUEUE`.
+        :type indexed: bool | None
         :param kwargs:
             Keyword args.
         :return:
             The event queue.
         """
-        return EventQueue(*args, **kwargs)
+        if indexed is None:
+            indexed = cls.INDEXED_EVENT_QUEUE
+        kwargs.setdefault("thread_safe", False)
+        if indexed:
+            event_queue = IndexedEventQueue(*args, **kwargs)
+        else:
+            event_queue = EventQueue(*args, **kwargs)
+        return event_queue
 
     @staticmethod
     def generate_random(*args, **kwargs):
@@ -37,6 +37,20 @@ class ShippingNetwork(SimulationEngineAware):
         """
         pass
 
+    def get_distances(self, origins, destinations):
+        """
+        Returns the distances between each of the origins and each of the destinations.
+        :param origins: List[Location | str]
+            The first locations.
+        :param destinations: List[Location | str]
+            The second locations.
+        :return: np.ndarray
+            The distances with one row per origin and one column per destination.
+        """
+        distances = np.array([[self.get_distance(one_origin, one_destination) for one_destination in destinations]
+                              for one_origin in origins], dtype=float)
+        return distances.reshape(len(origins), len(destinations))
+
     @abstractmethod
     def get_port(self, name):
         """
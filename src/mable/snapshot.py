@@ -0,0 +1,269 @@
+"""
+Snapshots of the dynamic state of a simulation to checkpoint and restore runs.
+"""
+
+from __future__ import annotations
+
+import io
+import pickle
+import struct
+import zlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mable.engine import SimulationEngine
+
+
+SNAPSHOT_MAGIC = b"MABLESNP"
+"""The first bytes of every serialised snapshot."""
+
+SNAPSHOT_VERSION = 1
+"""The version of the snapshot format. Snapshots of other versions cannot be restored."""
+
+_HEADER = struct.Struct(f">{len(SNAPSHOT_MAGIC)}sHd")
+
+
+def _get_static_objects(engine):
+    """
+    All objects of a simulation that are created by the generation of the simulation and are not replaced during a
+    run. In a snapshot they are only referenced by a key and resolved against the engine the snapshot is restored to.
+
+    :param engine: The simulation engine.
+    :type engine: SimulationEngine
+    :return: The objects by key.
+    :rtype: dict[tuple, Any]
+    """
+    static_objects = {
+        ("engine",): engine,
+        ("world",): engine.world,
+        ("event_queue",): engine.event_queue,
+        ("network",): engine.world.network,
+        ("shipping",): engine.shipping,
+        ("market",): engine.market,
+        ("class_factory",): engine.class_factory,
+        ("headquarters",): engine.headquarters,
+        ("market_authority",): engine.market_authority
+    }
+    for company_index, one_company in enumerate(engine.shipping_companies):
+        static_objects[("company", company_index)] = one_company
+        for vessel_index, one_vessel in enumerate(one_company.fleet):
+            static_objects[("vessel", company_index, vessel_index)] = one_vessel
+    for port_index, one_port in enumerate(engine.world.network.ports):
+        static_objects[("port", port_index)] = one_port
+    for trade_index, one_trade in enumerate(_get_all_trades(engine)):
+        static_objects[("trade", trade_index)] = one_trade
+    return static_objects
+
+
+def _get_all_trades(engine):
+    """
+    :param engine: The simulation engine.
+    :type engine: SimulationEngine
+    :return: All trades known to the engine's shipping in a stable order.
+    :rtype: list[Trade]
+    """
+    # noinspection PyProtectedMember
+    all_trades_by_time = engine.shipping._all_trades
+    return [one_trade for one_time in all_trades_by_time for one_trade in all_trades_by_time[one_time]]
+
+
+def _get_structure(engine):
+    """
+    A description of the static structure of a simulation to check that a snapshot fits an engine.
+
+    :param engine: The simulation engine.
+    :type engine: SimulationEngine
+    :return: The structure.
+    :rtype: dict
+    """
+    return {
+        "companies": [(one_company.name, [one_vessel.name for one_vessel in one_company.fleet])
+                      for one_company in engine.shipping_companies],
+        "number_ports": len(engine.world.network.ports),
+        "number_trades": len(_get_all_trades(engine)),
+        "event_queue": type(engine.event_queue).__name__
+    }
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickler that replaces the static objects of a simulation by their keys.
+    """
+
+    def __init__(self, file, engine):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._keys_by_object_id = {id(one_object): one_key
+                                   for one_key, one_object in _get_static_objects(engine).items()}
+
+    def persistent_id(self, obj):
+        return self._keys_by_object_id.get(id(obj))
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """
+    Unpickler that resolves the keys of static objects against a simulation.
+    """
+
+    def __init__(self, file, engine):
+        super().__init__(file)
+        self._static_objects = _get_static_objects(engine)
+
+    def persistent_load(self, pid):
+        try:
+            return self._static_objects[pid]
+        except KeyError:
+            raise pickle.UnpicklingError(f"Snapshot references unknown simulation object {pid}.")
+
+
+class EngineSnapshot:
+    """
+    The dynamic state of a simulation at an event boundary.
+
+    The snapshot includes the current time, the random state, the pending events, the vessels' locations,
+    schedules, cargo holds and journey logs, the contracts of the market authority, the occurred trades and the
+    trades' statuses, the schedules that are yet to be applied and the state of the event observers
+    (see :py:func:`mable.event_management.EventObserver.get_snapshot_state`).
+    Everything that is created when the simulation is generated, e.g. the network, the ports, the companies,
+    the vessels and the trades, is only referenced. Hence, a snapshot can only be restored to an engine that was
+    generated from the same specifications. The private state of the companies is not part of the snapshot.
+
+    The serialised format is a header of the magic bytes :py:const:`SNAPSHOT_MAGIC`, the format version and the
+    simulation time followed by the zlib compressed state.
+    """
+
+    def __init__(self, time, data):
+        """
+        :param time: The simulation time of the snapshot.
+        :type time: float
+        :param data: The compressed state.
+        :type data: bytes
+        """
+        super().__init__()
+        self._time = time
+        self._data = data
+
+    @property
+    def time(self):
+        """
+        :return: The simulation time at which the snapshot was taken.
+        :rtype: float
+        """
+        return self._time
+
+    @classmethod
+    def take(cls, engine):
+        """
+        Take a snapshot of a simulation. Should only be called between the processing of two events.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        :return: The snapshot.
+        :rtype: EngineSnapshot
+        """
+        # noinspection PyProtectedMember
+        state = {
+            "structure": _get_structure(engine),
+            "current_time": engine.world.current_time,
+            "random_state": engine.world.random.get_state(),
+            "event_queue": engine.event_queue.get_snapshot_state(),
+            "vessels": [
+                [(one_vessel.location,
+                  one_vessel._schedule,
+                  one_vessel._cargo_hold,
+                  one_vessel._journey_log)
+                 for one_vessel in one_company.fleet]
+                for one_company in engine.shipping_companies],
+            "trade_statuses": [one_trade.status for one_trade in _get_all_trades(engine)],
+            "occurred_trades": engine.shipping._occurred_trades,
+            "contracts": engine.market_authority._contracts_per_company,
+            "new_schedules": engine._new_schedules,
+            "observers": [one_observer.get_snapshot_state() for one_observer in engine.get_event_observers()]
+        }
+        state_buffer = io.BytesIO()
+        _SnapshotPickler(state_buffer, engine).dump(state)
+        return cls(engine.world.current_time, zlib.compress(state_buffer.getvalue()))
+
+    def restore(self, engine):
+        """
+        Restore the state of the snapshot to a simulation. The engine has to be generated from the same
+        specifications as the engine the snapshot was taken from and has to have the same observers.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        :raises ValueError: If the snapshot does not fit the simulation.
+        """
+        state = _SnapshotUnpickler(io.BytesIO(zlib.decompress(self._data)), engine).load()
+        if state["structure"] != _get_structure(engine):
+            raise ValueError("Snapshot was taken from a simulation with a different structure.")
+        observers = engine.get_event_observers()
+        if len(state["observers"]) != len(observers):
+            raise ValueError(f"Snapshot has the state of {len(state['observers'])} observers"
+                             f" but the engine has {len(observers)} observers.")
+        # noinspection PyProtectedMember
+        engine.world._current_time = state["current_time"]
+        engine.world.random.set_state(state["random_state"])
+        engine.event_queue.restore_snapshot_state(state["event_queue"])
+        for one_company, company_vessels_states in zip(engine.shipping_companies, state["vessels"]):
+            for one_vessel, (location, schedule, cargo_hold, journey_log) in zip(
+                    one_company.fleet, company_vessels_states):
+                one_vessel._location = location
+                one_vessel._schedule = schedule
+                one_vessel._cargo_hold = cargo_hold
+                one_vessel._journey_log = journey_log
+        for one_trade, one_status in zip(_get_all_trades(engine), state["trade_statuses"]):
+            one_trade.status = one_status
+        engine.shipping._occurred_trades = state["occurred_trades"]
+        engine.market_authority._contracts_per_company = state["contracts"]
+        engine._new_schedules = state["new_schedules"]
+        for one_observer, one_observer_state in zip(observers, state["observers"]):
+            one_observer.restore_snapshot_state(one_observer_state)
+        engine.headquarters._sanitised_shipping_companies = None
+
+    def to_bytes(self):
+        """
+        :return: The serialised snapshot.
+        :rtype: bytes
+        """
+        return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self._time) + self._data
+
+    @classmethod
+    def from_bytes(cls, snapshot_bytes):
+        """
+        :param snapshot_bytes: A serialised snapshot.
+        :type snapshot_bytes: bytes
+        :return: The snapshot.
+        :rtype: EngineSnapshot
+        :raises ValueError: If the bytes are not a snapshot or a snapshot of a different format version.
+        """
+        if len(snapshot_bytes) < _HEADER.size:
+            raise ValueError("Not a simulation snapshot.")
+        magic, version, time = _HEADER.unpack_from(snapshot_bytes)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a simulation snapshot.")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Snapshot format version {version} is not supported"
+                             f" (supported version: {SNAPSHOT_VERSION}).")
+        return cls(time, snapshot_bytes[_HEADER.size:])
+
+    def save(self, file_path):
+        """
+        Write the snapshot to a file.
+
+        :param file_path: The path of the file.
+        :type file_path: str | pathlib.Path
+        """
+        with open(file_path, "wb") as snapshot_file:
+            snapshot_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Read a snapshot from a file.
+
+        :param file_path: The path of the file.
+        :type file_path: str | pathlib.Path
+        :return: The snapshot.
+        :rtype: EngineSnapshot
+        """
+        with open(file_path, "rb") as snapshot_file:
+            return cls.from_bytes(snapshot_file.read())
@@ -5,6 +5,12 @@ Classes for shipping companies.
 from abc import abstractmethod
 import copy
 from dataclasses import dataclass
+import heapq
+import io
+import multiprocessing
+import os
+import pickle
+import time
 from typing import Hashable, List, Dict, TYPE_CHECKING, TypeVar, Generic
 
 import attrs
@@ -642,6 +648,8 @@ class ShippingCompany(SimulationEngineAware, Generic[V]):
         super().set_engine(engine)
         for one_vessel in self._fleet:
             one_vessel.set_engine(engine)
+        if engine is not None:
+            engine.ownership.register_company(self)
 
     @property
     def fleet(self):
@@ -651,6 +659,30 @@ class ShippingCompany(SimulationEngineAware, Generic[V]):
         """
         return self._fleet
 
+    def add_vessel(self, vessel):
+        """
+        Add a vessel to the fleet.
+
+        :param vessel: The vessel.
+        :type vessel: V
+        """
+        self._fleet.append(vessel)
+        if self._engine is not None:
+            vessel.set_engine(self._engine)
+            self._engine.ownership.register_vessel(vessel, self)
+
+    def remove_vessel(self, vessel):
+        """
+        Remove a vessel from the fleet.
+
+        :param vessel: The vessel.
+        :type vessel: V
+        :raises ValueError: If the vessel is not part of the fleet.
+        """
+        self._fleet.remove(vessel)
+        if self._engine is not None:
+            self._engine.ownership.unregister_vessel(vessel)
+
     @property
     def name(self):
         return self._name
@@ -701,9 +733,388 @@ class ScheduleProposal:
     costs: Dict[Trade, float]
 
 
+class _ProposalStatePickler(pickle.Pickler):
+    """
+    Pickler that replaces the objects that exist in the proposal worker processes by their keys
+    (see :py:func:`_get_proposal_static_objects`).
+    """
+
+    def __init__(self, file, static_objects):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._keys_by_object_id = {id(one_object): one_key for one_key, one_object in static_objects.items()}
+
+    def persistent_id(self, obj):
+        return self._keys_by_object_id.get(id(obj))
+
+
+class _ProposalStateUnpickler(pickle.Unpickler):
+    """
+    Unpickler that resolves the keys of :py:class:`_ProposalStatePickler` against the objects of a worker process.
+    """
+
+    def __init__(self, file, static_objects):
+        super().__init__(file)
+        self._static_objects = static_objects
+
+    def persistent_load(self, pid):
+        return self._static_objects[pid]
+
+
+def _get_proposal_static_objects(company):
+    """
+    The objects that the proposal worker processes inherit when they are forked and that are therefore only sent by
+    key: the engine, the world, the class factory, the network's ports, the company and the company's vessels.
+
+    :param company: The company.
+    :type company: SimpleCompany
+    :return: The objects by key.
+    :rtype: dict[tuple, Any]
+    """
+    # noinspection PyProtectedMember
+    engine = company._engine
+    static_objects = {("engine",): engine, ("company",): company}
+    if engine is not None:
+        static_objects[("world",)] = engine.world
+        static_objects[("class_factory",)] = engine.class_factory
+        for port_index, one_port in enumerate(getattr(engine.world.network, "ports", [])):
+            static_objects[("port", port_index)] = one_port
+    for vessel_index, one_vessel in enumerate(company.fleet):
+        static_objects[("vessel", vessel_index)] = one_vessel
+    return static_objects
+
+
+def _rate_best_insertion(schedule, trade, objective):
+    """
+    :return: The value of the best insertion of the trade into the schedule and the insertion's pick-up and drop-off
+        location or None if the trade cannot be inserted.
+    :rtype: Tuple[float, int, int] | None
+    """
+    rating = None
+    insertion = schedule.best_insertion(trade, objective)
+    if insertion is not None:
+        if objective is None:
+            value = insertion.completion_time
+        else:
+            value = objective(insertion)
+        rating = (value, insertion.location_pick_up, insertion.location_drop_off)
+    return rating
+
+
+class _WorkerProposal:
+    """
+    The part of a proposal a worker process rates: the schedules of the worker's vessels and the trades.
+
+    The trades are rated in their order for all vessels, i.e. the first trade for all vessels before the second
+    trade. Adding a trade to a vessel's schedule restarts the vessel's ratings with the following trade.
+    """
+
+    def __init__(self, call_id, company, state):
+        """
+        :param call_id: The id of the proposal.
+        :type call_id: int
+        :param company: The worker's copy of the company.
+        :type company: SimpleCompany
+        :param state: The current time, the location, cargo hold and schedule per vessel index, the trades and the
+            objective.
+        :type state: tuple
+        """
+        current_time, vessel_states, trades, objective = state
+        # noinspection PyProtectedMember
+        company._engine.world._current_time = current_time
+        self.call_id = call_id
+        self._trades = trades
+        self._objective = objective
+        self._schedules = {}
+        self._versions = {}
+        self._next_ratings = []
+        for vessel_index, (location, cargo_hold, schedule) in vessel_states.items():
+            one_vessel = company.fleet[vessel_index]
+            one_vessel._location = location
+            one_vessel._cargo_hold = cargo_hold
+            self._schedules[vessel_index] = schedule
+            self._versions[vessel_index] = 0
+            self._next_ratings.append((0, vessel_index, 0))
+        heapq.heapify(self._next_ratings)
+
+    def get_next_trade_index(self):
+        """
+        :return: The index of the trade that is rated next or None if all ratings are done.
+        :rtype: int | None
+        """
+        next_ratings = self._next_ratings
+        while next_ratings and next_ratings[0][2] != self._versions[next_ratings[0][1]]:
+            heapq.heappop(next_ratings)
+        next_trade_index = None
+        if next_ratings and next_ratings[0][0] < len(self._trades):
+            next_trade_index = next_ratings[0][0]
+        return next_trade_index
+
+    def rate_next(self):
+        """
+        Rate the next trade for the vessel that is furthest behind. Requires a next trade
+        (see :py:func:`get_next_trade_index`).
+
+        :return: The vessel index, the vessel's version, the trade index and the rating
+            (see :py:func:`_rate_best_insertion`).
+        :rtype: Tuple[int, int, int, Tuple[float, int, int] | None]
+        """
+        trade_index, vessel_index, version = heapq.heappop(self._next_ratings)
+        heapq.heappush(self._next_ratings, (trade_index + 1, vessel_index, version))
+        rating = _rate_best_insertion(self._schedules[vessel_index], self._trades[trade_index], self._objective)
+        return vessel_index, version, trade_index, rating
+
+    def insert(self, vessel_index, trade_index, location_pick_up, location_drop_off):
+        """
+        Add a trade to a vessel's schedule.
+        """
+        self._schedules[vessel_index].add_transportation(
+            self._trades[trade_index], location_pick_up, location_drop_off)
+        self._versions[vessel_index] += 1
+        heapq.heappush(self._next_ratings, (trade_index + 1, vessel_index, self._versions[vessel_index]))
+
+
+def _run_proposal_worker(connection, company, vessel_indices):
+    """
+    The loop of a worker process of :py:class:`_ProposalWorkerPool`.
+
+    The worker receives the messages ("propose", call id, pickled state), ("insert", call id, vessel index,
+    trade index, pick-up location, drop-off location), ("cancel", call id) and ("stop",). Between two ratings it
+    handles all received messages. The ratings of one trade are sent together as ("ratings", call id, ratings).
+
+    :param connection: The connection to the company's process.
+    :type connection: multiprocessing.connection.Connection
+    :param company: The worker's copy of the company.
+    :type company: SimpleCompany
+    :param vessel_indices: The indices of the vessels the worker rates.
+    :type vessel_indices: List[int]
+    """
+    static_objects = _get_proposal_static_objects(company)
+    proposal = None
+    ratings = []
+    is_running = True
+    while is_running:
+        next_trade_index = None
+        if proposal is not None:
+            next_trade_index = proposal.get_next_trade_index()
+        if ratings and (next_trade_index is None or next_trade_index > ratings[-1][2] or connection.poll()):
+            connection.send(("ratings", proposal.call_id, ratings))
+            ratings = []
+        if next_trade_index is None or connection.poll():
+            message = connection.recv()
+            try:
+                if message[0] == "stop":
+                    is_running = False
+                elif message[0] == "propose":
+                    state = _ProposalStateUnpickler(io.BytesIO(message[2]), static_objects).load()
+                    proposal = _WorkerProposal(message[1], company, state)
+                    for one_vessel_index in vessel_indices:
+                        if one_vessel_index not in state[1]:
+                            raise ValueError(f"No state for vessel {one_vessel_index}.")
+                elif message[0] == "cancel":
+                    proposal = None
+                    connection.send(("cancelled", message[1]))
+                elif proposal is not None and message[1] == proposal.call_id:
+                    proposal.insert(*message[2:])
+            except Exception as e:
+                connection.send(("error", message[1], f"{type(e).__name__}: {e}"))
+                proposal = None
+        else:
+            try:
+                ratings.append(proposal.rate_next())
+            except Exception as e:
+                connection.send(("error", proposal.call_id, f"{type(e).__name__}: {e}"))
+                proposal = None
+                ratings = []
+
+
+class _ProposalWorkerPool:
+    """
+    Worker processes that rate the insertions of trades for :py:func:`SimpleCompany.propose_schedules_parallel`.
+
+    The workers are forked once and each worker rates a fixed batch of the company's vessels. For a proposal, a
+    worker receives the current state of its vessels and all trades once and rates the trades for its vessels in the
+    order of the trades ahead of the company. When a trade is added to a vessel, only the insertion is sent to the
+    vessel's worker.
+    """
+
+    def __init__(self, company, number_workers):
+        """
+        :param company: The company.
+        :type company: SimpleCompany
+        :param number_workers: The number of worker processes.
+        :type number_workers: int
+        """
+        context = multiprocessing.get_context("fork")
+        self._company = company
+        self._fleet = list(company.fleet)
+        self._worker_indices = [j % number_workers for j in range(len(self._fleet))]
+        self._connections = []
+        self._processes = []
+        for worker_index in range(number_workers):
+            vessel_indices = [j for j in range(len(self._fleet)) if self._worker_indices[j] == worker_index]
+            company_connection, worker_connection = context.Pipe()
+            process = context.Process(
+                target=_run_proposal_worker, args=(worker_connection, company, vessel_indices), daemon=True)
+            process.start()
+            worker_connection.close()
+            self._connections.append(company_connection)
+            self._processes.append(process)
+        self._call_id = 0
+        self._is_cancelled = True
+        self._versions = []
+        self._ratings = []
+
+    @property
+    def number_workers(self):
+        return len(self._processes)
+
+    def fits(self, fleet):
+        """
+        :param fleet: A fleet.
+        :type fleet: List[Vessel]
+        :return: True if the workers were forked with the same vessels.
+        :rtype: bool
+        """
+        return len(fleet) == len(self._fleet) and all(a is b for a, b in zip(fleet, self._fleet))
+
+    def start_proposal(self, trades, objective):
+        """
+        Send the current state of the vessels and the trades to the workers.
+
+        :param trades: The trades.
+        :type trades: List[Trade]
+        :param objective: The objective. Has to be picklable.
+        :type objective: Callable[[ScheduleInsertion], float] | None
+        :raises pickle.PicklingError: If the state cannot be pickled, e.g. because the objective is a lambda.
+        """
+        static_objects = _get_proposal_static_objects(self._company)
+        # noinspection PyProtectedMember
+        current_time = self._company._engine.world.current_time
+        states = []
+        for worker_index in range(self.number_workers):
+            vessel_states = {j: (one_vessel._location, one_vessel._cargo_hold, one_vessel._schedule)
+                             for j, one_vessel in enumerate(self._fleet)
+                             if self._worker_indices[j] == worker_index}
+            state_buffer = io.BytesIO()
+            try:
+                _ProposalStatePickler(state_buffer, static_objects).dump(
+                    (current_time, vessel_states, trades, objective))
+            except (AttributeError, TypeError) as e:
+                raise pickle.PicklingError(str(e)) from e
+            states.append(state_buffer.getvalue())
+        self._await_cancellations()
+        self._call_id += 1
+        self._is_cancelled = False
+        self._versions = [0] * len(self._fleet)
+        self._ratings = [{} for _ in self._fleet]
+        for one_connection, one_state in zip(self._connections, states):
+            one_connection.send(("propose", self._call_id, one_state))
+
+    def get_rating(self, vessel_index, trade_index, deadline):
+        """
+        Wait for the rating of a trade for a vessel.
+
+        :param vessel_index: The index of the vessel.
+        :type vessel_index: int
+        :param trade_index: The index of the trade.
+        :type trade_index: int
+        :param deadline: The time (see :py:func:`time.monotonic`) until which to wait.
+        :type deadline: float
+        :return: True and the rating (see :py:func:`_rate_best_insertion`) or False and None if the deadline passed.
+        :rtype: Tuple[bool, Tuple[float, int, int] | None]
+        :raises RuntimeError: If a worker failed.
+        """
+        vessel_ratings = self._ratings[vessel_index]
+        connection = self._connections[self._worker_indices[vessel_index]]
+        while trade_index not in vessel_ratings:
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0 or not connection.poll(remaining_time):
+                return False, None
+            message = self._receive(connection)
+            if message[0] == "error" and message[1] == self._call_id:
+                raise RuntimeError(f"A proposal worker failed: {message[2]}")
+            if message[0] == "ratings" and message[1] == self._call_id:
+                for one_vessel_index, version, one_trade_index, rating in message[2]:
+                    if version == self._versions[one_vessel_index]:
+                        self._ratings[one_vessel_index][one_trade_index] = rating
+        return True, vessel_ratings.pop(trade_index)
+
+    def insert(self, vessel_index, trade_index, location_pick_up, location_drop_off):
+        """
+        Inform the vessel's worker that a trade was added to the vessel's schedule.
+        """
+        self._versions[vessel_index] += 1
+        self._ratings[vessel_index].clear()
+        self._connections[self._worker_indices[vessel_index]].send(
+            ("insert", self._call_id, vessel_index, trade_index, location_pick_up, location_drop_off))
+
+    def cancel(self):
+        """
+        Stop the workers from rating the trades of the current proposal. The workers stop after the rating they are
+        working on.
+        """
+        if not self._is_cancelled:
+            self._is_cancelled = True
+            for one_connection in self._connections:
+                try:
+                    one_connection.send(("cancel", self._call_id))
+                except OSError:
+                    pass
+
+    def _await_cancellations(self):
+        """
+        Wait until all workers finished the cancelled proposal and discard their remaining messages.
+        """
+        if self._call_id > 0:
+            for one_connection in self._connections:
+                message = self._receive(one_connection)
+                while message[0] != "cancelled" or message[1] != self._call_id:
+                    message = self._receive(one_connection)
+
+    @staticmethod
+    def _receive(connection):
+        try:
+            return connection.recv()
+        except EOFError:
+            raise RuntimeError("A proposal worker process ended unexpectedly.")
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        for one_connection in self._connections:
+            try:
+                one_connection.send(("stop",))
+            except OSError:
+                pass
+        for one_process in self._processes:
+            one_process.join(timeout=1)
+            if one_process.is_alive():
+                one_process.terminate()
+                one_process.join()
+        for one_connection in self._connections:
+            one_connection.close()
+        self._processes = []
+        self._connections = []
+
+
 class SimpleCompany(ShippingCompany[V]):
     """
     A simple company.
+
+    Companies that set PARALLEL_PROPOSAL_WORKERS propose schedules via :py:func:`propose_schedules_parallel`.
+    """
+
+    PARALLEL_PROPOSAL_WORKERS = 0
+    """
+    The maximal number of worker processes for :py:func:`propose_schedules`. With 0, schedules are proposed by
+    trying the vessels one after another. Otherwise, :py:func:`propose_schedules_parallel` is used and the workers are
+    started before the simulation runs (see :py:func:`mable.engine.pre_run_start_proposal_workers`).
+    """
+
+    PARALLEL_PROPOSAL_TIME_SHARE = 0.8
+    """
+    The share of the engine's agent timeout after which :py:func:`propose_schedules_parallel` stops.
     """
 
     def __init__(self, fleet, name):
@@ -716,6 +1127,7 @@ class SimpleCompany(ShippingCompany[V]):
         super().__init__(fleet, name)
         self._assignments = {}
         self._current_scheduling_proposal = None
+        self._proposal_workers = None
 
     def pre_inform(self, trades, time):
         """
@@ -777,11 +1189,15 @@ class SimpleCompany(ShippingCompany[V]):
         Trades are attempted to schedule by simply finding the first vessel that can transport the cargo after
         finishing the current schedule.
 
+        If PARALLEL_PROPOSAL_WORKERS is set, the schedules are proposed by :py:func:`propose_schedules_parallel`.
+
         :param trades: The trades.
         :type trades: List[Trade]
         :return: The schedule proposals.
         :rtype: ScheduleProposal
         """
+        if self.PARALLEL_PROPOSAL_WORKERS:
+            return self.propose_schedules_parallel(trades)
         schedules = {}
         scheduled_trades = []
         i = 0
@@ -802,6 +1218,132 @@ class SimpleCompany(ShippingCompany[V]):
             i += 1
         return ScheduleProposal(schedules, scheduled_trades, {})
 
+    def _get_number_proposal_workers(self, max_workers):
+        number_processors = os.cpu_count() or 1
+        if max_workers is None:
+            max_workers = number_processors
+        number_workers = min(max_workers, number_processors, len(self._fleet))
+        if number_workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            logger.debug("Proposing schedules in one process since worker processes cannot be forked.")
+            number_workers = 1
+        return number_workers
+
+    def start_proposal_workers(self, max_workers=None):
+        """
+        Start the worker processes of :py:func:`propose_schedules_parallel`. Already running workers are stopped.
+
+        The workers are forked from this process. Since forking a process while other threads run can leave locks
+        in the workers that are never released, the workers have to be started from the main thread before the
+        companies operate in threads, e.g. via the pre run command
+        :py:func:`mable.engine.pre_run_start_proposal_workers`. If processes cannot be forked or only one worker would
+        be used, no workers are started.
+
+        :param max_workers: The maximal number of worker processes. Defaults to PARALLEL_PROPOSAL_WORKERS or, if that
+            is 0, to the number of processors. Never more workers than processors or vessels are used.
+        :type max_workers: int | None
+        """
+        self.stop_proposal_workers()
+        if max_workers is None and self.PARALLEL_PROPOSAL_WORKERS:
+            max_workers = self.PARALLEL_PROPOSAL_WORKERS
+        number_workers = self._get_number_proposal_workers(max_workers)
+        if number_workers > 1:
+            self._proposal_workers = _ProposalWorkerPool(self, number_workers)
+
+    def stop_proposal_workers(self):
+        """
+        Stop the worker processes of :py:func:`propose_schedules_parallel` if any are running.
+        """
+        if self._proposal_workers is not None:
+            self._proposal_workers.close()
+            self._proposal_workers = None
+
+    def propose_schedules_parallel(self, trades, objective=None, time_limit=None):
+        """
+        Generate new schedules based on the vessels' current schedules and the specified trades by evaluating the
+        vessels in parallel.
+
+        The trades are scheduled one after another. For each trade, the best insertion into every vessel's schedule
+        (see :py:func:`Schedule.best_insertion`) is determined and the trade is added to the vessel with the best
+        insertion. The insertions are rated by the worker processes started via :py:func:`start_proposal_workers`.
+        Every worker rates all trades for a batch of the vessels and only has to re-rate the following trades of a
+        vessel that receives a trade. Without workers, or if the fleet changed since the workers were started or
+        the objective cannot be pickled, the vessels are evaluated in this process with the same result.
+
+        Trades that are not scheduled before the time limit passes are not scheduled and the workers stop rating.
+
+        :param trades: The trades.
+        :type trades: List[Trade]
+        :param objective: The value to minimise per insertion. Defaults to the completion time of the schedule.
+            Has to be the same for all vessels and a picklable, e.g. module level, function to be used by the workers.
+        :type objective: Callable[[ScheduleInsertion], float] | None
+        :param time_limit: The time in seconds after which no further trades are scheduled. Defaults to the share
+            PARALLEL_PROPOSAL_TIME_SHARE of the engine's agent timeout.
+        :type time_limit: float | None
+        :return: The schedule proposals.
+        :rtype: ScheduleProposal
+        """
+        if time_limit is None:
+            time_limit = self.PARALLEL_PROPOSAL_TIME_SHARE * self._engine.global_agent_timeout
+        deadline = time.monotonic() + time_limit
+        schedules = {}
+        scheduled_trades = []
+        number_insertions = [0] * len(self._fleet)
+        workers = self._proposal_workers
+        if workers is not None and not workers.fits(self._fleet):
+            logger.warning(f"Company {self.name} proposes schedules in one process since its fleet changed after"
+                           f" the proposal workers were started.")
+            workers = None
+        if workers is not None:
+            try:
+                workers.start_proposal(trades, objective)
+            except pickle.PicklingError as e:
+                logger.warning(f"Company {self.name} proposes schedules in one process since the trades or the"
+                               f" objective cannot be sent to the proposal workers: {e}")
+                workers = None
+        try:
+            i = 0
+            is_in_time = True
+            while i < len(trades) and is_in_time:
+                ratings = []
+                j = 0
+                while j < len(self._fleet) and is_in_time:
+                    if workers is None:
+                        current_vessel = self._fleet[j]
+                        if current_vessel not in schedules:
+                            schedules[current_vessel] = current_vessel.schedule
+                        ratings.append(_rate_best_insertion(schedules[current_vessel], trades[i], objective))
+                        is_in_time = time.monotonic() < deadline
+                    else:
+                        is_in_time, rating = workers.get_rating(j, i, deadline)
+                        ratings.append(rating)
+                    j += 1
+                if is_in_time:
+                    best_rating = min(((one_rating, j) for j, one_rating in enumerate(ratings) if one_rating is not None),
+                                      default=None)
+                    if best_rating is not None:
+                        (_, location_pick_up, location_drop_off), j = best_rating
+                        current_vessel = self._fleet[j]
+                        if current_vessel in schedules:
+                            new_schedule = schedules[current_vessel].copy()
+                        else:
+                            new_schedule = current_vessel.schedule
+                        new_schedule.add_transportation(trades[i], location_pick_up, location_drop_off)
+                        schedules[current_vessel] = new_schedule
+                        number_insertions[j] += 1
+                        scheduled_trades.append(trades[i])
+                        if workers is not None:
+                            workers.insert(j, i, location_pick_up, location_drop_off)
+                else:
+                    logger.warning(f"Company {self.name} stopped proposing schedules after {time_limit} seconds"
+                                   f" with {len(trades) - i} of {len(trades)} trades left.")
+                i += 1
+        finally:
+            if workers is not None:
+                workers.cancel()
+        schedules = {one_vessel: schedules[one_vessel]
+                     for j, one_vessel in enumerate(self._fleet) if number_insertions[j] > 0}
+        return ScheduleProposal(schedules, scheduled_trades, {})
+
     def get_arrival_time(self, port, schedule, vessel):
         """
         Calculates the arrival time of the vessel at the port. If the specified schedule has events it is assumed
@@ -6,11 +6,9 @@ from __future__ import annotations
 
 from enum import IntEnum
 import math
-from itertools import product
 from typing import TYPE_CHECKING, List, Tuple
 
 import attrs
-import networkx as nx
 import numpy as np
 
 from mable.shipping_market import TimeWindowTrade
@@ -29,6 +27,31 @@ class TransportationSourceDestinationIndicator(IntEnum):
     DROP_OFF = 1
 
 
+def check_cargo_loads(initial_loads, capacities, load_changes):
+    """
+    Check sequences of cargo load changes, e.g. of several candidate schedules, against the capacities of a cargo hold.
+
+    :param initial_loads: The load of each cargo type before the first change.
+    :type initial_loads: np.ndarray
+    :param capacities: The capacity of each cargo type.
+    :type capacities: np.ndarray
+    :param load_changes: The change of the load of each cargo type by each task of each candidate
+        (shape: number of candidates x number of tasks x number of cargo types). Loading is positive and unloading is
+        negative.
+    :type load_changes: np.ndarray
+    :return: For each candidate if the loads stay between zero and the capacity after every task and the hold is
+        empty after the last task.
+    :rtype: np.ndarray
+    """
+    load_changes = np.asarray(load_changes, dtype=float)
+    number_candidates, _, number_cargo_types = load_changes.shape
+    initial_loads = np.broadcast_to(np.asarray(initial_loads, dtype=float), (number_candidates, 1, number_cargo_types))
+    loads = np.cumsum(np.concatenate((initial_loads, load_changes), axis=1), axis=1)
+    is_within_capacity = np.all((loads >= 0) & (loads <= capacities), axis=(1, 2))
+    is_empty = np.all(loads[:, -1, :] <= 0, axis=1)
+    return is_within_capacity & is_empty
+
+
 class TransportationStartFinishIndicator(IntEnum):
     START = 0
     FINISH = 1
@@ -51,9 +74,290 @@ class CurrentState:
     is_valid: bool = True
 
 
+@attrs.define(kw_only=True, frozen=True)
+class ScheduleInsertion:
+    """
+    A feasible insertion of a trade into a schedule (see :py:func:`Schedule.feasible_insertions`). The locations are
+    the ones to pass to :py:func:`Schedule.add_transportation`.
+    """
+    trade: Trade
+    location_pick_up: int
+    location_drop_off: int
+    pick_up_time: float
+    drop_off_time: float
+    completion_time: float
+
+
+class ScheduleTimeBounds:
+    """
+    The time bounds of the chain of task nodes of a schedule.
+
+    The STN of a schedule is a chain: every node, i.e. the start or finish of a task, has a lower and an upper bound
+    on its time and consecutive nodes have a minimal separation (the cargo transfer time or the travel time). The
+    earliest time of each node follows from a forward pass and the latest time from a backward pass over the chain.
+    The STN is consistent, i.e. has no negative cycle, if no earliest time exceeds the node's upper bound.
+
+    Changes only invalidate the earliest times after and the latest times before the changed node. These are
+    recomputed on the next request.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lower = []
+        self._upper = []
+        self._separations = []
+        self._earliest = []
+        self._latest = []
+        self._number_valid_earliest = 0
+        self._first_valid_latest = 0
+
+    def copy(self):
+        """
+        :return: A copy of the bounds.
+        :rtype: ScheduleTimeBounds
+        """
+        bounds_copy = ScheduleTimeBounds()
+        bounds_copy._lower = self._lower.copy()
+        bounds_copy._upper = self._upper.copy()
+        bounds_copy._separations = self._separations.copy()
+        bounds_copy._earliest = self._earliest.copy()
+        bounds_copy._latest = self._latest.copy()
+        bounds_copy._number_valid_earliest = self._number_valid_earliest
+        bounds_copy._first_valid_latest = self._first_valid_latest
+        return bounds_copy
+
+    def __len__(self):
+        return len(self._lower)
+
+    @property
+    def lower(self):
+        """
+        :return: The lower bound of each node.
+        :rtype: List[float]
+        """
+        return self._lower
+
+    @property
+    def upper(self):
+        """
+        :return: The upper bound of each node.
+        :rtype: List[float]
+        """
+        return self._upper
+
+    @property
+    def separations(self):
+        """
+        :return: The minimal separation between each node and the next node.
+        :rtype: List[float]
+        """
+        return self._separations
+
+    def _invalidate(self, first_invalid_earliest, last_invalid_latest):
+        self._number_valid_earliest = min(self._number_valid_earliest, first_invalid_earliest)
+        self._first_valid_latest = max(self._first_valid_latest, last_invalid_latest + 1)
+
+    def insert(self, index, lower, upper):
+        """
+        Insert a node. The separations to the previous and the next node are zero until they are set.
+
+        :param index: The position of the node in the chain.
+        :type index: int
+        :param lower: The lower bound of the node's time.
+        :type lower: float
+        :param upper: The upper bound of the node's time.
+        :type upper: float
+        """
+        self._lower.insert(index, lower)
+        self._upper.insert(index, upper)
+        if len(self._lower) > 1:
+            self._separations.insert(min(index, len(self._separations)), 0)
+        self._earliest.insert(index, lower)
+        self._latest.insert(index, upper)
+        if self._first_valid_latest > index:
+            self._first_valid_latest += 1
+        self._invalidate(index, index)
+
+    def extend(self, lower, upper, separations):
+        """
+        Append nodes to the end of the chain.
+
+        :param lower: The lower bound of each new node's time.
+        :type lower: List[float]
+        :param upper: The upper bound of each new node's time.
+        :type upper: List[float]
+        :param separations: The minimal separation between each new node and its previous node. The separation of the
+            first new node is ignored if the chain is empty.
+        :type separations: List[float]
+        """
+        number_nodes = len(self._lower)
+        if number_nodes == 0:
+            separations = separations[1:]
+        self._lower.extend(lower)
+        self._upper.extend(upper)
+        self._separations.extend(separations)
+        self._earliest.extend(lower)
+        self._latest.extend(upper)
+        self._invalidate(number_nodes, len(self._lower) - 1)
+
+    def remove(self, index):
+        """
+        Remove a node. The previous and the next node keep the separation of the previous node.
+
+        :param index: The position of the node in the chain.
+        :type index: int
+        """
+        del self._lower[index]
+        del self._upper[index]
+        if self._separations:
+            del self._separations[min(index, len(self._separations) - 1)]
+        del self._earliest[index]
+        del self._latest[index]
+        if self._first_valid_latest > index:
+            self._first_valid_latest -= 1
+        self._invalidate(index, index - 1)
+
+    def set_lower(self, index, lower):
+        """
+        :param index: The position of the node in the chain.
+        :type index: int
+        :param lower: The lower bound of the node's time.
+        :type lower: float
+        """
+        self._lower[index] = lower
+        self._invalidate(index, -1)
+
+    def set_upper(self, index, upper):
+        """
+        :param index: The position of the node in the chain.
+        :type index: int
+        :param upper: The upper bound of the node's time.
+        :type upper: float
+        """
+        self._upper[index] = upper
+        self._invalidate(len(self._lower), index)
+
+    def set_separation(self, index, separation):
+        """
+        :param index: The position of the node in the chain that is separated from the next node.
+        :type index: int
+        :param separation: The minimal time between the node and the next node.
+        :type separation: float
+        """
+        self._separations[index] = separation
+        self._invalidate(index + 1, index)
+
+    def earliest(self):
+        """
+        :return: The earliest time of each node.
+        :rtype: List[float]
+        """
+        earliest = self._earliest
+        for i in range(self._number_valid_earliest, len(self._lower)):
+            if i == 0:
+                earliest[i] = self._lower[i]
+            else:
+                earliest[i] = max(self._lower[i], earliest[i - 1] + self._separations[i - 1])
+        self._number_valid_earliest = len(self._lower)
+        return earliest
+
+    def latest(self):
+        """
+        :return: The latest time of each node.
+        :rtype: List[float]
+        """
+        latest = self._latest
+        for i in range(min(self._first_valid_latest, len(self._upper)) - 1, -1, -1):
+            if i == len(self._upper) - 1:
+                latest[i] = self._upper[i]
+            else:
+                latest[i] = min(self._upper[i], latest[i + 1] - self._separations[i])
+        self._first_valid_latest = 0
+        return latest
+
+    def is_consistent(self):
+        """
+        :return: True if every node's earliest time is within its upper bound.
+        :rtype: bool
+        """
+        return all(e <= u for e, u in zip(self.earliest(), self._upper))
+
+
+class ScheduleCore:
+    """
+    The tasks of a schedule in parallel arrays.
+
+    Each task is the pick-up or drop-off of a trade and has a start and a finish node. The nodes of all tasks form a
+    chain whose time bounds are kept in a :py:class:`ScheduleTimeBounds`. Once the first task has started, its start
+    node is removed from the chain, i.e. the first task is partial.
+
+    A core can be shared by several schedules (see :py:func:`Schedule.copy`). The number of schedules that share
+    the core is kept in number_schedules. A schedule that changes a shared core has to copy the core first. A schedule
+    releases its core when it switches to a copy of the core or is garbage collected.
+    """
+
+    __slots__ = ("trades", "location_types", "is_first_task_partial", "time_bounds", "number_schedules")
+
+    def __init__(self):
+        super().__init__()
+        self.trades = []
+        self.location_types = []
+        self.is_first_task_partial = False
+        self.time_bounds = ScheduleTimeBounds()
+        self.number_schedules = 1
+
+    def copy(self):
+        """
+        :return: A copy of the core that is not shared by any schedule yet.
+        :rtype: ScheduleCore
+        """
+        core_copy = ScheduleCore()
+        core_copy.trades = self.trades.copy()
+        core_copy.location_types = self.location_types.copy()
+        core_copy.is_first_task_partial = self.is_first_task_partial
+        core_copy.time_bounds = self.time_bounds.copy()
+        return core_copy
+
+    def get_chain_index(self, task_index, start_or_finish):
+        """
+        :param task_index: The index of the task in the order of all tasks (zero based).
+        :type task_index: int
+        :param start_or_finish: The start or the finish node of the task.
+        :type start_or_finish: TransportationStartFinishIndicator
+        :return: The position of the node in the chain.
+        :rtype: int
+        """
+        return 2 * task_index + start_or_finish - self.is_first_task_partial
+
+    def get_task_index(self, chain_index):
+        """
+        :param chain_index: The position of a node in the chain.
+        :type chain_index: int
+        :return: The index of the node's task (zero based) and if the node is the start or the finish of the task.
+        :rtype: Tuple[int, TransportationStartFinishIndicator]
+        """
+        task_index, start_or_finish = divmod(chain_index + self.is_first_task_partial, 2)
+        return task_index, TransportationStartFinishIndicator(start_or_finish)
+
+    def get_task_location(self, task_index):
+        """
+        :param task_index: The index of the task in the order of all tasks (zero based).
+        :type task_index: int
+        :return: The trade's origin port for a pick-up and the trade's destination port for a drop-off.
+        :rtype: Port
+        """
+        if self.location_types[task_index] == TransportationSourceDestinationIndicator.PICK_UP:
+            location = self.trades[task_index].origin_port
+        else:
+            location = self.trades[task_index].destination_port
+        return location
+
+
 class Schedule(SimulationEngineAware):
     """
     The schedule of a vessel.
+
+    The tasks and their time bounds are kept in a :py:class:`ScheduleCore`.
     """
 
     def __init__(self, vessel, current_time=0, creation_time=0, schedule=None):
@@ -62,19 +366,18 @@ class Schedule(SimulationEngineAware):
 
         :param vessel: The vessel for which the schedule is.
         :type vessel: Vessel
-        :param schedule: Used for creating schedule copies (see :py:func:`schedule_copy`).
+        :param schedule: Used for creating schedule copies (see :py:func:`copy`).
         Should be None for all purposes.
+        :type schedule: ScheduleCore | None
         """
         super().__init__()
         if schedule is None:
-            self._stn = nx.DiGraph()
-            self._stn.add_node(0)
-        else:
-            self._stn = schedule
+            schedule = ScheduleCore()
+        self._core = schedule
         self._vessel = vessel
         self._time_schedule_head = current_time
         self._creation_time = creation_time
-        self._next_event = None
+        self._events = {}
         self._last_event = None
 
     @classmethod
@@ -83,57 +386,51 @@ class Schedule(SimulationEngineAware):
         schedule.set_engine(engine)
         return schedule
 
+    @property
+    def _time_bounds(self):
+        return self._core.time_bounds
+
     @property
     def _number_tasks(self):
-        task_indices = [n[0] for n in self._stn.nodes if isinstance(n, tuple)]
-        total_number_tasks = len(set(task_indices))
-        return total_number_tasks
+        return len(self._core.trades)
 
     def copy(self):
         """
-        Create a copy that contains the reference to the vessel but creates a deep copy of the actual schedule.
+        Create a copy that contains the reference to the vessel and behaves like a deep copy of the actual schedule.
+
+        The copy shares the tasks with this schedule until either of the two schedules is changed, i.e. copying is
+        cheap and only changing a schedule copies its tasks (see :py:func:`_get_writable_core`).
 
         :return: The copy
         :rtype: Schedule
         """
-        copy_with_copy_stn = Schedule(
+        self._core.number_schedules += 1
+        copy_with_shared_core = Schedule(
             self._vessel, current_time=self._time_schedule_head, creation_time=self._creation_time,
-            schedule=self._stn.copy())
-        copy_with_copy_stn.set_engine(self._engine)
-        return copy_with_copy_stn
-
-    def _shift_task_push(self, location, is_right_direction=True):
-        shift_amount = 1
-        if not is_right_direction:
-            shift_amount = - 1
-        if ((location + shift_amount, TransportationStartFinishIndicator.START) in self._stn
-                or (location + shift_amount, TransportationStartFinishIndicator.FINISH) in self._stn):
-            self._shift_task_push(location + shift_amount, is_right_direction)
-        node_label_mapping = {
-            (location, TransportationStartFinishIndicator.START):
-                (location + shift_amount, TransportationStartFinishIndicator.START),
-            (location, TransportationStartFinishIndicator.FINISH):
-                (location + shift_amount, TransportationStartFinishIndicator.FINISH)
-        }
-        nx.relabel_nodes(self._stn, node_label_mapping, copy=False)
-
-    def _shift_task_pull(self, location, is_right_direction=True):
-        shift_amount = 1
-        if not is_right_direction:
-            shift_amount = - 1
-        node_label_mapping = {
-            (location, TransportationStartFinishIndicator.START):
-                (location + shift_amount, TransportationStartFinishIndicator.START),
-            (location, TransportationStartFinishIndicator.FINISH):
-                (location + shift_amount, TransportationStartFinishIndicator.FINISH)
-        }
-        try:
-            nx.relabel_nodes(self._stn, node_label_mapping, copy=False)
-        except KeyError:
-            pass  # No task to begin with. So, nothing to do.
-        if ((location - shift_amount, TransportationStartFinishIndicator.START) in self._stn
-                or (location - shift_amount, TransportationStartFinishIndicator.FINISH) in self._stn):
-            self._shift_task_pull(location - shift_amount, is_right_direction)
+            schedule=self._core)
+        copy_with_shared_core.set_engine(self._engine)
+        return copy_with_shared_core
+
+    def __del__(self):
+        # Release the core so that the schedules that still share it do not copy it on their next change.
+        core = self.__dict__.get("_core")
+        if core is not None:
+            core.number_schedules -= 1
+
+    def _get_writable_core(self):
+        """
+        Get the core for changing it. If the core is shared with other schedules, this schedule gets its own copy
+        of the core first.
+
+        :return: The core that is only used by this schedule.
+        :rtype: ScheduleCore
+        """
+        core = self._core
+        if core.number_schedules > 1:
+            core.number_schedules -= 1
+            core = core.copy()
+            self._core = core
+        return core
 
     def _add_task_notes(self, location, trade, location_type):
         """
@@ -147,12 +444,14 @@ class Schedule(SimulationEngineAware):
             Either pick-up (:py:const:`TransportationSourceDestinationIndicator.PICK_UP`)
             or drop-off (:py:const:`TransportationSourceDestinationIndicator.DROP_OFF`).
         """
-        if (location, TransportationStartFinishIndicator.START) in self._stn:
-            self._shift_task_push(location)
-        self._stn.add_nodes_from([
-            ((location, TransportationStartFinishIndicator.START), {"trade": trade, "location_type": location_type}),
-            ((location, TransportationStartFinishIndicator.FINISH), {"trade": trade, "location_type": location_type})
-        ])
+        self._events.clear()
+        core = self._get_writable_core()
+        task_index = location - 1
+        core.trades.insert(task_index, trade)
+        core.location_types.insert(task_index, location_type)
+        start_index = core.get_chain_index(task_index, TransportationStartFinishIndicator.START)
+        core.time_bounds.insert(start_index, 0, math.inf)
+        core.time_bounds.insert(start_index + 1, 0, math.inf)
 
     def _get_travel_time(self, location, start_or_finish):
         """
@@ -180,29 +479,20 @@ class Schedule(SimulationEngineAware):
                              f"i.e. 'start_or_finish' in "
                              f"[{TransportationStartFinishIndicator.START}, "
                              f"{TransportationStartFinishIndicator.FINISH}]")
+        task_index = location - 1
+        location_current = self._core.get_task_location(task_index)
         if start_or_finish == TransportationStartFinishIndicator.START:
-            node_other = self._stn.nodes[(location - 1, TransportationStartFinishIndicator.FINISH)]
-        else:
-            node_other = self._stn.nodes[(location + 1, TransportationStartFinishIndicator.START)]
-        if node_other["location_type"] == TransportationSourceDestinationIndicator.PICK_UP:
-            location_other = node_other["trade"].origin_port
-        else:
-            location_other = node_other["trade"].destination_port
-        node_current = self._stn.nodes[(location, start_or_finish)]
-        if node_current["location_type"] == TransportationSourceDestinationIndicator.PICK_UP:
-            location_current = node_current["trade"].origin_port
-        else:
-            location_current = node_current["trade"].destination_port
-        if start_or_finish == TransportationStartFinishIndicator.START:
+            location_other = self._core.get_task_location(task_index - 1)
             travel_distance = self._engine.world.network.get_distance(location_other, location_current)
         else:
+            location_other = self._core.get_task_location(task_index + 1)
             travel_distance = self._engine.world.network.get_distance(location_current, location_other)
         travel_time = self._vessel.get_travel_time(travel_distance)
         return travel_time
 
     def _add_task_edges(self, location, location_type, cargo_transfer_time, earliest_start=0, latest_finish=math.inf):
         """
-        Add the edges to and from a task.
+        Set the time bounds of a task's nodes and the separations to and from the task.
 
         :param location:
             The location of the task in the order of all tasks.
@@ -217,43 +507,39 @@ class Schedule(SimulationEngineAware):
         :param latest_finish:
         :return:
         """
+        self._events.clear()
+        time_bounds = self._get_writable_core().time_bounds
+        task_index = location - 1
+        start_index = self._core.get_chain_index(task_index, TransportationStartFinishIndicator.START)
         if location == 1:
-            if location_type == TransportationSourceDestinationIndicator.PICK_UP:
-                destination = self._stn.nodes[(1, TransportationStartFinishIndicator.START)]["trade"].origin_port
-            else:
-                destination = self._stn.nodes[(1, TransportationStartFinishIndicator.START)]["trade"].destination_port
+            destination = self._core.get_task_location(task_index)
             vessel_location = self._engine.world.network.get_vessel_location(self._vessel, self._engine.world.current_time)
             travel_distance = self._engine.world.network.get_distance(vessel_location, destination)
             travel_time = self._vessel.get_travel_time(travel_distance)
             arrival_time = travel_time + self._time_schedule_head
             operation_start = max(arrival_time, earliest_start)
-            self._stn.add_edge((location, TransportationStartFinishIndicator.START), 0, weight=-operation_start)
+            time_bounds.set_lower(start_index, operation_start)
         else:
             travel_time = self._get_travel_time(location, TransportationStartFinishIndicator.START)
-            self._stn.add_edge((location, TransportationStartFinishIndicator.START),
-                               (location - 1, TransportationStartFinishIndicator.FINISH),
-                               weight=-travel_time)
-            self._stn.add_edge((location - 1, TransportationStartFinishIndicator.FINISH),
-                               (location, TransportationStartFinishIndicator.START),
-                               weight=math.inf)
-            self._stn.add_edge((location, TransportationStartFinishIndicator.START), 0, weight=-earliest_start)
-        if (location + 1, TransportationStartFinishIndicator.START) in self._stn.nodes:
+            time_bounds.set_separation(start_index - 1, travel_time)
+            time_bounds.set_lower(start_index, earliest_start)
+        if task_index + 1 < self._number_tasks:
             travel_time = self._get_travel_time(location, TransportationStartFinishIndicator.FINISH)
-            self._stn.add_edge((location + 1, TransportationStartFinishIndicator.START),
-                               (location, TransportationStartFinishIndicator.FINISH),
-                               weight=-travel_time)
-            self._stn.add_edge((location, TransportationStartFinishIndicator.FINISH),
-                               (location + 1, TransportationStartFinishIndicator.START),
-                               weight=math.inf)
-        self._stn.add_edge((location, TransportationStartFinishIndicator.START),
-                           (location, TransportationStartFinishIndicator.FINISH), weight=math.inf)
-        self._stn.add_edge((location, TransportationStartFinishIndicator.FINISH),
-                           (location, TransportationStartFinishIndicator.START), weight=-cargo_transfer_time)
-        self._stn.add_edge(0, (location, TransportationStartFinishIndicator.START), weight=latest_finish)
-        self._stn.add_edge(0, (location, TransportationStartFinishIndicator.FINISH),
-                           weight=latest_finish + cargo_transfer_time)
-        self._stn.add_edge((location, TransportationStartFinishIndicator.FINISH), 0,
-                           weight=-(earliest_start + cargo_transfer_time))
+            time_bounds.set_separation(start_index + 1, travel_time)
+        time_bounds.set_separation(start_index, cargo_transfer_time)
+        time_bounds.set_upper(start_index, latest_finish)
+        time_bounds.set_upper(start_index + 1, latest_finish + cargo_transfer_time)
+        time_bounds.set_lower(start_index + 1, earliest_start + cargo_transfer_time)
+
+    @staticmethod
+    def _get_time_window_trade(trade):
+        if not isinstance(trade, TimeWindowTrade):
+            trade = TimeWindowTrade(origin_port=trade.origin_port,
+                                    destination_port=trade.destination_port,
+                                    amount=trade.amount,
+                                    cargo_type=trade.cargo_type,
+                                    time=trade.time)
+        return trade
 
     def _add_task(self, location, trade, location_type, cargo_transfer_time):
         """
@@ -273,18 +559,8 @@ class Schedule(SimulationEngineAware):
             location.
         :return:
         """
-        if not isinstance(trade, TimeWindowTrade):
-            trade = TimeWindowTrade(origin_port=trade.origin_port,
-                                    destination_port=trade.destination_port,
-                                    amount=trade.amount,
-                                    cargo_type=trade.cargo_type,
-                                    time=trade.time)
+        trade = self._get_time_window_trade(trade)
         self._add_task_notes(location, trade, location_type)
-        possible_edges = [((location - 1, TransportationStartFinishIndicator.FINISH),
-                           (location + 1, TransportationStartFinishIndicator.START)),
-                          ((location + 1, TransportationStartFinishIndicator.START),
-                           (location - 1, TransportationStartFinishIndicator.FINISH))]
-        self._stn.remove_edges_from(possible_edges)
         if location_type == TransportationSourceDestinationIndicator.PICK_UP:
             earliest_start = trade.earliest_pickup_clean
             latest_finish = trade.latest_pickup_clean
@@ -310,7 +586,7 @@ class Schedule(SimulationEngineAware):
         elif (
                 location_pick_up == 1
                 and len(self) > 0
-                and (1, TransportationStartFinishIndicator.START) not in self._stn):
+                and self._core.is_first_task_partial):
             # TODO Write better error!
             raise ValueError("One or both schedule locations are not compatible with the current schedule.")
         elif location_pick_up > self._number_tasks + 1:
@@ -353,6 +629,358 @@ class Schedule(SimulationEngineAware):
         self._add_task(location_pick_up, trade, TransportationSourceDestinationIndicator.PICK_UP, cargo_transfer_time)
         self._add_task(location_drop_off, trade, TransportationSourceDestinationIndicator.DROP_OFF, cargo_transfer_time)
 
+    @staticmethod
+    def _get_plan_tasks(plan):
+        """
+        Check that every trade in a plan is picked up once and dropped off once afterwards.
+
+        :param plan: The tasks, see :py:func:`extend_plan`.
+        :type plan: List[Tuple[Trade, TransportationSourceDestinationIndicator]]
+        :return: The tasks with the trades as :py:class:`TimeWindowTrade`. The pick-up and the drop-off of a trade
+            share the same trade object.
+        :rtype: List[Tuple[TimeWindowTrade, TransportationSourceDestinationIndicator]]
+        :raises ValueError: If a trade is not picked up exactly once before it is dropped off exactly once.
+        """
+        time_window_trades = {}
+        is_dropped_off = {}
+        tasks = []
+        for trade, location_type in plan:
+            location_type = TransportationSourceDestinationIndicator(location_type)
+            trade_key = id(trade)
+            if location_type == TransportationSourceDestinationIndicator.PICK_UP:
+                if trade_key in time_window_trades:
+                    raise ValueError("The plan is not compatible with the schedule: Trying to pick up cargo twice.")
+                time_window_trades[trade_key] = Schedule._get_time_window_trade(trade)
+                is_dropped_off[trade_key] = False
+            elif trade_key not in time_window_trades:
+                raise ValueError("The plan is not compatible with the schedule:"
+                                 " Trying to drop off cargo before picking it up.")
+            elif is_dropped_off[trade_key]:
+                raise ValueError("The plan is not compatible with the schedule: Trying to drop off cargo twice.")
+            else:
+                is_dropped_off[trade_key] = True
+            tasks.append((time_window_trades[trade_key], location_type))
+        if not all(is_dropped_off.values()):
+            raise ValueError("The plan is not compatible with the schedule: Cargo is picked up but not dropped off.")
+        return tasks
+
+    def extend_plan(self, plan):
+        """
+        Append tasks to the end of the schedule in the specified order.
+
+        In contrast to adding the trades one at a time via :py:func:`add_transportation`, the tasks are appended in one
+        pass over the plan and the schedule is verified once at the end.
+
+        :param plan: The pick-ups and drop-offs in the order in which they should follow the schedule's current tasks,
+            e.g. [(trade_1, PICK_UP), (trade_2, PICK_UP), (trade_1, DROP_OFF), (trade_2, DROP_OFF)]. Every trade has to
+            be picked up and later dropped off.
+        :type plan: List[Tuple[Trade, TransportationSourceDestinationIndicator]]
+        :return: True if the extended schedule is valid (see :py:func:`verify_schedule`), False otherwise.
+        :rtype: bool
+        :raises ValueError: If a trade is not picked up exactly once before it is dropped off exactly once.
+        """
+        tasks = self._get_plan_tasks(plan)
+        if len(self) == 0:
+            self._time_schedule_head = self._engine.world.current_time
+            self._creation_time = self._engine.world.current_time
+        previous_location = None
+        if self._number_tasks > 0:
+            previous_location = self._core.get_task_location(self._number_tasks - 1)
+        lower = []
+        upper = []
+        separations = []
+        for trade, location_type in tasks:
+            cargo_transfer_time = self._vessel.get_loading_time(trade.cargo_type, trade.amount)
+            if location_type == TransportationSourceDestinationIndicator.PICK_UP:
+                location = trade.origin_port
+                earliest_start = trade.earliest_pickup_clean
+                latest_finish = trade.latest_pickup_clean
+            else:
+                location = trade.destination_port
+                earliest_start = trade.earliest_drop_off_clean
+                latest_finish = trade.latest_drop_off_clean
+            operation_start = earliest_start
+            if previous_location is None:
+                vessel_location = self._engine.world.network.get_vessel_location(
+                    self._vessel, self._engine.world.current_time)
+                arrival_time = self._get_travel_time_between(vessel_location, location) + self._time_schedule_head
+                operation_start = max(arrival_time, earliest_start)
+                separations.append(0)
+            else:
+                separations.append(self._get_travel_time_between(previous_location, location))
+            lower.extend([operation_start, earliest_start + cargo_transfer_time])
+            upper.extend([latest_finish, latest_finish + cargo_transfer_time])
+            separations.append(cargo_transfer_time)
+            previous_location = location
+        self._events.clear()
+        core = self._get_writable_core()
+        core.trades.extend(one_trade for one_trade, _ in tasks)
+        core.location_types.extend(one_location_type for _, one_location_type in tasks)
+        core.time_bounds.extend(lower, upper, separations)
+        return self.verify_schedule()
+
+    @classmethod
+    def from_plan(cls, vessel, plan, engine=None):
+        """
+        Create a schedule that performs the tasks of a plan in the specified order (see :py:func:`extend_plan`).
+
+        :param vessel: The vessel for which the schedule is.
+        :type vessel: Vessel
+        :param plan: The pick-ups and drop-offs in order.
+        :type plan: List[Tuple[Trade, TransportationSourceDestinationIndicator]]
+        :param engine: The simulation engine. Defaults to the vessel's engine.
+        :type engine: SimulationEngine | None
+        :return: The schedule.
+        :rtype: Schedule
+        :raises ValueError: If a trade is not picked up exactly once before it is dropped off exactly once.
+        """
+        if engine is None:
+            engine = vessel._engine
+        schedule = cls.init_with_engine(vessel, engine.world.current_time, engine)
+        schedule.extend_plan(plan)
+        return schedule
+
+    def _get_travel_time_between(self, location_one, location_two):
+        travel_distance = self._engine.world.network.get_distance(location_one, location_two)
+        travel_time = self._vessel.get_travel_time(travel_distance)
+        return travel_time
+
+    def _get_cargo_load_changes(self):
+        """
+        The change of the vessel's cargo load by each task.
+
+        :return: The vessel's cargo types, the current load and the capacity of each type and the change of the
+            load of each type by each task (shape: number of tasks x number of cargo types). None if a task's cargo
+            cannot be handled by the vessel at all, i.e. the vessel has no hold for the cargo type or the amount is
+            negative.
+        :rtype: Tuple[List[Hashable], np.ndarray, np.ndarray, np.ndarray] | None
+        """
+        cargo_types = self._vessel.loadable_cargo_types()
+        cargo_type_indices = {one_cargo_type: i for i, one_cargo_type in enumerate(cargo_types)}
+        initial_loads = np.array([self._vessel.current_load(one_cargo_type) for one_cargo_type in cargo_types],
+                                 dtype=float)
+        capacities = np.array([self._vessel.capacity(one_cargo_type) for one_cargo_type in cargo_types], dtype=float)
+        load_changes = np.zeros((self._number_tasks, len(cargo_types)))
+        for i, (location_type, current_trade) in enumerate(zip(self._core.location_types, self._core.trades)):
+            cargo_type_index = cargo_type_indices.get(current_trade.cargo_type)
+            if cargo_type_index is None or current_trade.amount < 0:
+                return None
+            if location_type == TransportationSourceDestinationIndicator.PICK_UP:
+                load_changes[i, cargo_type_index] = current_trade.amount
+            else:
+                load_changes[i, cargo_type_index] = -current_trade.amount
+        return cargo_types, initial_loads, capacities, load_changes
+
+    def _get_cargo_insertion_feasibility(self, trade):
+        """
+        Check the cargo loads for all insertions of a trade at once.
+
+        :param trade: The trade.
+        :type trade: Trade
+        :return: For each pick-up and drop-off index (zero based task location) if the cargo loads stay within the
+            vessel's capacities and the hold is empty at the end of the schedule. The shape is
+            (number of tasks + 1) x (number of tasks + 1). None if no insertion is feasible.
+        :rtype: np.ndarray | None
+        """
+        cargo_load_changes = self._get_cargo_load_changes()
+        if cargo_load_changes is None or trade.amount < 0:
+            return None
+        cargo_types, initial_loads, capacities, load_changes = cargo_load_changes
+        if trade.cargo_type not in cargo_types:
+            return None
+        cargo_type_index = cargo_types.index(trade.cargo_type)
+        other_cargo_types = np.arange(len(cargo_types)) != cargo_type_index
+        if not check_cargo_loads(initial_loads[other_cargo_types], capacities[other_cargo_types],
+                                 load_changes[np.newaxis, :, other_cargo_types])[0]:
+            return None
+        capacity = capacities[cargo_type_index]
+        loads = np.cumsum(np.concatenate(([initial_loads[cargo_type_index]], load_changes[:, cargo_type_index])))
+        if loads[-1] > 0:
+            return None
+        is_valid_load = (loads >= 0) & (loads <= capacity)
+        is_valid_load[0] = True
+        is_valid_up_to = np.logical_and.accumulate(is_valid_load)
+        is_valid_from = np.append(np.logical_and.accumulate(is_valid_load[::-1])[::-1], True)
+        loads_with_trade = loads + trade.amount
+        is_valid_load_with_trade = (loads_with_trade >= 0) & (loads_with_trade <= capacity)
+        number_invalid_with_trade = np.concatenate(([0], np.cumsum(~is_valid_load_with_trade)))
+        indices = np.arange(len(loads))
+        # Pick-up before task i and drop-off before task j
+        is_feasible = ((indices[:, np.newaxis] <= indices[np.newaxis, :])
+                       & (is_valid_up_to & is_valid_load_with_trade)[:, np.newaxis]
+                       & (number_invalid_with_trade[np.newaxis, 1:] == number_invalid_with_trade[1:, np.newaxis])
+                       & (is_valid_load & is_valid_from[1:])[np.newaxis, :])
+        return is_feasible
+
+    def _generate_feasible_insertions(self, trade):
+        """
+        Generate all feasible insertions of a trade in the order of the pick-up and then the drop-off location.
+
+        The time bounds of the trade's tasks are the ones :py:func:`_add_task_edges` sets. The nodes before the pick-up
+        keep their earliest times and the nodes after the drop-off their latest times. Only the earliest times of the
+        nodes between the pick-up and the drop-off are recomputed, once per pick-up location.
+
+        :param trade: The trade.
+        :type trade: Trade
+        :return: The insertions.
+        :rtype: Iterator[ScheduleInsertion]
+        """
+        is_cargo_feasible = self._get_cargo_insertion_feasibility(trade)
+        if is_cargo_feasible is None:
+            return
+        trade = self._get_time_window_trade(trade)
+        core = self._core
+        number_tasks = self._number_tasks
+        number_nodes = len(self)
+        is_first_task_partial = core.is_first_task_partial
+        time_bounds = core.time_bounds
+        lower = time_bounds.lower
+        upper = time_bounds.upper
+        separations = time_bounds.separations
+        earliest = time_bounds.earliest()
+        latest = time_bounds.latest()
+        is_consistent_up_to = []
+        for one_earliest, one_upper in zip(earliest, upper):
+            is_consistent_up_to.append((not is_consistent_up_to or is_consistent_up_to[-1])
+                                       and one_earliest <= one_upper)
+        is_consistent_from = [True] * (number_nodes + 1)
+        for i in range(number_nodes - 1, -1, -1):
+            is_consistent_from[i] = is_consistent_from[i + 1] and lower[i] <= latest[i]
+        time_schedule_head = self._time_schedule_head
+        creation_time = self._creation_time
+        if number_nodes == 0:
+            time_schedule_head = self._engine.world.current_time
+            creation_time = self._engine.world.current_time
+        total_separation = sum(separations)
+        origin = trade.origin_port
+        destination = trade.destination_port
+        task_locations = [core.get_task_location(i) for i in range(number_tasks)]
+        travel_to_origin = [self._get_travel_time_between(one_location, origin) for one_location in task_locations]
+        travel_from_origin = [self._get_travel_time_between(origin, one_location) for one_location in task_locations]
+        travel_to_destination = [self._get_travel_time_between(one_location, destination)
+                                 for one_location in task_locations]
+        travel_from_destination = [self._get_travel_time_between(destination, one_location)
+                                   for one_location in task_locations]
+        travel_origin_destination = self._get_travel_time_between(origin, destination)
+        cargo_transfer_time = self._vessel.get_loading_time(trade.cargo_type, trade.amount)
+        earliest_pick_up = trade.earliest_pickup_clean
+        latest_pick_up = trade.latest_pickup_clean
+        earliest_drop_off = trade.earliest_drop_off_clean
+        latest_drop_off = trade.latest_drop_off_clean
+        for pick_up_index in range(int(is_first_task_partial), number_tasks + 1):
+            # Nodes and tasks before the pick-up
+            separation_removed = 0
+            if pick_up_index == 0:
+                vessel_location = self._engine.world.network.get_vessel_location(
+                    self._vessel, self._engine.world.current_time)
+                arrival_time = self._get_travel_time_between(vessel_location, origin) + time_schedule_head
+                first_lower_bound = max(arrival_time, earliest_pick_up)
+                pick_up_start = first_lower_bound
+                separation_added = 0
+            else:
+                previous_node = core.get_chain_index(pick_up_index - 1, TransportationStartFinishIndicator.FINISH)
+                if not is_consistent_up_to[previous_node]:
+                    break
+                first_lower_bound = lower[0]
+                separation_added = travel_to_origin[pick_up_index - 1]
+                pick_up_start = max(earliest_pick_up, earliest[previous_node] + separation_added)
+                if pick_up_index < number_tasks:
+                    separation_removed = separations[previous_node]
+            pick_up_finish = max(earliest_pick_up + cargo_transfer_time, pick_up_start + cargo_transfer_time)
+            if (pick_up_start > latest_pick_up
+                    or pick_up_finish > latest_pick_up + cargo_transfer_time
+                    or not is_cargo_feasible[pick_up_index].any()):
+                continue
+            separation_added += 2 * cargo_transfer_time
+            # Tasks between the pick-up and the drop-off
+            between_finish = None
+            for drop_off_index in range(pick_up_index, number_tasks + 1):
+                between_separation_removed = 0
+                if drop_off_index == pick_up_index:
+                    between_separation_added = travel_origin_destination
+                    drop_off_arrival = pick_up_finish + travel_origin_destination
+                else:
+                    task_index = drop_off_index - 1
+                    start_node = core.get_chain_index(task_index, TransportationStartFinishIndicator.START)
+                    if task_index == pick_up_index:
+                        between_start = max(lower[start_node], pick_up_finish + travel_from_origin[task_index])
+                    else:
+                        between_start = max(lower[start_node], between_finish + separations[start_node - 1])
+                    between_finish = max(lower[start_node + 1], between_start + separations[start_node])
+                    if between_start > upper[start_node] or between_finish > upper[start_node + 1]:
+                        break
+                    between_separation_added = travel_from_origin[pick_up_index] + travel_to_destination[task_index]
+                    if drop_off_index < number_tasks:
+                        between_separation_removed = separations[start_node + 1]
+                    drop_off_arrival = between_finish + travel_to_destination[task_index]
+                # The drop-off and the nodes and tasks after the drop-off
+                if not is_cargo_feasible[pick_up_index, drop_off_index]:
+                    continue
+                drop_off_start = max(earliest_drop_off, drop_off_arrival)
+                drop_off_finish = max(earliest_drop_off + cargo_transfer_time, drop_off_start + cargo_transfer_time)
+                if drop_off_start > latest_drop_off or drop_off_finish > latest_drop_off + cargo_transfer_time:
+                    continue
+                drop_off_separation_added = 0
+                if drop_off_index < number_tasks:
+                    next_node = core.get_chain_index(drop_off_index, TransportationStartFinishIndicator.START)
+                    drop_off_separation_added = travel_from_destination[drop_off_index]
+                    if (drop_off_finish + drop_off_separation_added > latest[next_node]
+                            or not is_consistent_from[next_node]):
+                        continue
+                insertion_total_separation = (total_separation - separation_removed - between_separation_removed
+                                              + separation_added + between_separation_added
+                                              + drop_off_separation_added)
+                completion_time = self._calculate_completion_time(
+                    number_nodes + 4, first_lower_bound, insertion_total_separation, is_first_task_partial,
+                    time_schedule_head, creation_time)
+                yield ScheduleInsertion(trade=trade,
+                                        location_pick_up=pick_up_index + 1,
+                                        location_drop_off=drop_off_index + 1,
+                                        pick_up_time=pick_up_start,
+                                        drop_off_time=drop_off_start,
+                                        completion_time=completion_time)
+
+    @staticmethod
+    def _get_insertion_completion_time(insertion):
+        return insertion.completion_time
+
+    def feasible_insertions(self, trade, objective=None):
+        """
+        Determine all insertions of a trade for which the schedule stays valid (see :py:func:`verify_schedule`), i.e.
+        all pick-up and drop-off locations for :py:func:`add_transportation` that lead to a valid schedule.
+
+        Instead of adding the trade for every pair of insertion points and verifying each schedule, the insertions
+        are checked against the earliest and latest times of the schedule's nodes (see :py:class:`ScheduleTimeBounds`)
+        and the cargo loads after each task. The schedule is not changed.
+
+        :param trade: The trade.
+        :type trade: Trade
+        :param objective: The value to rank the insertions by in ascending order. Defaults to the completion time.
+        :type objective: Callable[[ScheduleInsertion], float] | None
+        :return: The feasible insertions ranked by the objective.
+        :rtype: List[ScheduleInsertion]
+        """
+        if objective is None:
+            objective = Schedule._get_insertion_completion_time
+        insertions = sorted(self._generate_feasible_insertions(trade), key=objective)
+        return insertions
+
+    def best_insertion(self, trade, objective=None):
+        """
+        Determine the feasible insertion of a trade with the lowest objective (see :py:func:`feasible_insertions`).
+
+        :param trade: The trade.
+        :type trade: Trade
+        :param objective: The value to minimise. Defaults to the completion time.
+        :type objective: Callable[[ScheduleInsertion], float] | None
+        :return: The best insertion or None if the trade cannot be inserted.
+        :rtype: ScheduleInsertion | None
+        """
+        if objective is None:
+            objective = Schedule._get_insertion_completion_time
+        insertion = min(self._generate_feasible_insertions(trade), key=objective, default=None)
+        return insertion
+
     def add_relocation(self, port, index_in_schedule=None):
         """
         Add a relocation into the schedule.
@@ -373,36 +1001,49 @@ class Schedule(SimulationEngineAware):
         """
         Determine the time when the schedule completes.
 
+        :return: The completion time.
+        :rtype: float
+        """
+        first_lower_bound = None
+        if len(self) > 0:
+            first_lower_bound = self._time_bounds.lower[0]
+        adjusted_completion_time = self._calculate_completion_time(
+            len(self), first_lower_bound, sum(self._time_bounds.separations), self._core.is_first_task_partial,
+            self._time_schedule_head, self._creation_time)
+        return adjusted_completion_time
+
+    @staticmethod
+    def _calculate_completion_time(number_nodes, first_lower_bound, total_separation, is_first_task_partial,
+                                   time_schedule_head, creation_time):
+        """
+        Determine the time when a schedule completes from its time bounds.
+
+        :param number_nodes: The number of nodes in the schedule's chain.
+        :type number_nodes: int
+        :param first_lower_bound: The lower bound of the first node.
+        :type first_lower_bound: float | None
+        :param total_separation: The sum of the separations between all nodes.
+        :type total_separation: float
+        :param is_first_task_partial: If the start node of the first task was removed.
+        :type is_first_task_partial: bool
+        :param time_schedule_head: The time of the schedule's head.
+        :type time_schedule_head: float
+        :param creation_time: The time the schedule was created.
+        :type creation_time: float
         :return: The completion time.
         :rtype: float
         """
         completion_time = 0
         start_compensator = 0
         finish_compensator = 0
-        if len(self) > 0:
-            task_combinations = ([(idx, indicator)
-                                  for idx, indicator
-                                  in product(range(2, self._number_tasks + 1),
-                                             [TransportationStartFinishIndicator.START,
-                                              TransportationStartFinishIndicator.FINISH])])
-            if (1, TransportationStartFinishIndicator.START) in self._stn:
-                edge_data = self._stn.get_edge_data((1, TransportationStartFinishIndicator.START), 0)
-                start_compensator = edge_data["weight"]
-                previous_task = (1, TransportationStartFinishIndicator.START)
-                task_combinations = [(1, TransportationStartFinishIndicator.FINISH)] + task_combinations
+        if number_nodes > 0:
+            if not is_first_task_partial:
+                start_compensator = -first_lower_bound
             else:
-                edge_data = self._stn.get_edge_data((1, TransportationStartFinishIndicator.FINISH), 0)
-                previous_task = (1, TransportationStartFinishIndicator.FINISH)
-                finish_compensator = edge_data["weight"]
-            for idx, indicator in task_combinations:
-                current_task = (idx, indicator)
-                edge_data = self._stn.get_edge_data(
-                    current_task,
-                    previous_task)
-                completion_time += edge_data["weight"]
-                previous_task = current_task
-        head_adjusted_finish_compensator = finish_compensator + self._time_schedule_head
-        head_adjusted_start_compensator = start_compensator + self._time_schedule_head
+                finish_compensator = -first_lower_bound
+            completion_time = -total_separation
+        head_adjusted_finish_compensator = finish_compensator + time_schedule_head
+        head_adjusted_start_compensator = start_compensator + time_schedule_head
         adjusted_completion_time = completion_time
         if finish_compensator < 0:
             adjusted_completion_time += head_adjusted_finish_compensator
@@ -410,77 +1051,87 @@ class Schedule(SimulationEngineAware):
             adjusted_completion_time += head_adjusted_start_compensator
         adjusted_completion_time = - adjusted_completion_time
         completion_time = - completion_time
-        k = self._time_schedule_head - self._creation_time
+        k = time_schedule_head - creation_time
         if completion_time > 0:
-            completion_time += -k + self._time_schedule_head
-            adjusted_completion_time += -k + self._time_schedule_head
-        if len(self) == 1:
-            adjusted_completion_time += self._creation_time
+            completion_time += -k + time_schedule_head
+            adjusted_completion_time += -k + time_schedule_head
+        if number_nodes == 1:
+            adjusted_completion_time += creation_time
         return adjusted_completion_time
 
     def _get_task_nodes(self):
-        task_nodes = sorted([n for n in self._stn.nodes() if not n == 0])
+        task_nodes = []
+        for location in range(1, self._number_tasks + 1):
+            if location > 1 or not self._core.is_first_task_partial:
+                task_nodes.append((location, TransportationStartFinishIndicator.START))
+            task_nodes.append((location, TransportationStartFinishIndicator.FINISH))
         return task_nodes
 
     def _get_distance_matrix(self):
-        nodes_in_order = [0] + self._get_task_nodes()
-        matrix = nx.to_numpy_array(self._stn, nodes_in_order, nonedge=np.nan)
+        """
+        The distance matrix of the schedule's STN. The first node is the zero time point followed by the task nodes
+        in order. Non-edges are NaN.
+
+        :return: The matrix.
+        :rtype: np.ndarray
+        """
+        time_bounds = self._core.time_bounds
+        number_nodes = len(time_bounds)
+        matrix = np.full((number_nodes + 1, number_nodes + 1), np.nan)
+        matrix[1:, 0] = -np.array(time_bounds.lower, dtype=float)
+        matrix[0, 1:] = time_bounds.upper
+        node_indices = np.arange(1, number_nodes)
+        matrix[node_indices + 1, node_indices] = -np.array(time_bounds.separations, dtype=float)
+        matrix[node_indices, node_indices + 1] = np.inf
         return matrix
 
     def _get_node_locations(self):
-        nodes_world_locations = [self._stn.nodes[t]["trade"].origin_port
-                                 if self._stn.nodes[t]["location_type"] == TransportationSourceDestinationIndicator.PICK_UP
-                                 else self._stn.nodes[t]["trade"].destination_port
-                                 for t in sorted([n for n in self._stn.nodes if isinstance(n, tuple)])]
+        nodes_world_locations = [self._core.get_task_location(self._core.get_task_index(i)[0])
+                                 for i in range(len(self))]
         return nodes_world_locations
 
     def verify_schedule_time(self):
         """
         Verifies that the schedule's timing is possible. A schedule is valid is it has no negative cycles.
 
+        The check uses the schedule's time bounds (see :py:class:`ScheduleTimeBounds`) which are kept up to date
+        while tasks are added. It takes linear time in the number of tasks at most.
+
         :return: True is the schedule is valid, False otherwise.
         :rtype: bool
         """
-        # TODO Going through all cycles seems like a bad idea but negative_edge_cycle seems to not work reliably.
-        # At least sometimes it is False despite there being a negative cycle
-        # has_negative_cycle = nx.negative_edge_cycle(self._stn)
-        has_negative_cycle = False
-        all_cycles = nx.simple_cycles(self._stn)
-        try:
-            while not has_negative_cycle:
-                cycle = next(all_cycles)
-                weight = sum(self._stn[u][v]['weight'] for u, v in zip(cycle, cycle[1:] + [cycle[0]]))
-                if weight < 0:
-                    has_negative_cycle = True
-        except StopIteration:
-            pass  # Nothing to do all cycles tested
-        is_valid_schedule = not has_negative_cycle
+        is_valid_schedule = self._time_bounds.is_consistent()
         return is_valid_schedule
 
+    def get_time_bounds(self):
+        """
+        The earliest and the latest time at which each start and finish of a task can happen such that all time
+        constraints of the schedule can be satisfied.
+
+        :return: The earliest and the latest time per task node, e.g. {(1, <START>): (12, 20), ...}.
+        :rtype: Dict[Tuple[int, TransportationStartFinishIndicator], Tuple[float, float]]
+        :raises ValueError: If the schedule's timing is not possible.
+        """
+        if not self._time_bounds.is_consistent():
+            raise ValueError("The schedule's time constraints cannot be satisfied.")
+        time_bounds = dict(zip(self._get_task_nodes(),
+                               zip(self._time_bounds.earliest(), self._time_bounds.latest())))
+        return time_bounds
+
     def verify_schedule_cargo(self):
         """
         Verifies that the schedule's cargo loading and unloading is possible.
-        The verification is done via simulating all loading and unloading events.
+        The verification checks the cumulative loads after all loading and unloading events
+        (see :py:func:`check_cargo_loads`).
 
         :return: True is the schedule is valid, False otherwise.
         :rtype: bool
         """
-        current_cargo_hold = self._vessel.copy_hold()
-        i = 1
-        valid_schedule = True
-        while valid_schedule and i < self._number_tasks + 1:
-            current_task_node = self._stn.nodes[(i, TransportationStartFinishIndicator.FINISH)]
-            current_task_type = current_task_node["location_type"]
-            current_task_trade = current_task_node["trade"]
-            try:
-                if current_task_type is TransportationSourceDestinationIndicator.PICK_UP:
-                    current_cargo_hold.load_cargo(current_task_trade.cargo_type, current_task_trade.amount)
-                else:
-                    current_cargo_hold.unload_cargo(current_task_trade.cargo_type, current_task_trade.amount)
-            except ValueError:
-                valid_schedule = False
-            i += 1
-        is_valid_schedule = valid_schedule and current_cargo_hold.is_empty()
+        is_valid_schedule = False
+        cargo_load_changes = self._get_cargo_load_changes()
+        if cargo_load_changes is not None:
+            _, initial_loads, capacities, load_changes = cargo_load_changes
+            is_valid_schedule = bool(check_cargo_loads(initial_loads, capacities, load_changes[np.newaxis])[0])
         return is_valid_schedule
 
     def verify_schedule(self):
@@ -506,7 +1157,7 @@ class Schedule(SimulationEngineAware):
         else:
             # +1 for starting at one (not zero indexed), +1 for finishing task after last task
             insertion_points_range_adjustment = 2
-            if (1, TransportationStartFinishIndicator.START) in self._stn.nodes:
+            if not self._core.is_first_task_partial:
                 insertion_points = range(1, self._number_tasks + insertion_points_range_adjustment)
             else:
                 insertion_points = range(2, self._number_tasks + insertion_points_range_adjustment)
@@ -520,16 +1171,8 @@ class Schedule(SimulationEngineAware):
         :return: The simple overview.
         :rtype: List[Tuple[str, Trade]]
         """
-        simple_schedule = [None] * self._number_tasks
-        for one_task in iter(self._stn):
-            task_idx = None
-            if isinstance(one_task, tuple):
-                task_idx = one_task[0]
-            if task_idx is not None:
-                if one_task[1] == TransportationStartFinishIndicator.FINISH:
-                    node = self._stn.nodes[one_task]
-                    location_type, current_trade = self._get_node_info(node)
-                    simple_schedule[task_idx - 1] = (location_type.name , current_trade)
+        simple_schedule = [(location_type.name, current_trade)
+                           for location_type, current_trade in zip(self._core.location_types, self._core.trades)]
         return simple_schedule
 
     def get_scheduled_trades(self):
@@ -539,17 +1182,9 @@ class Schedule(SimulationEngineAware):
         :return: The trades.
         :rtype: List[Trade]
         """
-        trades = []
-        for one_task in iter(self._stn):
-            task_idx = None
-            if isinstance(one_task, tuple):
-                task_idx = one_task[0]
-            if task_idx is not None:
-                if one_task[1] == TransportationStartFinishIndicator.FINISH:
-                    node = self._stn.nodes[one_task]
-                    location_type, current_trade = self._get_node_info(node)
-                    if location_type == TransportationSourceDestinationIndicator.DROP_OFF:
-                        trades.append(current_trade)
+        trades = [current_trade
+                  for location_type, current_trade in zip(self._core.location_types, self._core.trades)
+                  if location_type == TransportationSourceDestinationIndicator.DROP_OFF]
         return trades
 
     def __len__(self):
@@ -560,7 +1195,7 @@ class Schedule(SimulationEngineAware):
         :return: #Events
         :rtype: int
         """
-        return len(self._stn.nodes) - 1
+        return len(self._core.time_bounds)
 
     def _get_node(self, idx):
         """
@@ -568,34 +1203,25 @@ class Schedule(SimulationEngineAware):
         the schedule.
 
         :param idx: The tasks index.
-        :return: The node.
+        :return: The task, i.e. its location and if it is the start or finish, and the node, i.e. the type of
+            location and the trade.
+        :rtype: Tuple[Tuple[int, TransportationStartFinishIndicator],
+            Tuple[TransportationSourceDestinationIndicator, TimeWindowTrade]]
         :raises IndexError: If the index does not exist
         """
-        task = (1, TransportationStartFinishIndicator.START)
-        if task not in self._stn:
-            task = (1, TransportationStartFinishIndicator.FINISH)
-        if idx < 0:
-            num_nodes = len(self._stn.nodes)
-            i = num_nodes + idx - 1  # - 1 for 0 is not a valid node.
-            if i < 0:
-                raise IndexError(idx)
-        else:
-            i = idx
-        while i > 0:
-            if task[1] == TransportationStartFinishIndicator.START:
-                task = (task[0], TransportationStartFinishIndicator.FINISH)
-            else:
-                task = (task[0] + 1, TransportationStartFinishIndicator.START)
-            i -= 1
-        try:
-            node = self._stn.nodes[task]
-        except KeyError:
+        i = idx
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
             raise IndexError(idx)
+        task_index, start_or_finish = self._core.get_task_index(i)
+        task = (task_index + 1, start_or_finish)
+        node = (self._core.location_types[task_index], self._core.trades[task_index])
         return task, node
 
     @staticmethod
     def _get_vessel_destination(node):
-        location_type, current_trade = Schedule._get_node_info(node)
+        location_type, current_trade = node
         if location_type == TransportationSourceDestinationIndicator.PICK_UP:
             vessel_destination = current_trade.origin_port
         else:
@@ -604,7 +1230,7 @@ class Schedule(SimulationEngineAware):
 
     @staticmethod
     def _get_trade_location_and_time(node):
-        location_type, current_trade = Schedule._get_node_info(node)
+        location_type, current_trade = node
         is_pickup = not location_type
         if is_pickup:
             location = current_trade.origin_port
@@ -614,24 +1240,8 @@ class Schedule(SimulationEngineAware):
             earliest_event_time = current_trade.earliest_drop_off
         return location, earliest_event_time
 
-    @staticmethod
-    def _get_node_info(node):
-        """
-        :param node:
-        :return The type of location and the trade.
-        :rtype: Tuple[
-        """
-        location_type = None
-        current_trade = None
-        try:
-            location_type = node["location_type"]
-            current_trade = node["trade"]
-        except KeyError:
-            pass  # Nothing to do
-        return location_type, current_trade
-
     def _generate_arrival_or_travel_or_idle_event(self, node):
-        location_type, current_trade = Schedule._get_node_info(node)
+        location_type, current_trade = node
         is_pickup = not location_type
         vessel_location = self._vessel.location
         vessel_destination = self._get_vessel_destination(node)
@@ -680,7 +1290,7 @@ class Schedule(SimulationEngineAware):
         :param node: The node.
         :return: The event.
         """
-        location_type, current_trade = Schedule._get_node_info(node)
+        location_type, current_trade = node
         is_pickup = not location_type
         event_time = self._vessel.get_loading_time(current_trade.cargo_type, current_trade.amount)
         event_time += self._time_schedule_head
@@ -689,11 +1299,26 @@ class Schedule(SimulationEngineAware):
         return event
 
     def __getitem__(self, idx):
-        task, node = self._get_node(idx)
-        if task[1] == TransportationStartFinishIndicator.START:
-            event = self._generate_arrival_or_travel_or_idle_event(node)
-        else:
-            event = self._generate_cargo_transfer_event(node)
+        """
+        The event of a node. Events are generated once and kept until the schedule is changed or popped.
+
+        :param idx: The index of the node.
+        :type idx: int
+        :return: The event.
+        :rtype: VesselEvent
+        :raises IndexError: If the index does not exist
+        """
+        i = idx
+        if i < 0:
+            i += len(self)
+        event = self._events.get(i)
+        if event is None:
+            task, node = self._get_node(idx)
+            if task[1] == TransportationStartFinishIndicator.START:
+                event = self._generate_arrival_or_travel_or_idle_event(node)
+            else:
+                event = self._generate_cargo_transfer_event(node)
+            self._events[i] = event
         return event
 
     def get(self, idx, default=None):
@@ -703,14 +1328,6 @@ class Schedule(SimulationEngineAware):
             event = default
         return event
 
-    def _get_first_node(self):
-        first_node = None
-        if self._number_tasks > 0:
-            first_node = (1, TransportationStartFinishIndicator.START)
-            if first_node not in self._stn.nodes:
-                first_node = (1, TransportationStartFinishIndicator.FINISH)
-        return first_node
-
     def pop(self):
         """
         Pop the next scheduled location.
@@ -719,20 +1336,23 @@ class Schedule(SimulationEngineAware):
         """
         event = self.next()
         self._last_event = event
-        self._next_event = None
+        self._events.clear()
         no_node_shift_events = [IdleEvent, TravelEvent]
         next_event_is_no_shift_event = any(isinstance(event, one_no_shift_event_type)
                                            for one_no_shift_event_type in no_node_shift_events)
         if not next_event_is_no_shift_event:
-            first_node = self._get_first_node()
-            self._stn.remove_node(first_node)
-            if first_node == (1, TransportationStartFinishIndicator.FINISH):
-                self._shift_task_pull(2, False)
+            core = self._get_writable_core()
+            core.time_bounds.remove(0)
+            if core.is_first_task_partial:
+                del core.trades[0]
+                del core.location_types[0]
+            core.is_first_task_partial = not core.is_first_task_partial
         self._time_schedule_head = event.time
-        first_node = self._get_first_node()
-        if first_node is not None:
+        if self._number_tasks > 0:
             next_event = self.next()
-            self._stn[first_node][0]["weight"] = min(self._stn[first_node][0]["weight"], -next_event.time)
+            lower_first = max(self._core.time_bounds.lower[0], next_event.time)
+            if lower_first != self._core.time_bounds.lower[0]:
+                self._get_writable_core().time_bounds.set_lower(0, lower_first)
         return event
 
     def next(self):
@@ -741,6 +1361,4 @@ class Schedule(SimulationEngineAware):
 
         :return: The next stop.
         """
-        if self._next_event is None:
-            self._next_event = self.get(0)
-        return self._next_event
+        return self.get(0)
@@ -0,0 +1,135 @@
+"""
+What-if analysis by forking variants of a running simulation into worker processes.
+"""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+import attrs
+from loguru import logger
+
+from mable.observers import MetricsObserver
+from mable.snapshot import EngineSnapshot
+from mable.util import JsonAbleEncoder
+
+if TYPE_CHECKING:
+    from mable.engine import SimulationEngine
+
+
+@attrs.define(kw_only=True)
+class Variant:
+    """
+    A variant of a simulation that continues from a snapshot.
+
+    :param name: The name of the variant.
+    :type name: str
+    :param modification: A function that changes the simulation before the variant runs, e.g. a company's
+        bidding or the network's canal scenario. The function receives the engine as its only argument and has to be
+        picklable, i.e. defined at module level.
+    :type modification: Callable[[SimulationEngine], None] | None
+    :param seed: A seed for the simulation's random. If None, the random continues with the snapshot's state.
+    :type seed: int | None
+    """
+    name: str
+    modification: Callable[[SimulationEngine], None] | None = None
+    seed: int | None = None
+
+
+@attrs.define(kw_only=True)
+class VariantResult:
+    """
+    The outcome of running a variant.
+
+    :param name: The name of the variant.
+    :type name: str
+    :param result: The result of the variant's run as returned by the result function. None if the run failed.
+    :type result: Any
+    :param error: A description of the exception that ended the run or None if the run finished.
+    :type error: str | None
+    """
+    name: str
+    result: Any = None
+    error: str | None = None
+
+
+def collect_metrics(engine):
+    """
+    The default result of a variant: The json encodable metrics of all metrics observers of the engine.
+
+    :param engine: The simulation engine after the run.
+    :type engine: SimulationEngine
+    :return: The metrics of each metrics observer in order of registration.
+    :rtype: list[dict]
+    """
+    return [json.loads(json.dumps(one_observer.metrics.to_json(), cls=JsonAbleEncoder))
+            for one_observer in engine.get_event_observers()
+            if isinstance(one_observer, MetricsObserver)]
+
+
+def run_variant(engine_factory, snapshot_bytes, variant, result_function=collect_metrics):
+    """
+    Run one variant from a snapshot to the end of the simulation.
+
+    :param engine_factory: A function without arguments that generates the simulation from the same specifications
+        as the simulation the snapshot was taken from.
+    :type engine_factory: Callable[[], SimulationEngine]
+    :param snapshot_bytes: The serialised snapshot.
+    :type snapshot_bytes: bytes
+    :param variant: The variant.
+    :type variant: Variant
+    :param result_function: A function that determines the result from the engine after the run.
+    :type result_function: Callable[[SimulationEngine], Any]
+    :return: The result of the run.
+    :rtype: Any
+    """
+    engine = engine_factory()
+    engine.restore(EngineSnapshot.from_bytes(snapshot_bytes))
+    if variant.seed is not None:
+        engine.world.random.seed(variant.seed)
+    if variant.modification is not None:
+        variant.modification(engine)
+    engine.run()
+    return result_function(engine)
+
+
+def fork_variants(engine, engine_factory, variants, max_workers=None, result_function=collect_metrics,
+                  mp_context=None):
+    """
+    Continue a running simulation in several variants. Each variant is run to the end of the simulation in a worker
+    process which restores a snapshot of the simulation's current state instead of running the simulation up to this
+    point again. The engine itself is not changed.
+
+    Should only be called between the processing of two events, e.g. by an observer of
+    :py:class:`mable.competition.generation.AuctionCargoEvent` to fork at an auction.
+
+    :param engine: The running simulation.
+    :type engine: SimulationEngine
+    :param engine_factory: A picklable function without arguments that generates the simulation from the same
+        specifications as the running simulation, including the same observers.
+    :type engine_factory: Callable[[], SimulationEngine]
+    :param variants: The variants.
+    :type variants: list[Variant]
+    :param max_workers: The maximal number of worker processes. If None, the number of processors is used.
+    :type max_workers: int | None
+    :param result_function: A picklable function that determines the result of a variant from the engine after the
+        run. Default is :py:func:`collect_metrics`.
+    :type result_function: Callable[[SimulationEngine], Any]
+    :param mp_context: The multiprocessing context for the worker processes. If None, the default context is used.
+    :return: The results in the order of the variants.
+    :rtype: list[VariantResult]
+    """
+    snapshot_bytes = engine.snapshot().to_bytes()
+    variant_results = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        futures = [executor.submit(run_variant, engine_factory, snapshot_bytes, one_variant, result_function)
+                   for one_variant in variants]
+        for one_variant, one_future in zip(variants, futures):
+            try:
+                variant_results.append(VariantResult(name=one_variant.name, result=one_future.result()))
+            except Exception as e:
+                logger.error(f"Variant {one_variant.name} ran into an exception: {e!r}")
+                variant_results.append(VariantResult(name=one_variant.name, error=repr(e)))
+    return variant_results
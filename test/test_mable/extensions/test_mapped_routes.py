@@ -0,0 +1,105 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from mable.extensions.mapped_routes import MappedRouteDatabase, write_mapped_route_database, is_mapped_route_database
+from mable.extensions.resources import ResourceManager
+from mable.extensions.route_database import read_route_database
+from mable.extensions.world_ports import LatLongShippingNetwork, LatLongPort, Route, load_precomputed_routes
+
+
+@pytest.fixture
+def ports():
+    return [LatLongPort("A", 0, 0), LatLongPort("B", 2, 2), LatLongPort("AB", 4, 0), LatLongPort("C", 1, 3)]
+
+
+@pytest.fixture
+def routes():
+    points = [(0, 0), (1, 0.5), (1.5, 1.5), (2, 2)]
+    return {
+        "AB": [Route("", points, 300.5, ()), Route("", points[::2], 310.25, ("Suez",))],
+        "CAB": [Route("C-AB", [(3, 1), (0, 4)], 250.0, ("Panama", "Suez"))],
+        "BC": [],
+        "AAB": [Route("", [(0, 0), (0, 4)], 240.0, None)],
+    }
+
+
+@pytest.fixture
+def routes_file(routes, ports, tmp_path):
+    routes_file = tmp_path / "routes.rdb"
+    write_mapped_route_database(routes, [one_port.name for one_port in ports], routes_file)
+    yield routes_file
+    ResourceManager.clear()
+
+
+class TestMappedRouteDatabase:
+
+    def test_routes(self, routes, routes_file):
+        assert is_mapped_route_database(routes_file)
+        mapped_routes = load_precomputed_routes(routes_file)
+        assert isinstance(mapped_routes, MappedRouteDatabase)
+        assert mapped_routes.port_names == ["A", "B", "AB", "C"]
+        assert len(mapped_routes) == 4
+        assert set(mapped_routes) == set(routes)
+        assert "BA" not in mapped_routes
+        assert mapped_routes.get("BA") is None
+        for key, key_routes in routes.items():
+            assert key in mapped_routes
+            assert mapped_routes[key] == [Route(one_route.name, one_route.route, one_route.length, one_route.canals)
+                                          for one_route in key_routes]
+            assert mapped_routes[key] is mapped_routes[key]
+        with pytest.raises(TypeError):
+            mapped_routes["BA"] = []
+
+    def test_float32_points(self, ports, tmp_path):
+        points = [(0.1, 0.2), (1.123456789, 2.987654321)]
+        write_mapped_route_database({"AB": [Route("", points, 1, ())]}, ["A", "B"], tmp_path / "routes.rdb")
+        route = MappedRouteDatabase(tmp_path / "routes.rdb", Route)["AB"][0]
+        assert np.allclose(route.route, points, atol=1e-5)
+        assert route.length == 1
+
+    def test_get_shortest_lengths(self, routes_file):
+        mapped_routes = MappedRouteDatabase(routes_file, Route)
+        lengths = mapped_routes.get_shortest_lengths(["A", "B", "C", "AB", "D"])
+        assert np.isnan(lengths[:, 4]).all() and np.isnan(lengths[4, :]).all()
+        assert lengths[0, 1] == lengths[1, 0] == 300.5
+        assert lengths[2, 3] == lengths[3, 2] == 250
+        assert lengths[0, 3] == 240
+        assert np.isnan(lengths[1, 2]) and np.isnan(lengths[0, 2])
+
+    def test_network(self, routes, ports, routes_file, tmp_path):
+        with open(tmp_path / "routes.pickle", "wb") as pickled_routes_file:
+            pickle.dump(routes, pickled_routes_file)
+        pickled_network = LatLongShippingNetwork(ports=ports, precomputed_routes_file=tmp_path / "routes.pickle")
+        network = LatLongShippingNetwork(ports=ports, precomputed_routes_file=routes_file)
+        assert isinstance(network._precomputed_routes, MappedRouteDatabase)
+        assert network._precomputed_routes is ResourceManager.get_precomputed_routes(routes_file)
+        np.testing.assert_array_equal(network._distance_matrix, pickled_network._distance_matrix)
+        assert network.get_distance(ports[2], ports[3]) == 250
+        reversed_routes = network.get_all_stored_routes_between_points(ports[1], ports[0])
+        assert reversed_routes[0].reversed() is network._precomputed_routes["AB"][0]
+        computed_routes = [Route("", [(0, 0), (1, 3)], 100, ())]
+        network.compute_all_routes_between_points = lambda *args, **kwargs: computed_routes
+        assert network.get_all_routes_between_points(ports[0], ports[3]) is computed_routes
+        assert "AC" not in network._precomputed_routes
+
+    def test_read_route_database(self, routes, routes_file):
+        route_database = read_route_database(routes_file)
+        assert route_database.port_names == ["A", "B", "AB", "C"]
+        assert route_database["CAB"][0].name == "C-AB"
+        assert set(route_database) == set(routes)
+
+    def test_unsupported_version(self, routes_file):
+        with open(routes_file, "rb") as mapped_file:
+            content = mapped_file.read()
+        content = content.replace(b'"version": 1', b'"version": 9', 1)
+        with open(routes_file, "wb") as mapped_file:
+            mapped_file.write(content)
+        with pytest.raises(ValueError):
+            MappedRouteDatabase(routes_file, Route)
+        with open(routes_file, "wb") as mapped_file:
+            mapped_file.write(pickle.dumps({}))
+        assert not is_mapped_route_database(routes_file)
+        with pytest.raises(ValueError):
+            MappedRouteDatabase(routes_file, Route)
@@ -0,0 +1,65 @@
+import pickle
+
+import networkx
+import pytest
+
+from mable.extensions.resources import ResourceManager
+from mable.extensions.world_ports import LatLongShippingNetwork, LatLongPort, Route
+
+
+@pytest.fixture
+def resource_manager():
+    ResourceManager.clear()
+    yield ResourceManager
+    ResourceManager.clear()
+
+
+class TestResourceManager:
+
+    def test_precomputed_routes_shared(self, resource_manager, tmp_path):
+        ports = [LatLongPort("A", 0, 0), LatLongPort("B", 1, 1)]
+        routes = {"AB": [Route("A-B", [[0, 0], [0.5, 0.5], [1, 1]], 10, ["Suez", None])]}
+        with open(tmp_path / "routes.pickle", "wb") as routes_file:
+            pickle.dump(routes, routes_file)
+        network_one = LatLongShippingNetwork(ports=ports, precomputed_routes_file=tmp_path / "routes.pickle")
+        network_two = LatLongShippingNetwork(ports=ports, precomputed_routes_file=str(tmp_path / "routes.pickle"))
+        shared_routes = resource_manager.get_precomputed_routes(tmp_path / "routes.pickle")
+        assert network_one._precomputed_routes is shared_routes
+        assert network_two._precomputed_routes is shared_routes
+        for _ in range(2):
+            reversed_routes = network_one._get_precomputed_routes(ports[1], ports[0])
+            assert reversed_routes[0].route == [[1, 1], [0.5, 0.5], [0, 0]]
+            assert reversed_routes[0].canals == [None, "Suez"]
+        assert shared_routes["AB"][0].route == [[0, 0], [0.5, 0.5], [1, 1]]
+
+    def test_computed_routes_not_shared(self, resource_manager, tmp_path):
+        ports = [LatLongPort("A", 0, 0), LatLongPort("B", 1, 1), LatLongPort("C", 2, 2)]
+        with open(tmp_path / "routes.pickle", "wb") as routes_file:
+            pickle.dump({"AB": [Route("", [[0, 0], [1, 1]], 10, ())]}, routes_file)
+        network_one = LatLongShippingNetwork(ports=ports, precomputed_routes_file=tmp_path / "routes.pickle")
+        network_two = LatLongShippingNetwork(ports=ports, precomputed_routes_file=tmp_path / "routes.pickle")
+        computed_routes = [Route("", [[0, 0], [2, 2]], 20, ())]
+        network_one.compute_all_routes_between_points = lambda *args, **kwargs: computed_routes
+        assert network_one.get_all_routes_between_points(ports[0], ports[2]) is computed_routes
+        assert network_one.get_all_stored_routes_between_points(ports[0], ports[2]) is computed_routes
+        assert network_one.get_all_stored_routes_between_points(ports[2], ports[0])[0].reversed() is computed_routes[0]
+        assert "AC" not in resource_manager.get_precomputed_routes(tmp_path / "routes.pickle")
+        assert network_two.get_all_stored_routes_between_points(ports[0], ports[2]) is None
+
+    def test_route_graph_copied(self, resource_manager, tmp_path):
+        graph = networkx.Graph()
+        graph.add_edge((0, 0), (1, 1), weight=2)
+        with open(tmp_path / "graph.pkl", "wb") as graph_file:
+            pickle.dump(graph, graph_file)
+        network_one = LatLongShippingNetwork(ports=[], graph_file=str(tmp_path / "graph.pkl"))
+        network_two = LatLongShippingNetwork(ports=[], graph_file=str(tmp_path / "graph.pkl"))
+        network_one.world_graph.remove_edge((0, 0), (1, 1))
+        assert network_two.world_graph.has_edge((0, 0), (1, 1))
+
+    def test_table_shared(self, resource_manager, tmp_path):
+        with open(tmp_path / "table.csv", "w") as table_file:
+            table_file.write("Port,Mean\nA,1.5\nB,2.5\n")
+        resource_manager.preload(table_files=[tmp_path / "table.csv"])
+        table = resource_manager.get_table(tmp_path / "table.csv")
+        assert list(table["Mean"]) == [1.5, 2.5]
+        assert resource_manager.get_table(str(tmp_path / "table.csv")) is table
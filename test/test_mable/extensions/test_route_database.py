@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pytest
+
+from mable.extensions.resources import ResourceManager
+from mable.extensions.route_database import (RouteDatabase, RouteDatabaseBuilder, build_csr_adjacency,
+                                             get_shortest_path_tree, read_route_database, write_route_database,
+                                             ROUTE_DATABASE_VERSION)
+from mable.extensions.world_ports import LatLongShippingNetwork, LatLongPort
+
+
+@pytest.fixture
+def graph_file(tmp_path):
+    rng = random.Random(4)
+    step = 20
+    edges = []
+    for longitude in range(-180, 180, step):
+        for latitude in range(-80, 81, step):
+            if longitude + step < 180:
+                edges.append([longitude, latitude, longitude + step, latitude, rng.uniform(1, 10)])
+            if latitude + step <= 80:
+                edges.append([longitude, latitude, longitude, latitude + step, rng.uniform(1, 10)])
+    graph_file = tmp_path / "graph.txt"
+    np.savetxt(graph_file, edges)
+    return graph_file
+
+
+@pytest.fixture
+def ports():
+    rng = random.Random(5)
+    return [LatLongPort(f"P{i}", rng.uniform(-70, 70), rng.uniform(-170, 170)) for i in range(4)]
+
+
+def get_route_keys(routes):
+    return sorted((one_route.length, tuple(one_route.canals), one_route.as_tuple()) for one_route in routes)
+
+
+def test_get_shortest_path_tree():
+    index_pointers, indices, weights = build_csr_adjacency(4, [(0, 1, 1), (1, 2, 1), (0, 2, 3)])
+    assert index_pointers.tolist() == [0, 2, 4, 6, 6]
+    distances, predecessors = get_shortest_path_tree(index_pointers.tolist(), indices.tolist(), weights.tolist(), 0)
+    assert distances[:3] == [0, 1, 2]
+    assert distances[3] == np.inf
+    assert predecessors == [-1, 0, 1, -1]
+
+
+class TestRouteDatabaseBuilder:
+
+    def test_build(self, graph_file, ports, tmp_path):
+        builder = RouteDatabaseBuilder(ports, graph_file)
+        route_database = builder.build(max_workers=1)
+        assert len(route_database) == 6
+        network = LatLongShippingNetwork(ports=ports, graph_file=graph_file)
+        for i, port_one in enumerate(ports):
+            for port_two in ports[i + 1:]:
+                expected_routes = network.compute_all_routes_between_points(port_one, port_two)
+                assert get_route_keys(route_database[f"{port_one.name}{port_two.name}"]) == get_route_keys(
+                    expected_routes)
+        route_database_file = tmp_path / "routes.pickle"
+        write_route_database(route_database, route_database_file)
+        read_database = read_route_database(route_database_file)
+        assert read_database == route_database
+        assert read_database.version == ROUTE_DATABASE_VERSION
+        assert read_database.scenarios == builder.scenarios
+        network = LatLongShippingNetwork(ports=ports, precomputed_routes_file=route_database_file)
+        assert network.get_distance(ports[3], ports[0]) == route_database[f"P0P3"][0].length
+        ResourceManager.clear()
+
+    def test_build_update(self, graph_file, ports):
+        existing_routes = RouteDatabaseBuilder(ports[:3], graph_file).build(max_workers=1)
+        existing_routes = RouteDatabase({"P1P0": existing_routes["P0P1"], "P0P2": []})
+        route_database = RouteDatabaseBuilder(ports, graph_file).build(existing_routes, max_workers=1)
+        assert set(route_database) == {"P1P0", "P0P2", "P1P2", "P0P3", "P1P3", "P2P3"}
+        assert route_database["P0P2"] == []
+        assert route_database["P1P0"] is existing_routes["P1P0"]
+
+    def test_unsupported_version(self, tmp_path):
+        route_database = RouteDatabase()
+        route_database.version = ROUTE_DATABASE_VERSION + 1
+        write_route_database(route_database, tmp_path / "routes.pickle")
+        with pytest.raises(ValueError):
+            read_route_database(tmp_path / "routes.pickle")
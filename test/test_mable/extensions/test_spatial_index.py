@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+import pytest
+
+from mable.extensions.spatial_index import UnitVectorKDTree
+from mable.extensions.world_ports import LatLongShippingNetwork
+
+
+def get_distances(longitude, latitude, points):
+    return np.array([LatLongShippingNetwork.get_long_lat_dist(latitude, longitude, one_point[1], one_point[0])
+                     for one_point in points])
+
+
+class TestUnitVectorKDTree:
+
+    @pytest.mark.parametrize("leaf_size", [1, 4, 16])
+    def test_query(self, leaf_size):
+        rng = random.Random(1)
+        points = [(rng.uniform(-180, 180), rng.uniform(-90, 90)) for _ in range(300)]
+        points += [(0, 90), (180, 0), (-180, 0)]
+        tree = UnitVectorKDTree([p[0] for p in points], [p[1] for p in points], leaf_size=leaf_size)
+        assert len(tree) == len(points)
+        for longitude, latitude in [(179.9, 0.1), (0, 89.9), (-45.5, -30.2), (12, 55)]:
+            distances = get_distances(longitude, latitude, points)
+            nearest_distances, nearest_indices = tree.query(longitude, latitude, k=5)
+            assert np.allclose(nearest_distances, np.sort(distances)[:5], atol=1e-3)
+            assert np.allclose(distances[nearest_indices], nearest_distances, atol=1e-3)
+            radius = float(np.sort(distances)[20]) + 1
+            _, radius_indices = tree.query_radius(longitude, latitude, radius)
+            assert sorted(radius_indices.tolist()) == np.nonzero(distances <= radius)[0].tolist()
+
+    def test_empty_and_small(self):
+        tree = UnitVectorKDTree([], [])
+        distances, indices = tree.query(0, 0, k=3)
+        assert len(distances) == 0 and len(indices) == 0
+        tree = UnitVectorKDTree([10, 10], [20, 20])
+        _, indices = tree.query(0, 0, k=3)
+        assert sorted(indices.tolist()) == [0, 1]
+        _, indices = tree.query_radius(0, 0, 1e9)
+        assert sorted(indices.tolist()) == [0, 1]
+
+
+def test_find_closest_node(tmp_path):
+    rng = random.Random(2)
+    nodes = [(round(rng.uniform(-180, 180), 2), round(rng.uniform(-80, 80), 2)) for _ in range(200)]
+    graph_file = tmp_path / "graph.txt"
+    np.savetxt(graph_file, [[*one_node, *other_node, 1] for one_node, other_node in zip(nodes, nodes[1:])])
+    network = LatLongShippingNetwork(graph_file=graph_file)
+    graph_nodes = list(network.world_graph.nodes)
+    assert network.find_closest_node(*graph_nodes[3]) == graph_nodes[3]
+    for longitude, latitude in [(0, 0), (179.99, -10), (-100.5, 45.25)]:
+        distances = get_distances(longitude, latitude, graph_nodes)
+        assert network.find_closest_node(longitude, latitude) == graph_nodes[int(np.argmin(distances))]
@@ -1,11 +1,12 @@
 import csv
+import pickle
 
 from pathlib import Path
 
 from mable import global_setup
 from mable.examples.fleets import example_fleet_1, get_fuel_mfo
 from mable.extensions.fuel_emissions import VesselWithEngine
-from mable.extensions.world_ports import LatLongShippingNetwork, LatLongPort, LatLongLocation
+from mable.extensions.world_ports import LatLongShippingNetwork, LatLongPort, LatLongLocation, Route, ReversedRoute
 from mable.simulation_de_serialisation import SimulationSpecification
 from mable.simulation_space.universe import OnJourney
 
@@ -68,3 +69,45 @@ class TestLatLongShippingNetwork:
             location_3, location_2)
         assert shortest_routes_nowhere_to_port_call_2 is not None
         assert shortest_routes_nowhere_to_port_call_2 == shortest_routes_nowhere_to_port_outer_call
+
+    def test_get_distances(self, tmp_path):
+        ports = [LatLongPort("A", 0, 0), LatLongPort("B", 0, 1), LatLongPort("C", 1, 1)]
+        precomputed_routes = {
+            "AB": [Route("", [(0, 0), (1, 0)], 60), Route("", [(0, 0), (0.5, 0.5), (1, 0)], 90)],
+            "BC": [Route("", [(1, 0), (1, 1)], 70)],
+            "CA": [Route("", [(1, 1), (0, 0)], 85)],
+        }
+        precomputed_routes_file = tmp_path / "precomputed_routes.pickle"
+        with open(precomputed_routes_file, "wb") as f:
+            pickle.dump(precomputed_routes, f)
+        network = LatLongShippingNetwork(ports=ports, precomputed_routes_file=precomputed_routes_file)
+        assert network.get_distance("A", "B") == 60
+        assert network.get_distance(ports[1], ports[0]) == 60
+        assert network.get_distance("A", ports[2]) == 85
+        assert network.get_distance("C", "C") == 0
+        distances = network.get_distances(["A", ports[2]], ["B", "C", "A"])
+        assert distances.tolist() == [[60, 85, 0], [70, 0, 85]]
+        assert network.get_distances([], ["A"]).shape == (0, 1)
+
+    def test_get_precomputed_routes_reverse(self, tmp_path):
+        ports = [LatLongPort("A", 0, 0), LatLongPort("B", 2, 2)]
+        points = [(0, 0), (1, 0.5), (1.5, 1.5), (2, 2)]
+        route = Route("", points.copy(), LatLongShippingNetwork.compute_route_length(points), ("Suez",))
+        precomputed_routes_file = tmp_path / "precomputed_routes.pickle"
+        with open(precomputed_routes_file, "wb") as f:
+            pickle.dump({"AB": [route]}, f)
+        network = LatLongShippingNetwork(ports=ports, precomputed_routes_file=precomputed_routes_file)
+        stored_route = network.get_all_stored_routes_between_points(ports[0], ports[1])[0]
+        reversed_routes = network.get_all_stored_routes_between_points(ports[1], ports[0])
+        assert isinstance(reversed_routes[0], ReversedRoute)
+        assert reversed_routes is network.get_all_stored_routes_between_points(ports[1], ports[0])
+        assert reversed_routes == [Route("", list(reversed(points)), route.length, ["Suez"])]
+        assert stored_route.route == points
+        assert reversed_routes[0].reversed() is stored_route
+        assert reversed_routes[0].route[0] == points[-1]
+        assert reversed_routes[0].route[-1] == points[0]
+        assert reversed_routes[0].route[1:3] == [points[2], points[1]]
+        cumulative_lengths = reversed_routes[0].cumulative_lengths
+        assert cumulative_lengths[0] == 0
+        assert cumulative_lengths[-1] == route.length
+        assert cumulative_lengths == sorted(cumulative_lengths)
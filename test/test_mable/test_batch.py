@@ -0,0 +1,62 @@
+"""
+Tests for the batch module.
+"""
+
+import json
+
+import pytest
+
+from mable.batch import BatchRunner, RunSpecification, expand_grid, COMPLETION_MARKER_FILE
+
+
+GRID = {
+    "seeds": [0, 1, 2],
+    "num_auctions": [2, 4],
+    "company_sets": [
+        {"name": "duopoly", "companies": [
+            {"class": "mable.examples.companies.MyArchEnemy", "name": "Arch Enemy Ltd.",
+             "fleet": {"num_suezmax": 1}, "kwargs": {"profit_factor": 1.5}},
+            {"class": "mable.examples.companies.TheScheduler", "name": "The Scheduler LP",
+             "fleet": {"num_vlcc": 1}}]}]
+}
+
+
+def write_metrics(run_specification, run_directory, factor=1):
+    if run_specification.seed < 0:
+        raise RuntimeError("Negative seed.")
+    with open(run_directory / "metrics.json", "w") as metrics_file:
+        json.dump({"value": run_specification.seed * factor}, metrics_file)
+
+
+class TestBatch:
+
+    def test_expand_grid(self):
+        run_specifications = expand_grid(GRID)
+        assert len(run_specifications) == 6
+        assert {(r.seed, r.num_auctions) for r in run_specifications} == {(s, a) for s in [0, 1, 2] for a in [2, 4]}
+        assert all(r.trades_per_occurrence == 1 for r in run_specifications)
+        assert len({r.run_id for r in run_specifications}) == 6
+        assert expand_grid(GRID)[0].run_id == run_specifications[0].run_id
+        with pytest.raises(ValueError):
+            expand_grid({"seeds": [0]})
+
+    def test_run_and_resume(self, tmp_path):
+        run_specifications = expand_grid(GRID)
+        failing_run = RunSpecification(
+            seed=-1, trades_per_occurrence=1, num_auctions=2, trade_occurrence_frequency=30,
+            company_set=GRID["company_sets"][0])
+        runner = BatchRunner(run_specifications[:4] + [failing_run], tmp_path, max_workers=2,
+                             run_function=write_metrics, factor=2)
+        run_status = runner.run()
+        assert [run_status[r.run_id] for r in run_specifications[:4]] == ["completed"] * 4
+        assert run_status[failing_run.run_id] == "failed"
+        assert not runner.is_completed(failing_run)
+        with open(runner.get_run_directory(run_specifications[1]) / "metrics.json") as metrics_file:
+            assert json.load(metrics_file)["value"] == run_specifications[1].seed * 2
+        with open(runner.get_run_directory(run_specifications[1]) / COMPLETION_MARKER_FILE) as marker_file:
+            assert json.load(marker_file)["run_id"] == run_specifications[1].run_id
+        runner = BatchRunner(run_specifications, tmp_path, max_workers=2, run_function=write_metrics)
+        run_status = runner.run()
+        assert [run_status[r.run_id] for r in run_specifications] == ["skipped"] * 4 + ["completed"] * 2
+        run_status = runner.run(resume=False)
+        assert set(run_status.values()) == {"completed"}
@@ -3,7 +3,10 @@ Tests for engine module.
 """
 
 import mable.engine as sim_engine
-from mable.event_management import EventObserver, Event
+from mable.competition.generation import AuctionCargoEvent
+from mable.event_management import EventObserver, Event, CargoEvent
+
+from test_mable.test_snapshot import build_auction_simulation, get_outcome
 
 
 class DummyObserver(EventObserver):
@@ -29,3 +32,60 @@ class TestSimulationEngine:
         assert test_observer.observations[0][0].time == 1
         assert test_observer.observations[0][0].info == "A"
         assert test_observer.observations[0][1] == "B"
+
+    def test_observer_event_types(self):
+
+        class CargoObserver(DummyObserver):
+            OBSERVED_EVENT_TYPES = (CargoEvent,)
+
+        test_engine = sim_engine.SimulationEngine(None, None, None, None, None)
+        all_events_observer = DummyObserver()
+        cargo_observer = CargoObserver()
+        test_engine.register_event_observer(all_events_observer)
+        test_engine.register_event_observer(cargo_observer)
+        test_engine.notify_event_observer(Event(1, "A"), "B")
+        test_engine.notify_event_observer(AuctionCargoEvent(2), "C")
+        assert [data for _, data in all_events_observer.observations] == ["B", "C"]
+        assert [data for _, data in cargo_observer.observations] == ["C"]
+        test_engine.unregister_event_observer(all_events_observer)
+        test_engine.notify_event_observer(CargoEvent(3), "D")
+        assert [data for _, data in all_events_observer.observations] == ["B", "C"]
+        assert [data for _, data in cargo_observer.observations] == ["C", "D"]
+
+    def test_step(self):
+        engine, metrics_observer = build_auction_simulation()
+        engine.run()
+        uninterrupted_outcome = get_outcome(engine, metrics_observer)
+        engine, metrics_observer = build_auction_simulation()
+        event, data = engine.step()
+        assert event is not None
+        processed_events = [event] + [one_event for one_event, _ in engine.events()]
+        assert engine.is_finished
+        assert engine.step() == (None, None)
+        assert len(processed_events) == len({id(one_event) for one_event in processed_events})
+        assert get_outcome(engine, metrics_observer) == uninterrupted_outcome
+
+    def test_run_until(self):
+        engine, metrics_observer = build_auction_simulation()
+        engine.run()
+        uninterrupted_outcome = get_outcome(engine, metrics_observer)
+        engine, metrics_observer = build_auction_simulation()
+        assert engine.run_until(35) > 0
+        assert engine.world.current_time <= 35
+        assert engine.event_queue.peek().time > 35
+        assert not engine.is_finished
+        engine.run_until(float("inf"))
+        assert engine.is_finished
+        assert get_outcome(engine, metrics_observer) == uninterrupted_outcome
+
+    def test_run_until_next_auction(self):
+        engine, _ = build_auction_simulation()
+        auction_times = []
+        event, data = engine.run_until_next_auction()
+        while event is not None:
+            assert isinstance(event, AuctionCargoEvent)
+            assert engine.world.current_time == event.time
+            auction_times.append(event.time)
+            event, data = engine.run_until_next_auction()
+        assert auction_times == [30, 60]
+        assert engine.is_finished
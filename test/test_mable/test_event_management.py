@@ -2,7 +2,12 @@
 Tests for management module.
 """
 
+import queue
+
+import pytest
+
 import mable.event_management as em
+from mable.simulation_generation import ClassFactory
 
 
 class TestEventQueue:
@@ -24,3 +29,149 @@ class TestEventQueue:
         return_event_3 = events.get()
         assert return_event_3.time == 5
         assert return_event_3.info == "Unload"
+
+    def test_queue_without_locking(self):
+        events = em.EventQueue(thread_safe=False)
+        assert events.empty()
+        assert events.pop() is None
+        with pytest.raises(queue.Empty):
+            events.get()
+        event_1 = em.Event(1, "Load")
+        event_2 = em.Event(5, "Unload")
+        event_3 = em.Event(3, "New Cargo")
+        for one_event in [event_1, event_2, event_3]:
+            events.put(one_event)
+        assert not events.empty()
+        assert events.qsize() == 3
+        assert events.get() is event_1
+        assert events.pop() is event_3
+        assert events.pop() is event_2
+        assert events.empty()
+
+
+class IndexedClassFactory(ClassFactory):
+
+    INDEXED_EVENT_QUEUE = True
+
+
+class TestClassFactoryEventQueue:
+
+    def test_default(self):
+        events = ClassFactory().generate_event_queue()
+        assert type(events) is em.EventQueue
+        assert not events.thread_safe
+
+    @pytest.mark.parametrize("class_factory, kwargs", [
+        (ClassFactory(), {"indexed": True}),
+        (IndexedClassFactory(), {}),
+        (IndexedClassFactory(), {"indexed": True})
+    ])
+    def test_indexed(self, class_factory, kwargs):
+        events = class_factory.generate_event_queue(**kwargs)
+        assert isinstance(events, em.IndexedEventQueue)
+        assert not events.thread_safe
+        events.put(em.Event(2, "B"))
+        events.put(em.Event(1, "A"))
+        assert events.pop().info == "A"
+
+    def test_indexed_overridden(self):
+        events = IndexedClassFactory().generate_event_queue(indexed=False, thread_safe=True)
+        assert type(events) is em.EventQueue
+        assert events.thread_safe
+
+
+class DummyVessel:
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestIndexedEventQueue:
+
+    @staticmethod
+    def get_queue(mocker):
+        mock_engine = mocker.MagicMock()
+        mock_engine.world.current_time = 0
+        events = em.IndexedEventQueue()
+        events.set_engine(mock_engine)
+        return events
+
+    def test_queue(self):
+        events = em.IndexedEventQueue()
+        event_1 = em.Event(1, "Load")
+        event_2 = em.Event(5, "Unload")
+        event_3 = em.Event(3, "New Cargo")
+        event_4 = em.Event(3, "Other Cargo")
+        for one_event in [event_1, event_2, event_3, event_4]:
+            events.put(one_event)
+        assert events.qsize() == 4
+        assert [events.get() for _ in range(4)] == [event_1, event_3, event_4, event_2]
+        assert events.empty()
+
+    def test_remove(self):
+        events = em.IndexedEventQueue()
+        event_1 = em.Event(1, "Load")
+        event_2 = em.Event(1, "Unload")
+        event_3 = em.Event(3, "New Cargo")
+        for one_event in [event_1, event_2, event_3]:
+            events.put(one_event)
+        events.remove(em.Event(1, "Unload"))
+        assert events.qsize() == 2
+        assert event_1 in events
+        assert event_2 not in events
+        assert events[em.Event(3, "New Cargo")] is event_3
+        assert [events.get(), events.get()] == [event_1, event_3]
+        assert events.empty()
+
+    def test_peek(self):
+        events = em.IndexedEventQueue()
+        assert events.peek() is None
+        event_1 = em.Event(1, "Load")
+        event_2 = em.Event(2, "Unload")
+        events.put(event_1)
+        events.put(event_2)
+        assert events.peek() is event_1
+        events.remove(event_1)
+        assert events.peek() is event_2
+        assert events.qsize() == 1
+        assert events.get() is event_2
+        assert events.peek() is None
+
+    def test_purge(self, mocker):
+        events = self.get_queue(mocker)
+        vessel_1 = DummyVessel("Vessel 1")
+        vessel_2 = DummyVessel("Vessel 2")
+        idle_1 = em.IdleEvent(2, vessel_1, "A")
+        idle_2 = em.IdleEvent(4, vessel_1, "B")
+        idle_3 = em.IdleEvent(3, vessel_2, "A")
+        cargo_event = em.Event(1, "New Cargo")
+        for one_event in [idle_1, idle_2, idle_3, cargo_event]:
+            events.put(one_event)
+        events.purge(vessel_1)
+        assert events.qsize() == 2
+        assert idle_1 not in events
+        assert idle_2 not in events
+        assert [one_item.event for one_item in events] == [cargo_event, idle_3]
+        assert events.get() is cargo_event
+        assert events.get() is idle_3
+        assert events.empty()
+
+
+class TestEvents:
+
+    def test_lazy_info(self, mocker):
+        vessel = DummyVessel("Vessel 1")
+        vessel._engine = mocker.Mock()
+        vessel._engine.find_company_for_vessel.return_value.name = "Company 1"
+        location = mocker.Mock()
+        location.name = "A"
+        location_event = em.VesselLocationInformationEvent(1, vessel, location)
+        idle_event = em.IdleEvent(2, vessel, "A")
+        assert not hasattr(location_event, "__dict__")
+        assert not hasattr(idle_event, "__dict__")
+        vessel._engine.find_company_for_vessel.assert_not_called()
+        assert location_event.info == "Company 1's Vessel 1 in A"
+        assert idle_event.info == "A idling (Vessel [name: Vessel 1])"
+        assert "A idling" in repr(idle_event)
+        idle_event.info = "Waiting"
+        assert idle_event.info == "Waiting"
@@ -0,0 +1,62 @@
+"""
+Tests for the ownership module.
+"""
+
+import pytest
+
+from mable.metrics import MetricsCollector
+from mable.ownership import OwnershipRegistry
+
+from test_mable.test_snapshot import build_auction_simulation
+
+
+class TestOwnershipRegistry:
+
+    def test_engine_lookups(self):
+        engine, _ = build_auction_simulation(number_companies=2, number_vessels=2)
+        company_1, company_2 = engine.shipping_companies
+        vessel = company_2.fleet[1]
+        assert engine.find_company_for_vessel(vessel) is company_2
+        assert engine.ownership.get_company_id(company_2) == 1
+        assert engine.ownership.get_company_id_for_vessel(vessel) == 1
+        assert engine.ownership.get_vessel(engine.ownership.get_vessel_id(vessel)) is vessel
+        company_2.remove_vessel(vessel)
+        assert vessel not in engine.ownership
+        with pytest.raises(ValueError):
+            engine.find_company_for_vessel(vessel)
+        company_1.add_vessel(vessel)
+        assert engine.find_company_for_vessel(vessel) is company_1
+        assert vessel._engine is engine
+
+    def test_vessel_added_to_fleet_directly(self):
+        engine, _ = build_auction_simulation(number_companies=2, number_vessels=2)
+        company_1, company_2 = engine.shipping_companies
+        vessel = company_2.fleet[1]
+        company_2.remove_vessel(vessel)
+        company_1.fleet.append(vessel)
+        assert vessel not in engine.ownership
+        assert engine.find_company_for_vessel(vessel) is company_1
+        assert engine.ownership.get_company_id_for_vessel(vessel) == 0
+
+    def test_metrics_use_registry_ids(self):
+        engine, _ = build_auction_simulation(number_companies=2, number_vessels=2)
+        metrics = MetricsCollector()
+        metrics.set_engine(engine)
+        for one_company in reversed(engine.shipping_companies):
+            for one_vessel in reversed(one_company.fleet):
+                vessel_key = metrics.get_vessel_id(one_vessel)
+                assert vessel_key.company_id == engine.ownership.get_company_id(one_company)
+                assert vessel_key.vessel_id == engine.ownership.get_vessel_id(one_vessel)
+            assert metrics.get_company_id(one_company) == engine.ownership.get_company_id(one_company)
+
+    def test_register_company_updates_fleet(self, mocker):
+        vessels = [mocker.Mock(), mocker.Mock(), mocker.Mock()]
+        company = mocker.Mock(fleet=vessels[:2])
+        registry = OwnershipRegistry([company])
+        assert [registry.get_vessel_id(v) for v in vessels[:2]] == [0, 1]
+        company.fleet = vessels[1:]
+        assert registry.register_company(company) == 0
+        assert vessels[0] not in registry
+        assert registry.get_vessel_id(vessels[1]) == 1
+        assert registry.get_vessel_id(vessels[2]) == 2
+        assert registry.find_company_for_vessel(vessels[2]) is company
@@ -0,0 +1,79 @@
+"""
+Tests for the profiling module.
+"""
+
+import json
+
+import mable.engine as sim_engine
+from mable.event_management import EventObserver, Event
+from mable.examples import environment
+from mable.observers import MetricsObserver
+from mable.profiling import EngineProfiler
+
+
+class DummyObserver(EventObserver):
+
+    def notify(self, engine, event, data):
+        pass
+
+
+class TestEngineProfiler:
+
+    def test_nested_phases(self):
+        profiler = EngineProfiler()
+        for _ in range(2):
+            with profiler.phase("outer"):
+                with profiler.phase("inner"):
+                    pass
+        outer = profiler.phases[("outer",)]
+        inner = profiler.phases[("outer", "inner")]
+        assert outer.calls == 2
+        assert inner.calls == 2
+        assert inner.total_time <= outer.total_time
+        assert abs(outer.self_time + inner.total_time - outer.total_time) < 1e-9
+
+    def test_export(self, tmp_path):
+        profiler = EngineProfiler()
+        with profiler.phase("outer"):
+            with profiler.phase("inner"):
+                sum(range(10000))
+        profiler.export_json(tmp_path / "profile.json")
+        profiler.export_collapsed_stacks(tmp_path / "profile.folded")
+        with open(tmp_path / "profile.json") as profile_file:
+            profile = json.load(profile_file)
+        assert [one_phase["stack"] for one_phase in profile["phases"]] == [["outer"], ["outer", "inner"]]
+        with open(tmp_path / "profile.folded") as profile_file:
+            lines = profile_file.read().splitlines()
+        assert any(one_line.startswith("outer;inner ") for one_line in lines)
+        assert all(int(one_line.rsplit(" ", 1)[1]) > 0 for one_line in lines)
+
+    def test_engine_notify(self):
+        test_engine = sim_engine.SimulationEngine(None, None, None, None, None, profile=True)
+        test_engine.register_event_observer(DummyObserver())
+        test_engine.notify_event_observer(Event(1, "A"), None)
+        test_engine.notify_event_observer(Event(2, "B"), None)
+        assert test_engine.profiler.phases[("notify_event_observer", "DummyObserver.notify")].calls == 2
+
+    def test_engine_export_after_post_run(self, tmp_path):
+        test_engine = sim_engine.SimulationEngine(None, [], None, None, None,
+                                                  post_run_cmds=[environment._export_stats],
+                                                  output_directory=tmp_path, info={"run": 1},
+                                                  profile=True, export_profile=True)
+        test_engine.register_event_observer(MetricsObserver())
+        test_engine._post_run()
+        metrics_files = list(tmp_path.glob("metrics_competition_*.json"))
+        assert len(metrics_files) == 1
+        with open(metrics_files[0]) as metrics_file:
+            assert json.load(metrics_file)["info"] == {"run": 1}
+        json_files = list(tmp_path.glob("profile_*.json"))
+        assert len(json_files) == 1
+        assert len(list(tmp_path.glob("profile_*.folded"))) == 1
+        with open(json_files[0]) as profile_file:
+            profile = json.load(profile_file)
+        stacks = [one_phase["stack"] for one_phase in profile["phases"]]
+        assert ["post_run"] in stacks
+        assert ["post_run", "_export_stats"] in stacks
+
+    def test_engine_default(self):
+        test_engine = sim_engine.SimulationEngine(None, None, None, None, None)
+        assert test_engine.profiler is None
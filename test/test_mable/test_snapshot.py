@@ -0,0 +1,115 @@
+"""
+Tests for the snapshot module.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from mable.cargo_bidding import TradingCompany
+from mable.competition.generation import AuctionClassFactory, AuctionSimulationEngine
+from mable.event_management import EventQueue, IndexedEventQueue
+from mable.extensions.fuel_emissions import VesselWithEngine, VesselEngine, Fuel, ConsumptionRate
+from mable.observers import AuctionMetricsObserver, AuctionOutcomeObserver, TradeDeliveryObserver, CheckpointObserver
+from mable.shipping_market import TimeWindowTrade, AuctionMarket, StaticShipping
+from mable.simulation_environment import World
+from mable.simulation_space.structure import UnitShippingNetwork
+from mable.simulation_space.universe import Port
+from mable.snapshot import EngineSnapshot
+from mable.transport_operation import CargoCapacity
+from mable.util import JsonAbleEncoder
+
+
+def build_auction_simulation(event_queue_class=EventQueue, number_companies=2, number_vessels=2):
+    """
+    Build a small auction simulation on a unit network with fixed trades.
+
+    :return: The engine and its metrics observer.
+    :rtype: tuple[AuctionSimulationEngine, AuctionMetricsObserver]
+    """
+    ports = [Port("A", 0, 0), Port("B", 0.5, 0), Port("C", 1, 1), Port("D", 0, 1)]
+    network = UnitShippingNetwork(ports)
+    world = World(network, event_queue_class(thread_safe=False), np.random.RandomState(0))
+    fuel = Fuel(name="MFO", price=1, energy_coefficient=40, co2_coefficient=3.16)
+    consumption_rate = ConsumptionRate(base=0.5, speed_power=2, factor=1 / 24)
+    companies = []
+    for company_index in range(number_companies):
+        fleet = [
+            VesselWithEngine(
+                [CargoCapacity(cargo_type="Oil", capacity=100, loading_rate=50)],
+                ports[vessel_index % len(ports)], 0.1,
+                VesselEngine(fuel, 0.3, consumption_rate, consumption_rate, 0.6, 5.6),
+                name=f"Vessel {company_index}-{vessel_index}")
+            for vessel_index in range(number_vessels)]
+        companies.append(TradingCompany(fleet, f"Company {company_index}"))
+    trades = []
+    random = np.random.RandomState(1)
+    for trade_time in [0, 30, 60]:
+        for _ in range(3):
+            origin, destination = random.choice(len(ports), 2, replace=False)
+            trades.append(TimeWindowTrade(
+                origin_port=ports[origin], destination_port=ports[destination], amount=50, cargo_type="Oil",
+                time=trade_time, time_window=[trade_time, trade_time + 40, None, trade_time + 80]))
+    shipping = StaticShipping(fixed_trades=[], world=world, class_factory=AuctionClassFactory())
+    shipping.add_to_all_trades(trades)
+    market = AuctionMarket()
+    engine = AuctionSimulationEngine(world, companies, shipping, market, AuctionClassFactory(), global_agent_timeout=10)
+    for one_unit in [world, shipping, market] + companies:
+        one_unit.set_engine(engine)
+    for one_company in companies:
+        one_company.headquarters = engine.headquarters
+    metrics_observer = AuctionMetricsObserver()
+    metrics_observer.metrics.set_engine(engine)
+    engine.register_event_observer(metrics_observer)
+    engine.register_event_observer(AuctionOutcomeObserver())
+    engine.register_event_observer(TradeDeliveryObserver())
+    return engine, metrics_observer
+
+
+def get_outcome(engine, metrics_observer):
+    contracts = {one_company.name: [(c.trade.origin_port.name, c.trade.destination_port.name, c.fulfilled)
+                                    for c in one_company_contracts]
+                 for one_company, one_company_contracts in engine.market_authority.contracts_per_company.items()}
+    metrics = json.dumps(metrics_observer.metrics.to_json(), cls=JsonAbleEncoder, sort_keys=True)
+    journey_logs = [[repr(one_event) for one_event in one_vessel.journey_log]
+                    for one_company in engine.shipping_companies for one_vessel in one_company.fleet]
+    return engine.world.current_time, contracts, metrics, journey_logs
+
+
+class TestEngineSnapshot:
+
+    @pytest.mark.parametrize("event_queue_class", [EventQueue, IndexedEventQueue])
+    def test_restore_continues_run(self, event_queue_class):
+        engine, metrics_observer = build_auction_simulation(event_queue_class)
+        engine.run()
+        uninterrupted_outcome = get_outcome(engine, metrics_observer)
+        engine, metrics_observer = build_auction_simulation(event_queue_class)
+        checkpoint_observer = CheckpointObserver(40)
+        engine.register_event_observer(checkpoint_observer)
+        engine.run()
+        snapshot = EngineSnapshot.from_bytes(checkpoint_observer.last_snapshot.to_bytes())
+        assert 0 < snapshot.time < uninterrupted_outcome[0]
+        restored_engine, restored_metrics_observer = build_auction_simulation(event_queue_class)
+        restored_engine.register_event_observer(CheckpointObserver(40))
+        restored_engine.restore(snapshot)
+        assert restored_engine.world.current_time == snapshot.time
+        restored_engine.run()
+        assert get_outcome(restored_engine, restored_metrics_observer) == uninterrupted_outcome
+
+    def test_save_load(self, tmp_path):
+        engine, _ = build_auction_simulation()
+        snapshot = engine.snapshot()
+        snapshot.save(tmp_path / "snapshot.mable")
+        loaded_snapshot = EngineSnapshot.load(tmp_path / "snapshot.mable")
+        assert loaded_snapshot.time == snapshot.time
+        assert loaded_snapshot.to_bytes() == snapshot.to_bytes()
+
+    def test_invalid_snapshot(self):
+        with pytest.raises(ValueError):
+            EngineSnapshot.from_bytes(b"no snapshot")
+        engine, _ = build_auction_simulation()
+        snapshot = engine.snapshot()
+        other_engine, _ = build_auction_simulation(number_vessels=3)
+        with pytest.raises(ValueError):
+            other_engine.restore(snapshot)
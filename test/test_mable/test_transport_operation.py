@@ -1,11 +1,16 @@
+import copy
+from types import SimpleNamespace
+
 import numpy as np
+import pytest
 
+from mable.engine import pre_run_start_proposal_workers, post_run_stop_proposal_workers
 from mable.event_management import TravelEvent, CargoTransferEvent
 from mable.shipping_market import TimeWindowTrade
 from mable.simulation_space.universe import Port
 from mable.transport_operation import SimpleCompany
 from mable.transportation_scheduling import Schedule
-from test_mable.test_transportation_scheduling import VESSEL
+from test_mable.test_transportation_scheduling import VESSEL, DummyEngine, DummyWorld, DummyClassFactory
 
 
 class TestSimpleCompany:
@@ -36,3 +41,113 @@ class TestSimpleCompany:
         un_loading = 2 + 2
         travel_to_c = 7 + 6
         assert arrival_time == travel_to_a + travel_to_b + un_loading + travel_to_c
+
+    @staticmethod
+    def _make_parallel_company(locations):
+        distances = {("A", "B"): 10, ("A", "C"): 5, ("B", "C"): 8, ("C", "D"): 12, ("A", "D"): 20, ("B", "D"): 4}
+        fleet = []
+        for one_location in locations:
+            vessel = copy.deepcopy(VESSEL)
+            vessel.location = one_location
+            fleet.append(vessel)
+        company = SimpleCompany(fleet, "Test")
+        company.set_engine(DummyEngine(DummyWorld(distances), DummyClassFactory()))
+        return company
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_propose_schedules_parallel(self, max_workers, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 2)
+        company = self._make_parallel_company(["A", "B", "D"])
+        fleet = company.fleet
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=10, cargo_type="Oil"),
+                  TimeWindowTrade(origin_port="D", destination_port="C", amount=10, cargo_type="Oil"),
+                  TimeWindowTrade(origin_port="C", destination_port="A", amount=10, cargo_type="Oil",
+                                  time_window=[None, 1, None, None]),
+                  TimeWindowTrade(origin_port="B", destination_port="D", amount=10, cargo_type="Oil")]
+        company.start_proposal_workers(max_workers)
+        try:
+            assert (company._proposal_workers is None) == (max_workers == 1)
+            proposal = company.propose_schedules_parallel(trades)
+            assert proposal.scheduled_trades == [trades[0], trades[1], trades[3]]
+            assert {fleet.index(one_vessel): one_schedule.get_scheduled_trades()
+                    for one_vessel, one_schedule in proposal.schedules.items()} == {
+                0: [trades[0]], 1: [trades[3]], 2: [trades[1]]}
+            assert all(len(one_vessel.schedule) == 0 for one_vessel in fleet)
+            assert company.propose_schedules_parallel(trades, time_limit=0).scheduled_trades == []
+            assert company.propose_schedules_parallel(trades).scheduled_trades == proposal.scheduled_trades
+        finally:
+            company.stop_proposal_workers()
+
+    def test_propose_schedules_parallel_matches_one_process(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 2)
+        company = self._make_parallel_company(["A", "B", "C"])
+        ports = ["A", "B", "C", "D"]
+        trades = [TimeWindowTrade(origin_port=ports[i % 4], destination_port=ports[(3 * i + 1) % 4], amount=10,
+                                  cargo_type="Oil", time_window=[None, None, None, 20 + 15 * i])
+                  for i in range(12)]
+        company.fleet[0]._schedule = company.propose_schedules_parallel(trades[:1]).schedules[company.fleet[0]]
+        company.start_proposal_workers()
+        try:
+            proposals = [company.propose_schedules_parallel(trades)]
+            company._proposal_workers.fits = lambda fleet: False
+            proposals.append(company.propose_schedules_parallel(trades))
+        finally:
+            company.stop_proposal_workers()
+        proposals.append(company.propose_schedules_parallel(trades))
+        assert len(proposals[0].scheduled_trades) > len(company.fleet)
+        for one_proposal in proposals[1:]:
+            assert one_proposal.scheduled_trades == proposals[0].scheduled_trades
+            assert one_proposal.schedules.keys() == proposals[0].schedules.keys()
+            for one_vessel in one_proposal.schedules:
+                assert (one_proposal.schedules[one_vessel].get_simple_schedule()
+                        == proposals[0].schedules[one_vessel].get_simple_schedule())
+
+    def test_propose_schedules_parallel_objective(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 2)
+        company = self._make_parallel_company(["A", "B", "D"])
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=10, cargo_type="Oil"),
+                  TimeWindowTrade(origin_port="D", destination_port="C", amount=10, cargo_type="Oil")]
+        company.start_proposal_workers()
+        try:
+            proposals = [company.propose_schedules_parallel(trades, objective=objective)
+                         for objective in [_latest_pick_up, lambda insertion: - insertion.location_pick_up]]
+        finally:
+            company.stop_proposal_workers()
+        assert proposals[0].scheduled_trades == proposals[1].scheduled_trades == trades
+        assert ({one_vessel: one_schedule.get_simple_schedule()
+                 for one_vessel, one_schedule in proposals[0].schedules.items()}
+                == {one_vessel: one_schedule.get_simple_schedule()
+                    for one_vessel, one_schedule in proposals[1].schedules.items()})
+
+    def test_propose_schedules_parallel_worker_failure(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 2)
+        company = self._make_parallel_company(["A", "B"])
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=10, cargo_type="Oil")]
+        company.start_proposal_workers()
+        try:
+            with pytest.raises(RuntimeError, match="ValueError"):
+                company.propose_schedules_parallel(trades, objective=_failing_objective)
+            assert company.propose_schedules_parallel(trades).scheduled_trades == trades
+        finally:
+            company.stop_proposal_workers()
+
+    def test_start_proposal_workers_before_run(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 2)
+        company = self._make_parallel_company(["A", "B"])
+        company.PARALLEL_PROPOSAL_WORKERS = 2
+        engine = SimpleNamespace(shipping_companies=[company, SimpleCompany([], "Serial")])
+        pre_run_start_proposal_workers(engine)
+        try:
+            assert company._proposal_workers.number_workers == 2
+            assert engine.shipping_companies[1]._proposal_workers is None
+        finally:
+            post_run_stop_proposal_workers(engine)
+        assert company._proposal_workers is None
+
+
+def _latest_pick_up(insertion):
+    return - insertion.location_pick_up
+
+
+def _failing_objective(insertion):
+    raise ValueError("No objective")
@@ -13,8 +13,8 @@ from mable.event_management import ArrivalEvent, CargoTransferEvent, IdleEvent,
 from mable.simulation_environment import World
 from mable.extensions.cargo_distributions import TimeWindowTrade
 from mable.extensions.fuel_emissions import VesselWithEngine, VesselEngine, Fuel, ConsumptionRate
-from mable.transportation_scheduling import (Schedule, TransportationStartFinishIndicator,
-                                             TransportationSourceDestinationIndicator)
+from mable.transportation_scheduling import (Schedule, ScheduleTimeBounds, TransportationStartFinishIndicator,
+                                             TransportationSourceDestinationIndicator, check_cargo_loads)
 from mable.transport_operation import CargoCapacity, ShippingCompany
 
 FUEL_MFO = Fuel(name="MFO", price=430, energy_coefficient=40, co2_coefficient=3.16)
@@ -116,34 +116,6 @@ class TestSchedule:
         assert -10 in distance_matrix
         assert np.inf in distance_matrix
 
-    def test_shift_task_push(self):
-        schedule = Schedule(VESSEL)
-        schedule.set_engine(DummyEngine(DummyWorld()))
-        schedule.add_transportation(DUMMY_TRADE, 1)
-        schedule._shift_task_push(1)
-        schedule._shift_task_push(3)
-        for i in [2, 4]:
-            assert (i, TransportationSourceDestinationIndicator.PICK_UP) in schedule._stn
-            assert (i, TransportationSourceDestinationIndicator.DROP_OFF) in schedule._stn
-        schedule._shift_task_push(4, False)
-        schedule._shift_task_push(3, False)
-        for i in [1, 2]:
-            assert (i, TransportationSourceDestinationIndicator.PICK_UP) in schedule._stn
-            assert (i, TransportationSourceDestinationIndicator.DROP_OFF) in schedule._stn
-
-    def test_shift_task_pull(self):
-        schedule = Schedule(VESSEL)
-        schedule.set_engine(DummyEngine(DummyWorld()))
-        schedule.add_transportation(DUMMY_TRADE, 1)
-        schedule._shift_task_pull(2)
-        for i in [2, 3]:
-            assert (i, TransportationSourceDestinationIndicator.PICK_UP) in schedule._stn
-            assert (i, TransportationSourceDestinationIndicator.DROP_OFF) in schedule._stn
-        schedule._shift_task_pull(2, False)
-        for i in [1, 2]:
-            assert (i, TransportationSourceDestinationIndicator.PICK_UP) in schedule._stn
-            assert (i, TransportationSourceDestinationIndicator.DROP_OFF) in schedule._stn
-
     def test_number_tasks(self):
         schedule = Schedule(VESSEL)
         schedule.set_engine(DummyEngine(DummyWorld(), DummyClassFactory()))
@@ -238,6 +210,35 @@ class TestSchedule:
         schedule_invalid_5._add_task(2, trade_8, TransportationSourceDestinationIndicator.PICK_UP, 0)
         assert schedule_invalid_5.verify_schedule() is False
 
+    def test_get_time_bounds(self):
+        trade = TimeWindowTrade(origin_port="A", destination_port="B", amount=10, cargo_type="Oil",
+                                time_window=[None, None, None, 20])
+        vessel = copy.deepcopy(VESSEL)
+        vessel.location = "A"
+        schedule = Schedule(vessel)
+        schedule.set_engine(DummyEngine(DummyWorld({("A", "B"): 10})))
+        schedule.add_transportation(trade, 1)
+        assert schedule.get_time_bounds() == {
+            (1, TransportationStartFinishIndicator.START): (0, 8),
+            (1, TransportationStartFinishIndicator.FINISH): (2, 10),
+            (2, TransportationStartFinishIndicator.START): (12, 20),
+            (2, TransportationStartFinishIndicator.FINISH): (14, 22),
+        }
+        schedule.add_transportation(trade, 3)
+        assert schedule.verify_schedule_time() is False
+        with pytest.raises(ValueError):
+            schedule.get_time_bounds()
+
+    def test_verify_long_schedule(self):
+        schedule = Schedule(VESSEL)
+        schedule.set_engine(DummyEngine(DummyWorld({("A", "B"): 10})))
+        for _ in range(25):
+            schedule.add_transportation(DUMMY_TRADE)
+        assert schedule.verify_schedule_time() is True
+        schedule.add_transportation(TimeWindowTrade(origin_port="A", destination_port="B", amount=10,
+                                                    cargo_type="Oil", time_window=[None, None, None, 20]))
+        assert schedule.verify_schedule_time() is False
+
     @staticmethod
     def get_pop_setup(setting):
         distances = {
@@ -269,15 +270,13 @@ class TestSchedule:
         schedule = Schedule(VESSEL)
         schedule.set_engine(DummyEngine(DummyWorld()))
         schedule.add_transportation(DUMMY_TRADE, 1)
-        assert len(schedule._stn) == 5
-        for i, location_type in zip(
-                [1, 2],
-                [TransportationSourceDestinationIndicator.PICK_UP, TransportationSourceDestinationIndicator.DROP_OFF]
-        ):
-            assert schedule._stn.nodes[(i, TransportationStartFinishIndicator.START)]["location_type"] == location_type
-            assert schedule._stn.nodes[(i, TransportationStartFinishIndicator.START)]["trade"] is DUMMY_TRADE
-            assert schedule._stn.nodes[(i, TransportationStartFinishIndicator.FINISH)]["location_type"] == location_type
-            assert schedule._stn.nodes[(i, TransportationStartFinishIndicator.FINISH)]["trade"] is DUMMY_TRADE
+        assert schedule._get_task_nodes() == [
+            (i, start_finish)
+            for i in [1, 2]
+            for start_finish in [TransportationStartFinishIndicator.START, TransportationStartFinishIndicator.FINISH]]
+        assert schedule._core.location_types == [
+            TransportationSourceDestinationIndicator.PICK_UP, TransportationSourceDestinationIndicator.DROP_OFF]
+        assert all(one_trade is DUMMY_TRADE for one_trade in schedule._core.trades)
 
     # TODO test schedule length with waiting times has_time_window_constraints = True
     @pytest.mark.parametrize("setting", [
@@ -444,7 +443,7 @@ class TestSchedule:
         assert schedule.completion_time() == time
         assert isinstance(event, ArrivalEvent)
         assert event.time == 0
-        assert (1, TransportationStartFinishIndicator.START) not in schedule._stn.nodes
+        assert (1, TransportationStartFinishIndicator.START) not in schedule._get_task_nodes()
         with pytest.raises(ValueError):
             schedule.add_transportation(trade_4, 1)
         schedule.add_transportation(trade_4, 5)
@@ -470,7 +469,7 @@ class TestSchedule:
             ("PICK_UP", trade_4),
             ("DROP_OFF", trade_4),
         ]
-        task_indices = list(set([n[0] for n in schedule._stn.nodes if isinstance(n, tuple)]))
+        task_indices = sorted(set(n[0] for n in schedule._get_task_nodes()))
         assert task_indices == list(range(1, 6))
         schedule.add_transportation(trade_3, 4)
         time += - 20 + 10 + 10 + 2 + 2
@@ -559,7 +558,7 @@ class TestSchedule:
         assert schedule.completion_time() == time
         assert isinstance(event, ArrivalEvent)
         assert event.time == 0 + additional_time
-        assert (1, TransportationStartFinishIndicator.START) not in schedule._stn.nodes
+        assert (1, TransportationStartFinishIndicator.START) not in schedule._get_task_nodes()
         with pytest.raises(ValueError):
             schedule.add_transportation(trade_4, 1)
         schedule.add_transportation(trade_4, 5)
@@ -570,7 +569,7 @@ class TestSchedule:
         assert schedule.completion_time() == time
         assert isinstance(event, CargoTransferEvent)
         assert event.time == 2 + additional_time
-        task_indices = list(set([n[0] for n in schedule._stn.nodes if isinstance(n, tuple)]))
+        task_indices = sorted(set(n[0] for n in schedule._get_task_nodes()))
         assert task_indices == list(range(1, 6))
         schedule.add_transportation(trade_3, 4)
         time += - 20 + 10 + 10 + 2 + 2
@@ -632,6 +631,110 @@ class TestSchedule:
         assert new_schedule_2.get_simple_schedule()[0][1] == trade_1
         assert new_schedule_2.get_simple_schedule()[-1][1] == trade_3
 
+    def test_copy_on_write(self):
+        no_time_windows = ([None] * 4, [None] * 4)
+        trade_1, trade_2, _, _, _, schedule = self.get_pop_setup(no_time_windows)
+        schedule.add_transportation(trade_1)
+        schedule_copy = schedule.copy()
+        assert schedule_copy._core is schedule._core
+        schedule_copy.add_transportation(trade_2)
+        assert schedule_copy._core is not schedule._core
+        assert schedule._number_tasks == 2
+        assert schedule_copy._number_tasks == 4
+        schedule_copy_2 = schedule.copy()
+        first_event = schedule.pop()
+        assert schedule_copy_2._core is not schedule._core
+        assert len(schedule_copy_2) == 4
+        assert schedule_copy_2.next().time == first_event.time
+        assert schedule_copy_2.completion_time() == schedule_copy_2.copy().completion_time()
+
+    def test_copy_on_write_discarded_copy(self):
+        no_time_windows = ([None] * 4, [None] * 4)
+        trade_1, trade_2, _, _, _, schedule = self.get_pop_setup(no_time_windows)
+        schedule.add_transportation(trade_1)
+        core = schedule._core
+        schedule_copy = schedule.copy()
+        assert core.number_schedules == 2
+        del schedule_copy
+        assert core.number_schedules == 1
+        schedule.copy().completion_time()
+        schedule.add_transportation(trade_2)
+        assert schedule._core is core
+        assert schedule._number_tasks == 4
+        schedule_copy = schedule.copy()
+        schedule_copy.add_transportation(trade_1)
+        assert core.number_schedules == 1
+        schedule.pop()
+        assert schedule._core is core
+        assert schedule_copy._number_tasks == 6
+
+    def test_from_plan(self):
+        pick_up = TransportationSourceDestinationIndicator.PICK_UP
+        drop_off = TransportationSourceDestinationIndicator.DROP_OFF
+        time_windows = ([None, None, None, 45], [None, 20, None, 60])
+        trade_1, trade_2, _, _, _, schedule = self.get_pop_setup(time_windows)
+        schedule.add_transportation(trade_1)
+        schedule.add_transportation(trade_2, 2, 2)
+        plan = [(trade_1, pick_up), (trade_2, pick_up), (trade_2, drop_off), (trade_1, drop_off)]
+        schedule_from_plan = Schedule.from_plan(schedule._vessel, plan, schedule._engine)
+        assert schedule_from_plan.get_simple_schedule() == schedule.get_simple_schedule()
+        assert schedule_from_plan.get_time_bounds() == schedule.get_time_bounds()
+        assert schedule_from_plan.completion_time() == schedule.completion_time()
+        schedule.add_transportation(trade_1, 5, 5)
+        assert schedule_from_plan.extend_plan([(trade_1, pick_up), (trade_1, drop_off)]) == schedule.verify_schedule()
+        assert schedule_from_plan.get_time_bounds() == schedule.get_time_bounds()
+        with pytest.raises(ValueError):
+            schedule_from_plan.extend_plan([(trade_2, drop_off), (trade_2, pick_up)])
+        with pytest.raises(ValueError):
+            schedule_from_plan.extend_plan([(trade_2, pick_up)])
+        assert len(schedule_from_plan) == 12
+
+    def test_event_cache(self):
+        no_time_windows = ([None] * 4, [None] * 4)
+        trade_1, trade_2, _, _, _, schedule = self.get_pop_setup(no_time_windows)
+        schedule.add_transportation(trade_1)
+        first_event = schedule.next()
+        last_event = schedule[-1]
+        assert schedule[0] is first_event
+        assert schedule[len(schedule) - 1] is last_event
+        assert schedule.copy().next() is not first_event
+        schedule.add_transportation(trade_2, 1, 2)
+        assert schedule[-1] is not last_event
+        assert schedule.next() is not first_event
+        assert schedule.next().location.destination == trade_2.origin_port
+        next_event = schedule.next()
+        assert schedule.pop() is next_event
+        assert schedule.next() is not next_event
+
+    @pytest.mark.parametrize("setting", [([None] * 4, [None] * 4),
+                                         ([None, None, None, 45], [None, None, None, None]),
+                                         ([30, None, None, None], [None, 20, None, 60])])
+    def test_feasible_insertions(self, setting):
+        trade_1, trade_2, trade_3, trade_4, _, schedule = self.get_pop_setup(setting)
+        schedule.add_transportation(trade_1)
+        schedule.add_transportation(trade_2)
+        schedule.pop()
+        expected_insertions = {}
+        for location_pick_up in schedule.get_insertion_points():
+            for location_drop_off in schedule.get_insertion_points():
+                if location_drop_off >= location_pick_up:
+                    new_schedule = schedule.copy()
+                    new_schedule.add_transportation(trade_3, location_pick_up, location_drop_off)
+                    if new_schedule.verify_schedule():
+                        expected_insertions[(location_pick_up, location_drop_off)] = new_schedule.completion_time()
+        insertions = schedule.feasible_insertions(trade_3)
+        assert len(insertions) > 0
+        assert {(i.location_pick_up, i.location_drop_off): i.completion_time
+                for i in insertions} == expected_insertions
+        assert [i.completion_time for i in insertions] == sorted(expected_insertions.values())
+        assert schedule.best_insertion(trade_3) == insertions[0]
+        latest_pick_up = schedule.best_insertion(trade_3, objective=lambda i: -i.pick_up_time)
+        assert latest_pick_up.pick_up_time == max(i.pick_up_time for i in insertions)
+        too_large_trade = TimeWindowTrade(origin_port="D", destination_port="E", amount=VESSEL.capacity("Oil") + 1,
+                                          cargo_type="Oil")
+        assert schedule.feasible_insertions(too_large_trade) == []
+        assert schedule.best_insertion(too_large_trade) is None
+
     def test_get_simple_schedule(self):
         no_time_windows = ([None]*4, [None]*4)
         trade_1, trade_2, _, _, _, schedule = self.get_pop_setup(no_time_windows)
@@ -650,3 +753,70 @@ class TestSchedule:
                     trade_1,
                     trade_1,
                     trade_2])
+
+
+def test_check_cargo_loads():
+    capacities = np.array([100, 50])
+    load_changes = np.array([
+        [[60, 0], [0, 50], [-60, 0], [0, -50]],
+        [[60, 0], [50, 0], [-110, 0], [0, 0]],
+        [[60, 0], [0, -10], [-60, 0], [0, 10]],
+        [[60, 0], [0, 20], [-60, 0], [0, 0]],
+    ])
+    assert check_cargo_loads(np.zeros(2), capacities, load_changes).tolist() == [True, False, False, False]
+    assert check_cargo_loads(np.array([0, 10]), capacities, load_changes).tolist() == [False, False, False, False]
+    assert check_cargo_loads(np.zeros(2), capacities, np.zeros((1, 0, 2))).tolist() == [True]
+
+
+def get_shortest_distances(distances):
+    """
+    Floyd-Warshall as reference for the bounds of the STN.
+    """
+    shortest_distances = np.array(distances, dtype=float)
+    np.fill_diagonal(shortest_distances, np.minimum(np.diagonal(shortest_distances), 0))
+    for k in range(shortest_distances.shape[0]):
+        np.minimum(shortest_distances,
+                   shortest_distances[:, k, np.newaxis] + shortest_distances[np.newaxis, k, :],
+                   out=shortest_distances)
+    return shortest_distances
+
+
+class TestScheduleTimeBounds:
+
+    def test_bounds(self):
+        time_bounds = ScheduleTimeBounds()
+        time_bounds.insert(0, 0, np.inf)
+        time_bounds.insert(1, 5, 20)
+        time_bounds.set_separation(0, 10)
+        assert time_bounds.earliest() == [0, 10]
+        assert time_bounds.latest() == [10, 20]
+        time_bounds.insert(1, 0, 12)
+        time_bounds.set_separation(0, 3)
+        time_bounds.set_separation(1, 4)
+        assert time_bounds.earliest() == [0, 3, 7]
+        assert time_bounds.latest() == [9, 12, 20]
+        assert time_bounds.is_consistent()
+        time_bounds.set_lower(0, 10)
+        assert time_bounds.earliest() == [10, 13, 17]
+        assert not time_bounds.is_consistent()
+        time_bounds.remove(0)
+        assert time_bounds.earliest() == [0, 5]
+        assert time_bounds.latest() == [12, 20]
+        assert time_bounds.is_consistent()
+
+    def test_schedule_bounds_match_shortest_distances(self):
+        distances = {("A", "B"): 10, ("B", "C"): 20, ("A", "C"): 5}
+        vessel = copy.deepcopy(VESSEL)
+        vessel.location = "A"
+        schedule = Schedule(vessel)
+        schedule.set_engine(DummyEngine(DummyWorld(distances)))
+        schedule.add_transportation(TimeWindowTrade(origin_port="A", destination_port="B", amount=10,
+                                                    cargo_type="Oil", time_window=[5, None, None, 60]), 1)
+        schedule.add_transportation(TimeWindowTrade(origin_port="C", destination_port="A", amount=10,
+                                                    cargo_type="Oil", time_window=[None, 40, None, None]), 2, 2)
+        stn_distances = schedule._get_distance_matrix()
+        stn_distances[np.isnan(stn_distances)] = np.inf
+        shortest_distances = get_shortest_distances(stn_distances)
+        time_bounds = schedule.get_time_bounds()
+        for i, one_node in enumerate(schedule._get_task_nodes(), start=1):
+            assert time_bounds[one_node] == (-shortest_distances[i, 0], shortest_distances[0, i])
@@ -0,0 +1,73 @@
+"""
+Tests for the what_if module.
+"""
+
+from mable.competition.generation import AuctionCargoEvent
+from mable.event_management import EventObserver
+from mable.what_if import Variant, fork_variants, collect_metrics
+
+from test_mable.test_snapshot import build_auction_simulation
+
+
+def build_engine():
+    engine, _ = build_auction_simulation()
+    return engine
+
+
+def build_forking_engine():
+    engine = build_engine()
+    engine.register_event_observer(ForkObserver())
+    return engine
+
+
+def cancel_last_auction_trades(engine):
+    engine.shipping._occurred_trades[60] = []
+
+
+def count_contracts(engine):
+    return sum(len(contracts) for contracts in engine.market_authority.contracts_per_company.values())
+
+
+def fail(engine):
+    raise RuntimeError("Variant failed.")
+
+
+class ForkObserver(EventObserver):
+
+    OBSERVED_EVENT_TYPES = (AuctionCargoEvent,)
+
+    def __init__(self):
+        self.results = None
+
+    def notify(self, engine, event, data):
+        if event.time == 30:
+            variants = [Variant(name="baseline"),
+                        Variant(name="no last auction", modification=cancel_last_auction_trades),
+                        Variant(name="failing", modification=fail)]
+            self.results = fork_variants(
+                engine, build_forking_engine, variants, max_workers=2, result_function=count_contracts)
+
+
+class TestForkVariants:
+
+    def test_variants(self):
+        engine = build_engine()
+        engine.run()
+        number_contracts_uninterrupted = count_contracts(engine)
+        engine = build_forking_engine()
+        engine.run()
+        fork_observer = engine.get_event_observers()[-1]
+        assert count_contracts(engine) == number_contracts_uninterrupted
+        baseline, no_last_auction, failing = fork_observer.results
+        assert baseline.name == "baseline"
+        assert baseline.result == number_contracts_uninterrupted
+        assert no_last_auction.result < number_contracts_uninterrupted
+        assert failing.result is None
+        assert "Variant failed." in failing.error
+
+    def test_collect_metrics(self):
+        engine, metrics_observer = build_auction_simulation()
+        engine.run()
+        metrics = collect_metrics(engine)
+        assert len(metrics) == 1
+        assert set(metrics[0].keys()) == set(metrics_observer.metrics.to_json().keys())